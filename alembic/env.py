@@ -3,7 +3,7 @@ from sqlalchemy import engine_from_config, pool
 from alembic import context
 
 from app.db.database import DATABASE_URL
-from app.db import base
+from app.db import base, row_counts, fulltext
 
 # Настройка URL базы данных
 config = context.config
@@ -17,6 +17,16 @@ if config.config_file_name is not None:
 target_metadata = base.Base.metadata
 
 
+def include_object(obj, name, type_, reflected, compare_to):
+    """
+    Исключить из авто-генерации служебные таблицы, создаваемые миграциями вручную:
+    счётчики строк и теневые таблицы полнотекстового поиска.
+    """
+    if type_ != "table":
+        return True
+    return name != row_counts.COUNTS_TABLE_NAME and not name.startswith(fulltext.FTS_TABLE_PREFIX)
+
+
 def run_migrations_offline():
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
@@ -24,6 +34,7 @@ def run_migrations_offline():
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -36,7 +47,7 @@ def run_migrations_online():
         poolclass=pool.NullPool,
     )
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
         with context.begin_transaction():
             context.run_migrations()
 
@@ -0,0 +1,57 @@
+"""Table row counts maintained by triggers
+
+Revision ID: 3f1c2a9d7b10
+Revises: 8194eb6a4b8e
+Create Date: 2026-10-19 10:12:40.118204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = '8194eb6a4b8e'
+branch_labels = None
+depends_on = None
+
+
+# Таблицы, количество строк которых поддерживается триггерами
+TABLES = (
+    'chat_types', 'chats', 'users', 'groups', 'administrators',
+    'notification_types', 'notification_subscribers'
+)
+
+
+def upgrade():
+    op.execute("""
+                CREATE TABLE table_row_counts (
+                    table_name VARCHAR NOT NULL PRIMARY KEY,
+                    row_count INTEGER NOT NULL
+                );
+            """)
+
+    for table in TABLES:
+        op.execute(f"""
+                    CREATE TRIGGER trg_{table}_row_count_insert
+                    AFTER INSERT ON {table}
+                    BEGIN
+                        UPDATE table_row_counts SET row_count = row_count + 1 WHERE table_name = '{table}';
+                    END;
+                """)
+        op.execute(f"""
+                    CREATE TRIGGER trg_{table}_row_count_delete
+                    AFTER DELETE ON {table}
+                    BEGIN
+                        UPDATE table_row_counts SET row_count = row_count - 1 WHERE table_name = '{table}';
+                    END;
+                """)
+        # Начальное значение счётчика
+        op.execute(f"INSERT INTO table_row_counts (table_name, row_count) SELECT '{table}', count(*) FROM {table};")
+
+
+def downgrade():
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_row_count_insert;")
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_row_count_delete;")
+
+    op.execute("DROP TABLE IF EXISTS table_row_counts;")
@@ -0,0 +1,89 @@
+"""Full-text search tables for filters, maintenance windows and quiet hours
+
+Revision ID: 9e2f4b6c1d08
+Revises: 34d9ad72e827
+Create Date: 2026-10-19 21:05:41.802193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e2f4b6c1d08'
+down_revision = '34d9ad72e827'
+branch_labels = None
+depends_on = None
+
+
+# Текстовые колонки MODEL_FORMATS таблиц, добавленных после миграции c52e9f3a8d61:
+# таблица -> (первичный ключ, колонки)
+FTS_COLUMNS = {
+    'notification_filters': ('id', ['severity', 'host_group', 'host_pattern', 'tag_key', 'tag_value']),
+    'maintenance_windows': ('id', ['name', 'host_group', 'host_pattern', 'tag_key', 'tag_value']),
+    'quiet_hours': ('id', ['timezone']),
+}
+
+
+def _fts5_trigram_supported() -> bool:
+    """
+    Проверить, собран ли SQLite с FTS5 и токенизатором trigram (SQLite >= 3.34).
+    """
+    connection = op.get_bind()
+    try:
+        connection.execute(sa.text("CREATE VIRTUAL TABLE temp.fts_probe USING fts5(value, tokenize='trigram')"))
+        connection.execute(sa.text("DROP TABLE temp.fts_probe"))
+        return True
+    except sa.exc.OperationalError:
+        return False
+
+
+def upgrade():
+    # Без поддержки FTS5 частичный поиск продолжает работать через LIKE
+    if not _fts5_trigram_supported():
+        return
+
+    for table, (pk, columns) in FTS_COLUMNS.items():
+        fts = f"fts_{table}"
+        cols = ", ".join(columns)
+        new_cols = ", ".join(f"new.{c}" for c in columns)
+        old_cols = ", ".join(f"old.{c}" for c in columns)
+
+        op.execute(f"""
+                    CREATE VIRTUAL TABLE {fts} USING fts5(
+                        {cols}, content='{table}', content_rowid='{pk}', tokenize='trigram'
+                    );
+                """)
+        op.execute(f"""
+                    CREATE TRIGGER trg_{fts}_insert
+                    AFTER INSERT ON {table}
+                    BEGIN
+                        INSERT INTO {fts} (rowid, {cols}) VALUES (new.{pk}, {new_cols});
+                    END;
+                """)
+        op.execute(f"""
+                    CREATE TRIGGER trg_{fts}_delete
+                    AFTER DELETE ON {table}
+                    BEGIN
+                        INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {old_cols});
+                    END;
+                """)
+        op.execute(f"""
+                    CREATE TRIGGER trg_{fts}_update
+                    AFTER UPDATE ON {table}
+                    BEGIN
+                        INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {old_cols});
+                        INSERT INTO {fts} (rowid, {cols}) VALUES (new.{pk}, {new_cols});
+                    END;
+                """)
+        # Заполнение индекса текущими данными
+        op.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild');")
+
+
+def downgrade():
+    for table in FTS_COLUMNS:
+        fts = f"fts_{table}"
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{fts}_insert;")
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{fts}_delete;")
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{fts}_update;")
+        op.execute(f"DROP TABLE IF EXISTS {fts};")
@@ -3,7 +3,7 @@ import uvicorn
 from uvicorn import Config
 import threading
 from fastapi import FastAPI
-from . import webhooks
+from . import webhooks, monitoring
 from app.core.environment import API_HOST, API_PORT
 
 # Настройка FastAPI
@@ -13,12 +13,16 @@ app = FastAPI(debug=False, title=title, description=desc)
 
 # Подключаем хуки
 app.include_router(webhooks.router)
+app.include_router(monitoring.router)
 
 
 def run_zabbix_webhook_handler_server():
     """ Запустить сервер FastAPI на второстепенном потоке. """
     config = Config(app=app, host=API_HOST, port=API_PORT)
 
+    # Проверки для /healthz и /readyz выполняются в фоне
+    monitoring.health_monitor.start()
+
     server_thread = threading.Thread(target=run_server, name="ZabbixListener", args=[config], daemon=True)
     server_thread.start()
 
@@ -0,0 +1,76 @@
+from typing import Dict
+from fastapi import APIRouter, Response
+from fastapi.responses import JSONResponse
+from app.core.bot_setup import app as bot_app, dispatcher
+from app.core.environment import METRICS_ENDPOINT
+from app.core.handler_metrics import handler_metrics
+from app.core import metrics, health, executor_pool, bot_extensions
+from app.db.database import engine
+router = APIRouter()
+
+# Конечная точка метрик обработки команд бота
+HANDLER_STATS_ENDPOINT = "/stats/handlers"
+
+# Конечная точка состояния пулов рассылок
+EXECUTOR_STATS_ENDPOINT = "/stats/executors"
+
+# Конечные точки проверки работоспособности и готовности
+HEALTHZ_ENDPOINT = "/healthz"
+READYZ_ENDPOINT = "/readyz"
+
+# Проверки конвейера доставки (выполняются в фоне, см. app.core.health).
+# Пул рассылок журнала не проверяется: его переполнение не мешает доставке уведомлений
+health_monitor = health.HealthMonitor({
+    "polling": health.polling_probe(bot_app),
+    "dispatcher": health.dispatcher_probe(dispatcher),
+    "executor": health.executor_probe(lambda: executor_pool.get_stats(executor_pool.WORKLOAD_ALERTS)),
+    "executor_admin": health.executor_probe(lambda: executor_pool.get_stats(executor_pool.WORKLOAD_ADMIN)),
+    "database": health.database_probe(engine),
+    "breaker": health.breaker_probe(bot_extensions.DEFAULT_BREAKER),
+})
+
+
+@router.get(HANDLER_STATS_ENDPOINT)
+async def get_handler_stats() -> Dict:
+    """
+    Получить метрики обработки команд бота (см. app.core.handler_metrics) и очереди событий.
+    Время указано в миллисекундах.
+    """
+    return {"handlers": handler_metrics.snapshot(), "dispatcher": dispatcher.stats()}
+
+
+@router.get(EXECUTOR_STATS_ENDPOINT)
+async def get_executor_stats() -> Dict:
+    """
+    Получить состояние пулов рассылок по видам нагрузки (см. app.core.executor_pool).
+    """
+    return executor_pool.get_all_stats()
+
+
+@router.get(METRICS_ENDPOINT)
+async def get_metrics() -> Response:
+    """
+    Получить метрики приложения в текстовом формате Prometheus (см. app.core.metrics).
+    """
+    return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@router.get(HEALTHZ_ENDPOINT)
+async def get_healthz() -> JSONResponse:
+    """
+    Проверка работоспособности: 503, если цикл опроса событий или пулы обработки остановились
+    (приложение нужно перезапустить). Результат берётся из последнего снимка проверок.
+    """
+    status = health_monitor.status(readiness=False)
+    return JSONResponse(status, status_code=200 if status["healthy"] else 503)
+
+
+@router.get(READYZ_ENDPOINT)
+async def get_readyz() -> JSONResponse:
+    """
+    Проверка готовности: 503, если события не доставляются (нет успешного опроса событий, очереди
+    переполнены, база данных медленная или недоступна, выключатель рассылок разомкнут).
+    Результат берётся из последнего снимка проверок.
+    """
+    status = health_monitor.status(readiness=True)
+    return JSONResponse(status, status_code=200 if status["healthy"] else 503)
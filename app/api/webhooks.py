@@ -1,29 +1,75 @@
+import time
 from typing import Dict
 from fastapi.responses import PlainTextResponse
 from fastapi import Request, APIRouter
 from app.core.environment import WEBHOOK_EVENT_ENDPOINT
 from app.core.bot_setup import app
 from app import bot_handlers
-from app.utils import json_format
+from app.utils import json_format, message_templates
+from app.core.metrics import REGISTRY
+from app.core import log_context
 router = APIRouter()
 
+# Максимальная длина текста данных события в уведомлении (остальное сокращается)
+NOTIFICATION_DATA_MAX_LENGTH = 16 * 1024
+
+# Шаблоны текста уведомлений (перечитываются при изменении файлов)
+notification_templates = message_templates.MessageTemplates(max_length=NOTIFICATION_DATA_MAX_LENGTH)
+
+# --- Метрики приёма webhook-ов
+WEBHOOK_REQUESTS = REGISTRY.counter("webhook_requests", "Received webhooks by result.", ("result",))
+WEBHOOK_LATENCY = REGISTRY.histogram("webhook_request_duration_seconds", "Webhook processing time.")
+
 
 @router.post(f"{WEBHOOK_EVENT_ENDPOINT}")
 async def handle_webhook(request: Request):
     """
     Принять webhook на заданную конечную точку,
-    отформатировать тело запроса и отправить
+    отформатировать тело запроса по шаблону (или целиком, если шаблона нет) и отправить
     всем подписчикам уведомлений типа, относящегося к Zabbix.
+    События нестабильного (flapping) триггера не отправляются по отдельности (см. app.utils.flapping).
     Webhook-и должны приходить от системы мониторинга Zabbix.
     Тело запроса должно содержать данные события, отправленные Zabbix.
 
     :param request: Запрос от Zabbix.
     """
-    data: Dict = await request.json()
+    start = time.perf_counter()
+    result = "error"
+    try:
+        data = await request.json()
+        event_id = data.get("event_id") if isinstance(data, dict) else None
+        with log_context.bind(command="webhook", event_id=event_id):
+            result = _process_webhook(data)
+    finally:
+        WEBHOOK_REQUESTS.inc(result=result)
+        WEBHOOK_LATENCY.observe(time.perf_counter() - start)
+
+    return PlainTextResponse("✅ Webhook received", status_code=200)
+
+
+def _process_webhook(data: Dict) -> str:
+    """
+    Отправить событие Zabbix подписчикам.
+
+    :param data: Данные события.
+    :return: Результат обработки для метрик: 'delivered' или 'flapping' (событие нестабильного триггера не отправлено).
+    """
+    # Событие нестабильного триггера заменяется сообщением о дребезге или не отправляется
+    verdict = bot_handlers.zabbix_flapping.observe(data)
+    if verdict.update is not None:
+        bot_handlers.send_flapping_updates(app, [verdict.update])
+    if not verdict.deliver:
+        return "flapping"
+
+    data_text = notification_templates.render(bot_handlers.NotificationTypes.ZABBIX.value, data)
+    if data_text is None:
+        data_text = json_format.format_json_to_str(data, max_length=NOTIFICATION_DATA_MAX_LENGTH)
 
-    notification_text = f"❗️Уведомление от Zabbix:\n\n{json_format.format_json_to_str(data)}"
+    notification_text = f"❗️Уведомление от Zabbix:\n\n{data_text}"
 
     # Если нет необходимого поля
-    bot_handlers.send_notification_to_subscribers(app, bot_handlers.NotificationTypes.ZABBIX, notification_text)
+    bot_handlers.send_notification_to_subscribers(
+        app, bot_handlers.NotificationTypes.ZABBIX, notification_text, event_data=data
+    )
 
-    return PlainTextResponse("✅ Webhook received", status_code=200)
+    return "delivered"
@@ -1,5 +1,7 @@
-from typing import Optional
+from typing import Optional, List, Set, Dict, Tuple
+from datetime import time
 import html
+import re
 from bot.bot import Bot, Event, EventType
 from bot.constant import ChatType
 from bot.types import InlineKeyboardMarkup, KeyboardButton
@@ -8,16 +10,18 @@ from app import db
 from .helpers import (
     catch_and_log_exceptions, administrator_access, send_available_database_tables,
     make_callback_data, parse_callback_data, send_invalid_command_format,
-    generate_db_records_page, send_database_table_fields, send_notification_types,
-    send_notification_description
+    generate_db_keyset_page, send_database_table_fields, send_notification_types,
+    send_notification_description, invalidate_admin_access
 )
 from .constants import (
     Commands, CallbackAction, GET_DATA_REFERENCE, DEL_CHAT_REFERENCE, FIND_DATA_REFERENCE,
     ADD_NOTIFY_SUBSCRIBER_REFERENCE, DEL_NOTIFY_SUBSCRIBER_REFERENCE, ADD_ADMIN_REFERENCE,
-    DEL_ADMIN_REFERENCE
+    DEL_ADMIN_REFERENCE, NOTIFY_FILTER_REFERENCE, MAINTENANCE_REFERENCE, QUIET_HOURS_REFERENCE,
+    HANDLER_STATS_REFERENCE
 )
 from app.utils import text_format
 from app.core import bot_extensions
+from app.core.handler_metrics import handler_metrics
 from app.bot_handlers import notifications
 
 
@@ -116,6 +120,11 @@ def get_data_callback(bot: Bot, event: Event, is_init: bool = False,
         cb = parse_callback_data(callback)
         page: int = cb['pg']
         table: str = cb['tb']
+        after: Optional[list] = cb.get('a')
+        before: Optional[list] = cb.get('b')
+        # Страницы кроме первой открываются только по курсору
+        if page > 0 and after is None and before is None:
+            raise ValueError("Cursor missing.")
     except Exception:
         text = "⛔️ Эта кнопка больше не действует."
         bot_extensions.edit_text_or_raise(
@@ -132,13 +141,23 @@ def get_data_callback(bot: Bot, event: Event, is_init: bool = False,
         return
 
     model, _, page_size = config
-    start = page * page_size + 1
-    end = start + page_size - 1
 
     with db.get_db_session() as session:
-        records = db.crud.get_records_range(session, model, start=start, end=end)
-        total_records = db.crud.count_records(session, model)
-        output_text, markup = generate_db_records_page(records, total_records, config, callback, 'pg')
+        records, has_more = db.crud.get_records_keyset(
+            session, model, limit=page_size, after=after, before=before
+        )
+
+        if before is not None:
+            # Переход назад: дальше по курсору есть следующая страница
+            has_prev, has_next = has_more, True
+            if not has_more:
+                cb['pg'] = 0
+        else:
+            has_prev, has_next = page > 0, has_more
+
+        output_text, markup = generate_db_keyset_page(
+            records, config, cb, 'pg', has_prev=has_prev, has_next=has_next
+        )
 
     bot_extensions.edit_text_or_raise(
         bot, event.from_chat, event.msgId, output_text, inline_keyboard_markup=markup
@@ -261,6 +280,12 @@ def find_data_callback(bot: Bot, event: Event, is_init: bool = False,
         table: str = cb['tb']
         field: str = cb['f']
         field_val: str = cb['val']
+        after: Optional[list] = cb.get('a')
+        before: Optional[list] = cb.get('b')
+        total: Optional[int] = cb.get('n')
+        # Страницы кроме первой открываются только по курсору
+        if page > 0 and (total is None or (after is None and before is None)):
+            raise ValueError("Cursor missing.")
     except Exception:
         text = "⛔️ Эта кнопка больше не действует."
         bot_extensions.edit_text_or_raise(
@@ -276,12 +301,33 @@ def find_data_callback(bot: Bot, event: Event, is_init: bool = False,
         )
         return
 
-    model, _, _ = config
+    model, _, page_size = config
+    conditions = {field: field_val}
 
     try:
         with db.get_db_session() as session:
-            records = db.crud.find_records(session, model, {field: field_val}, partial_match=True)
-            output_text, markup = generate_db_records_page(records, len(records), config, callback, 'pg')
+            # Количество найденных записей считается один раз и передаётся в кнопках
+            if total is None:
+                total = db.crud.count_records(session, model, conditions, partial_match=True)
+                cb['n'] = total
+
+            records, has_more = db.crud.get_records_keyset(
+                session, model, limit=page_size, after=after, before=before,
+                conditions=conditions, partial_match=True
+            )
+
+            if before is not None:
+                # Переход назад: дальше по курсору есть следующая страница
+                has_prev, has_next = has_more, True
+                if not has_more:
+                    cb['pg'] = 0
+            else:
+                has_prev, has_next = page > 0, has_more
+
+            output_text, markup = generate_db_keyset_page(
+                records, config, cb, 'pg', has_prev=has_prev, has_next=has_next
+            )
+            output_text = f"Найдено записей: {total}\n{output_text}"
 
     except AttributeError:
         error_text = f"⛔️ Некорректный атрибут таблицы '{table}'."
@@ -326,6 +372,13 @@ def add_notify_subscriber_command(bot: Bot, event: Event):
             send_notification_types(bot, event.from_chat)
             return
 
+    # Если передан список email чатов через запятую
+    if len(text_items) >= 3 and text_items[-1] != '-desc':
+        emails = text_format.split_items(','.join(text_items[1:-1]))
+        if len(emails) > 1:
+            _add_notify_subscribers_bulk(bot, event, emails, text_items[-1])
+            return
+
     # Если 2 аргумента в команде
     if len(text_items) == 3:
         if text_items[2] == '-desc':
@@ -415,6 +468,13 @@ def del_notify_subscriber_command(bot: Bot, event: Event):
             send_notification_types(bot, event.from_chat)
             return
 
+    # Если передан список email чатов через запятую
+    if len(text_items) >= 3 and text_items[-1] != '-desc':
+        emails = text_format.split_items(','.join(text_items[1:-1]))
+        if len(emails) > 1:
+            _del_notify_subscribers_bulk(bot, event, emails, text_items[-1])
+            return
+
     # Если 2 аргумента в команде
     if len(text_items) == 3:
         if text_items[2] == '-desc':
@@ -470,6 +530,406 @@ def del_notify_subscriber_command(bot: Bot, event: Event):
     send_invalid_command_format(bot, event.from_chat, Commands.DEL_NOTIFY_SUBSCRIBER.value, event.msgId)
 
 
+# Параметр команды: ключ=значение или ключ="значение с пробелами"
+_KEY_VALUE_PATTERN = re.compile(r'(\w+)=(?:"([^"]*)"|(\S+))\s*')
+
+# Ключи условий команды -> поля правила фильтрации
+_FILTER_CONDITION_KEYS = {
+    "severity": "severity",
+    "group": "host_group",
+    "host": "host_pattern",
+    "tag": "tag_key",
+}
+
+# Значения параметра rollup
+_ROLLUP_VALUES = {"yes": True, "on": True, "no": False, "off": False}
+
+
+def _parse_key_values(text: str, keys) -> Optional[Dict[str, str]]:
+    """
+    Разобрать параметры 'ключ=значение' из текста команды.
+
+    :param text: Текст параметров ('severity=High group="Linux servers"').
+    :param keys: Допустимые ключи.
+    :return: Словарь параметров или None, если формат некорректен или ключ недопустим.
+    """
+    params = {}
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = _KEY_VALUE_PATTERN.match(text, pos)
+        if match is None or match.group(1) not in keys:
+            return None
+        params[match.group(1)] = match.group(2) if match.group(2) is not None else match.group(3)
+        pos = match.end()
+
+    return params
+
+
+def _filter_conditions(params: Dict[str, str]) -> Dict[str, str]:
+    """
+    Преобразовать параметры команды в поля правила фильтрации (или окна обслуживания).
+
+    :param params: Параметры команды (ключи из _FILTER_CONDITION_KEYS учитываются, остальные пропускаются).
+    :return: Поля правила.
+    """
+    conditions = {}
+    for key, value in params.items():
+        if key == "tag":
+            tag_key, sep, tag_value = value.partition(":")
+            conditions["tag_key"] = tag_key
+            if sep:
+                conditions["tag_value"] = tag_value
+        elif key in _FILTER_CONDITION_KEYS:
+            conditions[_FILTER_CONDITION_KEYS[key]] = value
+
+    return conditions
+
+
+def _parse_filter_conditions(text: str) -> Optional[Dict[str, str]]:
+    """
+    Разобрать условия правила фильтрации из текста команды.
+
+    :param text: Текст условий ('severity=High host=db-* tag=env:prod').
+    :return: Поля правила фильтрации или None, если условия некорректны.
+    """
+    params = _parse_key_values(text, _FILTER_CONDITION_KEYS)
+    return _filter_conditions(params) if params else None
+
+
+def _parse_time_interval(text: str) -> Optional[Tuple[time, time]]:
+    """
+    Разобрать интервал времени суток 'HH:MM-HH:MM'.
+
+    :param text: Текст интервала.
+    :return: Кортеж (начало, конец) или None, если формат некорректен или интервал пуст.
+    """
+    start, sep, end = text.partition("-")
+    if not sep:
+        return None
+    try:
+        interval = date_and_time.parse_time_of_day(start), date_and_time.parse_time_of_day(end)
+    except ValueError:
+        return None
+    return interval if interval[0] != interval[1] else None
+
+
+@catch_and_log_exceptions
+@administrator_access
+def notify_filter_command(bot: Bot, event: Event):
+    """
+    Обработать команду notify_filter.
+    Функция выводит, добавляет или удаляет правила фильтрации уведомлений подписчика.
+
+    :param bot: VKTeams bot.
+    :param event: Событие.
+    """
+    text_items = text_format.normalize_whitespace(event.text).split()
+    if not text_items:
+        output_text = "⛔️ Команда настройки фильтров уведомлений не распознана."
+        bot_extensions.send_text_or_raise(
+            bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+        )
+        return
+
+    # Если нет аргументов в команде
+    if len(text_items) == 1:
+        bot_extensions.send_text_or_raise(
+            bot, event.from_chat, text=NOTIFY_FILTER_REFERENCE, parse_mode='HTML'
+        )
+        return
+
+    if len(text_items) < 3:
+        send_invalid_command_format(bot, event.from_chat, Commands.NOTIFY_FILTER.value, event.msgId)
+        return
+
+    clear = text_items[3:] == ['-clear']
+    conditions = None
+    if len(text_items) > 3 and not clear:
+        conditions = _parse_filter_conditions(" ".join(text_items[3:]))
+        if conditions is None:
+            send_invalid_command_format(bot, event.from_chat, Commands.NOTIFY_FILTER.value, event.msgId)
+            return
+
+    with db.get_db_session() as session:
+        chat = db.crud.find_chat(session, text_items[1])
+        notify_type = db.crud.find_notification_type(session, text_items[2])
+        subscriber: Optional[db.NotificationSubscriber] = db.crud.find_one_record(
+            session,
+            db.NotificationSubscriber,
+            {
+                db.NotificationSubscriber.chat_id: chat.id,
+                db.NotificationSubscriber.notification_type: notify_type.id
+            }
+        ) if chat is not None and notify_type is not None else None
+
+        if chat is None:
+            output_text = "⛔️ Чат с таким email не был найден в базе данных.\n"
+        elif notify_type is None:
+            output_text = "⛔️ Такой тип уведомлений не был найден в базе данных.\n"
+        elif not subscriber:
+            output_text = "⛔️ Чат не подписан на выбранный тип уведомлений.\n"
+        elif clear:
+            deleted = db.crud.delete_notification_filters(session, subscriber)
+            output_text = f"✅ Удалено правил фильтрации: {deleted}. Чат получает все уведомления типа.\n"
+        elif conditions is not None:
+            try:
+                db.crud.add_notification_filter(session, subscriber, **conditions)
+                output_text = "✅ Правило фильтрации добавлено.\n"
+            except ValueError:
+                output_text = "⛔️ Правило должно содержать хотя бы одно условие.\n"
+        else:
+            filters = db.crud.find_notification_filters(session, subscriber)
+            if filters:
+                output_text = ("<b>Правила фильтрации подписчика:</b>\n\n" + html.escape(
+                    db_records_format.format_for_chat(filters, model_fields=[
+                        db.NotificationFilter.id, db.NotificationFilter.severity, db.NotificationFilter.host_group,
+                        db.NotificationFilter.host_pattern, db.NotificationFilter.tag_key,
+                        db.NotificationFilter.tag_value
+                    ])
+                ))
+            else:
+                output_text = "✅ У подписчика нет правил фильтрации, он получает все уведомления типа.\n"
+
+    bot_extensions.send_long_text(
+        bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+    )
+
+
+@catch_and_log_exceptions
+@administrator_access
+def maintenance_command(bot: Bot, event: Event):
+    """
+    Обработать команду maintenance.
+    Функция выводит, добавляет или удаляет окна обслуживания.
+
+    :param bot: VKTeams bot.
+    :param event: Событие.
+    """
+    text_items = text_format.normalize_whitespace(event.text).split()
+    if not text_items:
+        output_text = "⛔️ Команда управления окнами обслуживания не распознана."
+        bot_extensions.send_text_or_raise(
+            bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+        )
+        return
+
+    # Если нет аргументов в команде
+    if len(text_items) == 1:
+        bot_extensions.send_text_or_raise(
+            bot, event.from_chat, text=MAINTENANCE_REFERENCE, parse_mode='HTML'
+        )
+        return
+
+    if text_items[1:] == ['-list']:
+        with db.get_db_session() as session:
+            windows = db.crud.find_maintenance_windows(session, ends_after=date_and_time.get_current_date_moscow())
+            _, model_fields, _ = db_records_format.find_config_model_format(
+                db.get_tablename_by_model(db.MaintenanceWindow)
+            )
+            if windows:
+                output_text = ("<b>Окна обслуживания:</b>\n\n" +
+                               html.escape(db_records_format.format_for_chat(windows, model_fields=model_fields)))
+            else:
+                output_text = "✅ Действующих и запланированных окон обслуживания нет.\n"
+
+        bot_extensions.send_long_text(
+            bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+        )
+        return
+
+    if len(text_items) == 3 and text_items[1] == '-del':
+        if not text_items[2].isdigit():
+            send_invalid_command_format(bot, event.from_chat, Commands.MAINTENANCE.value, event.msgId)
+            return
+
+        with db.get_db_session() as session:
+            if db.crud.delete_maintenance_window(session, int(text_items[2])):
+                output_text = "✅ Окно обслуживания удалено.\n"
+            else:
+                output_text = "⛔️ Окно обслуживания с таким ID не найдено.\n"
+
+        bot_extensions.send_text_or_raise(
+            bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+        )
+        return
+
+    params = _parse_key_values(" ".join(text_items[2:]), ("start", "end", "name", "rollup", "group", "host", "tag"))
+    if not params or "start" not in params or "end" not in params \
+            or params.get("rollup", "no").lower() not in _ROLLUP_VALUES:
+        send_invalid_command_format(bot, event.from_chat, Commands.MAINTENANCE.value, event.msgId)
+        return
+
+    conditions = _filter_conditions(params)
+
+    try:
+        starts_at = date_and_time.parse_datetime_range(params["start"])[0]
+        ends_at = date_and_time.parse_datetime_range(params["end"])[0]
+    except ValueError:
+        output_text = "⛔️ Не удалось распознать время начала или окончания окна.\n"
+        bot_extensions.send_text_or_raise(
+            bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+        )
+        return
+
+    with db.get_db_session() as session:
+        notify_type = db.crud.find_notification_type(session, text_items[1])
+        if notify_type is None:
+            output_text = "⛔️ Такой тип уведомлений не был найден в базе данных.\n"
+        elif starts_at >= ends_at:
+            output_text = "⛔️ Окно обслуживания должно заканчиваться позже, чем начинается.\n"
+        else:
+            window = db.crud.add_maintenance_window(
+                session, notify_type, params.get("name", notify_type.type), starts_at, ends_at, event.from_chat,
+                rollup=_ROLLUP_VALUES[params.get("rollup", "no").lower()], **conditions
+            )
+            output_text = (f"✅ Окно обслуживания (ID = {window.id}) добавлено: "
+                           f"{starts_at.strftime(db_records_format.DATETIME_FORMAT)} — "
+                           f"{ends_at.strftime(db_records_format.DATETIME_FORMAT)}.\n")
+
+    bot_extensions.send_text_or_raise(
+        bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+    )
+
+
+@catch_and_log_exceptions
+@administrator_access
+def quiet_hours_command(bot: Bot, event: Event):
+    """
+    Обработать команду quiet_hours.
+    Функция выводит, задаёт или удаляет тихие часы чата.
+
+    :param bot: VKTeams bot.
+    :param event: Событие.
+    """
+    text_items = text_format.normalize_whitespace(event.text).split()
+    if not text_items:
+        output_text = "⛔️ Команда настройки тихих часов не распознана."
+        bot_extensions.send_text_or_raise(
+            bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+        )
+        return
+
+    # Если нет аргументов в команде
+    if len(text_items) == 1:
+        bot_extensions.send_text_or_raise(
+            bot, event.from_chat, text=QUIET_HOURS_REFERENCE, parse_mode='HTML'
+        )
+        return
+
+    interval = None
+    params = {}
+    if len(text_items) > 2 and text_items[2] != '-clear':
+        interval = _parse_time_interval(text_items[2])
+        params = _parse_key_values(" ".join(text_items[3:]), ("tz", "rollup"))
+        if interval is None or params is None or params.get("rollup", "no").lower() not in _ROLLUP_VALUES:
+            send_invalid_command_format(bot, event.from_chat, Commands.QUIET_HOURS.value, event.msgId)
+            return
+        try:
+            date_and_time.get_timezone(params.setdefault("tz", "Europe/Moscow"))
+        except ValueError:
+            output_text = "⛔️ Неизвестный часовой пояс.\n"
+            bot_extensions.send_text_or_raise(
+                bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+            )
+            return
+    elif len(text_items) > 3:
+        send_invalid_command_format(bot, event.from_chat, Commands.QUIET_HOURS.value, event.msgId)
+        return
+
+    with db.get_db_session() as session:
+        chat = db.crud.find_chat(session, text_items[1])
+        if chat is None:
+            output_text = "⛔️ Чат с таким email не был найден в базе данных.\n"
+        elif text_items[2:] == ['-clear']:
+            if db.crud.delete_quiet_hours(session, chat):
+                output_text = "✅ Тихие часы чата удалены.\n"
+            else:
+                output_text = "✅ У чата нет тихих часов.\n"
+        elif interval is not None:
+            db.crud.set_quiet_hours(
+                session, chat, interval[0], interval[1], params["tz"],
+                _ROLLUP_VALUES[params.get("rollup", "no").lower()]
+            )
+            output_text = (f"✅ Тихие часы чата: {interval[0].strftime('%H:%M')}-{interval[1].strftime('%H:%M')} "
+                           f"({html.escape(params['tz'])}).\n")
+        else:
+            quiet_hours = db.crud.find_quiet_hours(session, chat)
+            if quiet_hours is None:
+                output_text = "✅ У чата нет тихих часов.\n"
+            else:
+                output_text = (f"Тихие часы чата: {quiet_hours.starts_at.strftime('%H:%M')}-"
+                               f"{quiet_hours.ends_at.strftime('%H:%M')} ({html.escape(quiet_hours.timezone)}), "
+                               f"сводка: {'да' if quiet_hours.rollup else 'нет'}.\n")
+
+    bot_extensions.send_text_or_raise(
+        bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+    )
+
+
+@catch_and_log_exceptions
+@administrator_access
+def handler_stats_command(bot: Bot, event: Event):
+    """
+    Обработать команду handler_stats.
+    Функция выводит или сбрасывает метрики обработки команд бота.
+
+    :param bot: VKTeams bot.
+    :param event: Событие.
+    """
+    text_items = text_format.normalize_whitespace(event.text).split()
+    if not text_items:
+        output_text = "⛔️ Команда просмотра метрик не распознана."
+        bot_extensions.send_text_or_raise(
+            bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+        )
+        return
+
+    # Если нет аргументов в команде
+    if len(text_items) == 1:
+        bot_extensions.send_text_or_raise(
+            bot, event.from_chat, text=HANDLER_STATS_REFERENCE, parse_mode='HTML'
+        )
+        return
+
+    if text_items[1:] == ['-reset']:
+        handler_metrics.reset()
+        output_text = "✅ Метрики команд сброшены.\n"
+    elif text_items[1:] == ['-list']:
+        output_text = _format_handler_stats(handler_metrics.snapshot())
+        dispatcher_stats = getattr(bot.dispatcher, "stats", None)
+        if dispatcher_stats is not None:
+            stats = dispatcher_stats()
+            output_text += (f"\n<b>Очередь событий:</b> обрабатывается {stats['running']} из {stats['workers']}, "
+                            f"в очереди {stats['queued']} (наибольшая {stats['max_queued']}), "
+                            f"среднее ожидание {stats['avg_wait_ms']:g} мс.\n")
+    else:
+        send_invalid_command_format(bot, event.from_chat, Commands.HANDLER_STATS.value, event.msgId)
+        return
+
+    bot_extensions.send_long_text(
+        bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+    )
+
+
+def _format_handler_stats(snapshot: Dict[str, Dict]) -> str:
+    """
+    Сформировать текст метрик обработчиков (по убыванию суммарного времени выполнения).
+
+    :param snapshot: Метрики обработчиков (см. HandlerMetrics.snapshot).
+    :return: Текст метрик.
+    """
+    if not snapshot:
+        return "Метрик команд пока нет.\n"
+
+    lines = ["<b>Метрики команд</b> (время в мс):\n"]
+    for name, stats in sorted(snapshot.items(), key=lambda item: item[1]["total_ms"], reverse=True):
+        lines.append(f"🔹 <b>{html.escape(name)}</b>: вызовов {stats['count']}, ошибок {stats['errors']}, "
+                     f"сред. {stats['avg_ms']:g}, p95 {stats['p95_ms']:g}, макс. {stats['max_ms']:g}, "
+                     f"БД {stats['db_ms']:g}, API {stats['api_ms']:g}")
+    return "\n".join(lines) + "\n"
+
+
 @catch_and_log_exceptions
 @administrator_access
 def add_admin_command(bot: Bot, event: Event):
@@ -495,6 +955,12 @@ def add_admin_command(bot: Bot, event: Event):
         )
         return
 
+    # Если передан список email чатов через запятую
+    emails = text_format.split_items(','.join(text_items[1:]))
+    if len(emails) > 1:
+        _add_admins_bulk(bot, event, emails)
+        return
+
     # Если 1 аргумент в команде
     if len(text_items) == 2:
         with db.get_db_session() as session:
@@ -521,6 +987,9 @@ def add_admin_command(bot: Bot, event: Event):
                 admin_text = (f"Добавлен новый администратор (пользователем: {html.escape(event.from_chat)}):\n"
                               f"{db_records_format.format_for_chat(admin, model_fields=model_field)}")
 
+        if is_correct:
+            invalidate_admin_access(chat_email)
+
         bot_extensions.send_text_or_raise(
             bot, event.from_chat, output_text
         )
@@ -589,6 +1058,9 @@ def del_admin_command(bot: Bot, event: Event):
                 is_correct = db.crud.delete_administrator(session, admin)
                 output_text = f"✅ У чата c email = '{html.escape(text_items[1])}' успешно отозван доступ администратора."
 
+        if is_correct:
+            invalidate_admin_access(chat_email)
+
         bot_extensions.send_text_or_raise(
             bot, event.from_chat, output_text
         )
@@ -632,6 +1104,12 @@ def del_chat_command(bot: Bot, event: Event):
         )
         return
 
+    # Если передан список email чатов через запятую
+    emails = text_format.split_items(','.join(text_items[1:]))
+    if len(emails) > 1:
+        _del_chats_bulk(bot, event, emails)
+        return
+
     # Если 1 аргумент в команде
     if len(text_items) == 2:
         with db.get_db_session() as session:
@@ -646,6 +1124,7 @@ def del_chat_command(bot: Bot, event: Event):
                 result = db.crud.delete_chat(session, chat)
 
         if result:
+            invalidate_admin_access(chat_email)
             output_text = f"✅ Чат c email = '{html.escape(text_items[1])}' успешно удалён из базы данных."
         else:
             output_text = "⛔️ Чат с таким email не был найден в базе данных."
@@ -666,3 +1145,198 @@ def del_chat_command(bot: Bot, event: Event):
 
     # В остальных случаях выводим, что формат команды неверный
     send_invalid_command_format(bot, event.from_chat, Commands.DEL_CHAT.value, event.msgId)
+
+
+def _format_bulk_result(emails: List[str], done: List[str], found: Set[str],
+                        done_title: str, skipped_title: str) -> str:
+    """
+    Сформировать итог пакетной операции над списком чатов.
+
+    :param emails: Email чатов в порядке ввода.
+    :param done: Email чатов, к которым операция была применена.
+    :param found: Email чатов, найденных в базе данных.
+    :param done_title: Заголовок списка обработанных чатов.
+    :param skipped_title: Заголовок списка найденных, но пропущенных чатов.
+    :return: Текст в формате HTML.
+    """
+    done_set = set(done)
+    groups = (
+        (done_title, [email for email in emails if email in done_set]),
+        (skipped_title, [email for email in emails if email in found and email not in done_set]),
+        ("⛔️ Не найдены в базе данных:", [email for email in emails if email not in found]),
+    )
+
+    lines = []
+    for title, items in groups:
+        if items:
+            lines.append(title)
+            lines.extend(f"- <i>{html.escape(item)}</i>" for item in items)
+
+    return '\n'.join(lines)
+
+
+def _add_notify_subscribers_bulk(bot: Bot, event: Event, emails: List[str], notify_type_name: str):
+    """
+    Подписать список чатов на тип уведомлений за одну транзакцию.
+
+    :param bot: VKTeams bot.
+    :param event: Событие.
+    :param emails: Email чатов.
+    :param notify_type_name: Название типа уведомлений.
+    """
+    subscribed_emails = []
+    with db.get_db_session() as session:
+        notify_type = db.crud.find_notification_type(session, notify_type_name)
+        if notify_type is None:
+            output_text = "⛔️ Такой тип уведомлений не был найден в базе данных.\n"
+        else:
+            chats = db.crud.find_chats(session, emails)
+            subscribed = db.crud.add_notification_subscribers(
+                session, chats, notify_type, event.from_chat, date_and_time.get_current_date_moscow()
+            )
+            subscribed_emails = [chat.email for chat in subscribed]
+            output_text = _format_bulk_result(
+                emails, subscribed_emails, {chat.email for chat in chats},
+                f"✅ Подписаны на уведомления типа '<i>{html.escape(notify_type.type)}</i>':",
+                "✅ Уже подписаны:"
+            )
+            notify_type_type = notify_type.type
+
+    bot_extensions.send_long_text(
+        bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+    )
+
+    if subscribed_emails:
+        # Сообщить администраторам о новых подписчиках на уведомления
+        admin_notify_text = (f"Чаты с email = {', '.join(subscribed_emails)} были подписаны на уведомления "
+                             f"типа '{notify_type_type}' (пользователем: {html.escape(event.from_chat)}).")
+        notifications.send_notification_to_administrators(bot, admin_notify_text)
+
+        # Сообщить в подписавшиеся чаты о подписке
+        bot_extensions.broadcast_to_chats(
+            bot=bot,
+            chat_ids=subscribed_emails,
+            text=f"📩 Система: Вы подписаны на уведомления типа '<i>{html.escape(notify_type_type)}</i>'",
+            parse_mode='HTML'
+        )
+
+
+def _del_notify_subscribers_bulk(bot: Bot, event: Event, emails: List[str], notify_type_name: str):
+    """
+    Отписать список чатов от типа уведомлений за одну транзакцию.
+
+    :param bot: VKTeams bot.
+    :param event: Событие.
+    :param emails: Email чатов.
+    :param notify_type_name: Название типа уведомлений.
+    """
+    unsubscribed_emails = []
+    with db.get_db_session() as session:
+        notify_type = db.crud.find_notification_type(session, notify_type_name)
+        if notify_type is None:
+            output_text = "⛔️ Такой тип уведомлений не был найден в базе данных.\n"
+        else:
+            chats = db.crud.find_chats(session, emails)
+            unsubscribed = db.crud.delete_notification_subscribers(session, chats, notify_type)
+            unsubscribed_emails = [chat.email for chat in unsubscribed]
+            output_text = _format_bulk_result(
+                emails, unsubscribed_emails, {chat.email for chat in chats},
+                f"✅ Отписаны от уведомлений типа '<i>{html.escape(notify_type.type)}</i>':",
+                "✅ Не были подписаны:"
+            )
+            notify_type_type = notify_type.type
+
+    bot_extensions.send_long_text(
+        bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+    )
+
+    if unsubscribed_emails:
+        # Сообщить администраторам об отписке чатов от уведомлений
+        admin_notify_text = (f"Чаты с email = {', '.join(unsubscribed_emails)} были отписаны от уведомлений "
+                             f"типа '{notify_type_type}' (пользователем: {html.escape(event.from_chat)}).")
+        notifications.send_notification_to_administrators(bot, admin_notify_text)
+
+        # Сообщить в отписавшиеся чаты об отписке
+        bot_extensions.broadcast_to_chats(
+            bot=bot,
+            chat_ids=unsubscribed_emails,
+            text=f"📩 Система: Вы отписаны от уведомлений типа '<i>{html.escape(notify_type_type)}</i>'",
+            parse_mode='HTML'
+        )
+
+
+def _add_admins_bulk(bot: Bot, event: Event, emails: List[str]):
+    """
+    Сделать список пользователей администраторами за одну транзакцию.
+
+    :param bot: VKTeams bot.
+    :param event: Событие.
+    :param emails: Email чатов пользователей.
+    """
+    with db.get_db_session() as session:
+        chats = db.crud.find_chats(session, emails)
+        users = [chat.user for chat in chats if chat.user is not None]
+        granted = db.crud.create_administrators(
+            session, users, event.from_chat, date_and_time.get_current_date_moscow()
+        )
+        granted_emails = [user.chat.email for user in granted]
+        not_users = [chat.email for chat in chats if chat.user is None]
+        output_text = _format_bulk_result(
+            emails, granted_emails, {chat.email for chat in chats if chat.user is not None},
+            "✅ Сделаны администраторами:", "✅ Уже являются администраторами:"
+        )
+
+    invalidate_admin_access(*granted_emails)
+
+    if not_users:
+        output_text += (f"\n⛔️ Не принадлежат пользователю (администратором можно сделать только чат "
+                        f"типа '{html.escape(ChatType.PRIVATE.value)}'):\n")
+        output_text += '\n'.join(f"- <i>{html.escape(email)}</i>" for email in not_users)
+
+    bot_extensions.send_long_text(
+        bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+    )
+
+    if granted_emails:
+        # Сообщить администраторам о добавлении администраторов
+        admin_text = (f"Добавлены новые администраторы (пользователем: {html.escape(event.from_chat)}):\n"
+                      f"{', '.join(granted_emails)}")
+        notifications.send_notification_to_administrators(bot, admin_text)
+
+        # Сообщить в чаты новых администраторов
+        bot_extensions.broadcast_to_chats(
+            bot=bot, chat_ids=granted_emails, text="📩 Система: Вы стали администратором."
+        )
+
+
+def _del_chats_bulk(bot: Bot, event: Event, emails: List[str]):
+    """
+    Удалить список чатов из базы данных за одну транзакцию.
+
+    :param bot: VKTeams bot.
+    :param event: Событие.
+    :param emails: Email чатов.
+    """
+    with db.get_db_session() as session:
+        chats = db.crud.find_chats(session, emails)
+        deleted_emails = [chat.email for chat in chats]
+        db.crud.delete_chats(session, chats)
+
+    invalidate_admin_access(*deleted_emails)
+    output_text = _format_bulk_result(
+        emails, deleted_emails, set(deleted_emails), "✅ Удалены из базы данных:", ""
+    )
+    bot_extensions.send_long_text(
+        bot, event.from_chat, output_text, reply_msg_id=event.msgId, parse_mode='HTML'
+    )
+
+    if deleted_emails:
+        # Сообщить администраторам
+        admin_text = (f"Чаты удалены (пользователем: {html.escape(event.from_chat)}):\n"
+                      f"{', '.join(deleted_emails)}")
+        notifications.send_notification_to_administrators(bot, admin_text)
+
+        # Сообщить в чаты удалённых объектов
+        bot_extensions.broadcast_to_chats(
+            bot=bot, chat_ids=deleted_emails, text="📩 Система: Вы больше не зарегистрированы в системе."
+        )
@@ -18,6 +18,10 @@ class Commands(Enum):
     FIND_DATA = "find_data"
     ADD_NOTIFY_SUBSCRIBER = "add_notify_subscriber"
     DEL_NOTIFY_SUBSCRIBER = "del_notify_subscriber"
+    NOTIFY_FILTER = "notify_filter"
+    MAINTENANCE = "maintenance"
+    QUIET_HOURS = "quiet_hours"
+    HANDLER_STATS = "handler_stats"
     ADD_ADMIN = "add_admin"
     DEL_ADMIN = "del_admin"
     DEL_CHAT = "del_chat"
@@ -88,7 +92,10 @@ ADD_NOTIFY_SUBSCRIBER_REFERENCE = (f"<b>Формат: /{Commands.ADD_NOTIFY_SUBS
                                    "🔹 &lt;<i>название типа уведомления</i>&gt; '<i>-desc</i>' - "
                                    "получить описание типа уведомления;\n"
                                    "🔹 &lt;<i>email чата</i>&gt; &lt;<i>название типа уведомления</i>&gt; - "
-                                   "подписать чат на выбранный тип уведомлений.")
+                                   "подписать чат на выбранный тип уведомлений;\n"
+                                   "🔹 &lt;<i>email чата</i>&gt;,&lt;<i>email чата</i>&gt;,... "
+                                   "&lt;<i>название типа уведомления</i>&gt; - "
+                                   "подписать список чатов на выбранный тип уведомлений.")
 
 DEL_NOTIFY_SUBSCRIBER_REFERENCE = (f"<b>Формат: /{Commands.DEL_NOTIFY_SUBSCRIBER.value} [option] ...</b>\n\n"
                                    f"- Команда предназначена для отзыва подписки у чата на заданный тип уведомлений.\n\n"
@@ -97,12 +104,60 @@ DEL_NOTIFY_SUBSCRIBER_REFERENCE = (f"<b>Формат: /{Commands.DEL_NOTIFY_SUBS
                                    "🔹 &lt;<i>название типа уведомления</i>&gt; '<i>-desc</i>' - "
                                    "получить описание типа уведомления;\n"
                                    "🔹 &lt;<i>email чата</i>&gt; &lt;<i>название типа уведомления</i>&gt; - "
-                                   "отписать чат от выбранного типа уведомлений.")
+                                   "отписать чат от выбранного типа уведомлений;\n"
+                                   "🔹 &lt;<i>email чата</i>&gt;,&lt;<i>email чата</i>&gt;,... "
+                                   "&lt;<i>название типа уведомления</i>&gt; - "
+                                   "отписать список чатов от выбранного типа уведомлений.")
+
+NOTIFY_FILTER_REFERENCE = (f"<b>Формат: /{Commands.NOTIFY_FILTER.value} [option] ...</b>\n\n"
+                           f"- Команда предназначена для настройки правил фильтрации уведомлений подписчика.\n"
+                           f"  Подписчик без правил получает все уведомления типа, подписчик с правилами — только "
+                           f"события, подходящие хотя бы под одно правило (выполнены все условия правила).\n\n"
+                           f"<b>Список опций:</b>\n"
+                           "🔹 &lt;<i>email чата</i>&gt; &lt;<i>название типа уведомления</i>&gt; - "
+                           "получить список правил подписчика;\n"
+                           "🔹 &lt;<i>email чата</i>&gt; &lt;<i>название типа уведомления</i>&gt; &lt;<i>условия</i>&gt; - "
+                           "добавить правило. Условия: '<i>severity=High</i>', '<i>group=\"Linux servers\"</i>', "
+                           "'<i>host=db-*</i>', '<i>tag=env:prod</i>' (или только ключ тега '<i>tag=env</i>');\n"
+                           "🔹 &lt;<i>email чата</i>&gt; &lt;<i>название типа уведомления</i>&gt; '<i>-clear</i>' - "
+                           "удалить все правила подписчика.")
+
+MAINTENANCE_REFERENCE = (f"<b>Формат: /{Commands.MAINTENANCE.value} [option] ...</b>\n\n"
+                         f"- Команда предназначена для управления окнами обслуживания: в течение окна уведомления "
+                         f"типа, подходящие под условия окна, не отправляются подписчикам.\n"
+                         f"  Время окна указывается по Москве.\n\n"
+                         f"<b>Список опций:</b>\n"
+                         "🔹 '<i>-list</i>' - получить список действующих и запланированных окон;\n"
+                         "🔹 &lt;<i>название типа уведомления</i>&gt; '<i>start=\"2024-05-17 22:00\"</i>' "
+                         "'<i>end=\"2024-05-18 02:00\"</i>' [<i>параметры</i>] - добавить окно. "
+                         "Параметры: '<i>name=\"Обновление БД\"</i>', '<i>group=\"Linux servers\"</i>', "
+                         "'<i>host=db-*</i>', '<i>tag=env:prod</i>' (без условий подавляются все события типа), "
+                         "'<i>rollup=yes</i>' - отправить сводку подавленных событий по окончании окна;\n"
+                         "🔹 '<i>-del</i>' &lt;<i>ID окна</i>&gt; - удалить окно.")
+
+QUIET_HOURS_REFERENCE = (f"<b>Формат: /{Commands.QUIET_HOURS.value} [option] ...</b>\n\n"
+                         f"- Команда предназначена для настройки тихих часов чата: в это время уведомления "
+                         f"подписок чата не отправляются.\n\n"
+                         f"<b>Список опций:</b>\n"
+                         "🔹 &lt;<i>email чата</i>&gt; - получить тихие часы чата;\n"
+                         "🔹 &lt;<i>email чата</i>&gt; &lt;<i>22:00-08:00</i>&gt; [<i>параметры</i>] - задать тихие часы. "
+                         "Параметры: '<i>tz=Asia/Yekaterinburg</i>' - часовой пояс чата (по умолчанию Europe/Moscow), "
+                         "'<i>rollup=yes</i>' - отправить сводку подавленных уведомлений по окончании тихих часов;\n"
+                         "🔹 &lt;<i>email чата</i>&gt; '<i>-clear</i>' - удалить тихие часы чата.")
+
+HANDLER_STATS_REFERENCE = (f"<b>Формат: /{Commands.HANDLER_STATS.value} [option] ...</b>\n\n"
+                           f"- Команда предназначена для просмотра метрик обработки команд бота: количество вызовов "
+                           f"и ошибок, время выполнения, время запросов к базе данных и API.\n\n"
+                           f"<b>Список опций:</b>\n"
+                           "🔹 '<i>-list</i>' - получить метрики команд (по убыванию суммарного времени выполнения);\n"
+                           "🔹 '<i>-reset</i>' - сбросить накопленные метрики.")
 
 ADD_ADMIN_REFERENCE = (f"<b>Формат: /{Commands.ADD_ADMIN.value} [option] ...</b>\n\n"
                        f"- Команда предназначена для добавления нового администратора.\n\n"
                        f"<b>Список опций:</b>\n"
-                       f"🔹 &lt;<i>email чата</i>&gt; - сделать пользователя администратором.")
+                       f"🔹 &lt;<i>email чата</i>&gt; - сделать пользователя администратором;\n"
+                       f"🔹 &lt;<i>email чата</i>&gt;,&lt;<i>email чата</i>&gt;,... - "
+                       f"сделать список пользователей администраторами.")
 
 DEL_ADMIN_REFERENCE = (f"<b>Формат: /{Commands.DEL_ADMIN.value} [option] ...</b>\n\n"
                        f"- Команда предназначена для отзыва роли администратора.\n\n"
@@ -112,4 +167,6 @@ DEL_ADMIN_REFERENCE = (f"<b>Формат: /{Commands.DEL_ADMIN.value} [option] .
 DEL_CHAT_REFERENCE = (f"<b>Формат: /{Commands.DEL_CHAT.value} [option] ...</b>\n\n"
                       f"- Команда предназначена для удаления чата, вместе со связанным пользователем или группой.\n\n"
                       f"<b>Список опций:</b>\n"
-                      f"🔹 &lt;<i>email чата</i>&gt; - удалить чат из базы данных.")
+                      f"🔹 &lt;<i>email чата</i>&gt; - удалить чат из базы данных;\n"
+                      f"🔹 &lt;<i>email чата</i>&gt;,&lt;<i>email чата</i>&gt;,... - "
+                      f"удалить список чатов из базы данных.")
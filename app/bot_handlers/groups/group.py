@@ -6,7 +6,7 @@ from app import db
 from app.utils import date_and_time, db_records_format
 from app.core import bot_extensions
 from app.bot_handlers.helpers import (
-    send_not_found_chat, catch_and_log_exceptions, administrator_access
+    send_not_found_chat, catch_and_log_exceptions, administrator_access, invalidate_admin_access
 )
 from app.bot_handlers.constants import (
     Commands, INFO_REQUEST_MESSAGE, START_REQUEST_MESSAGE, HELP_BASE_MESSAGE
@@ -115,6 +115,8 @@ def delete_group_registration(bot: Bot, event: Event):
         if db.crud.find_chat(session, event.from_chat) is not None:
             db.crud.delete_chat(session, chat)
 
+    invalidate_admin_access(event.from_chat)
+
     # Отправляем сообщение в текущий чат
     output_text = ("✅ Группа не зарегистрированы в системе бота.\n\n"
                    f"{START_REQUEST_MESSAGE}\n\n"
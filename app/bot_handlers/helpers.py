@@ -2,7 +2,7 @@ import inspect
 import json
 import logging
 import html
-from typing import get_type_hints, Optional, List, Any, Dict, Tuple
+from typing import get_type_hints, Optional, List, Any, Dict, Tuple, FrozenSet
 from functools import wraps
 from bot.bot import Bot, Event, EventType
 from bot.constant import ChatType
@@ -12,7 +12,88 @@ from .constants import (
     CallbackAction, INFO_REQUEST_MESSAGE
 )
 from app.core import bot_extensions
-from app.utils import db_records_format
+from app.core.handler_metrics import handler_metrics
+from app.utils import db_records_format, ttl_cache
+
+
+# -------------------- Кэш проверки прав администратора --------------------
+
+
+# Время жизни результатов проверки прав администратора (в секундах)
+ADMIN_ACCESS_TTL = 30.0
+
+# Является ли пользователь администратором приложения: {email чата: bool}
+_administrators_cache = ttl_cache.TTLCache(ADMIN_ACCESS_TTL)
+
+# userId администраторов группы: {ID чата группы: frozenset}
+_group_admins_cache = ttl_cache.TTLCache(ADMIN_ACCESS_TTL)
+
+
+def _is_administrator(email: str) -> bool:
+    """
+    Проверить, является ли пользователь чата администратором приложения (с кэшированием).
+
+    :param email: Email чата пользователя.
+    :return: True, если пользователь администратор.
+    """
+    is_admin = _administrators_cache.get(email)
+    if is_admin is None:
+        with db.get_db_session() as session:
+            chat = db.crud.find_chat(session, email)
+            user = chat.user if chat is not None else None
+            is_admin = user is not None and user.administrator is not None
+        _administrators_cache.set(email, is_admin)
+    return is_admin
+
+
+def _get_group_admins(bot: Bot, chat_id: str) -> FrozenSet[str]:
+    """
+    Получить userId администраторов группы (с кэшированием).
+    Ошибки запроса не кэшируются.
+
+    :param bot: VKTeams bot.
+    :param chat_id: ID чата группы.
+    :return: Множество userId администраторов.
+    :raises PermissionError: Не удалось получить список администраторов.
+    """
+    admins = _group_admins_cache.get(chat_id)
+    if admins is not None:
+        return admins
+
+    response = bot.get_chat_admins(chat_id)
+    response.raise_for_status()
+
+    response_data = response.json()
+
+    # Если ответ за запрос списка администраторов некорректен
+    if not response_data.get('ok', False):
+        error_text = "❌ Нет возможности выполнить команду."
+
+        desc_error: str = response_data.get('description', "")
+
+        if "permission denied" in desc_error.lower():
+            error_text += ("\nБот не обладает правами администратора данной группы, "
+                           "для выполнения заданного действия.")
+        else:
+            error_text += f"\nПричина: {desc_error}"
+
+        raise PermissionError(error_text)
+
+    admins = frozenset(user['userId'] for user in response_data.get('admins', []))
+    _group_admins_cache.set(chat_id, admins)
+    return admins
+
+
+def invalidate_admin_access(*chat_ids: str) -> None:
+    """
+    Сбросить кэш проверки прав администратора для чатов
+    (после изменения администраторов или удаления чатов).
+
+    :param chat_ids: Email (ID) чатов.
+    """
+    for chat_id in chat_ids:
+        _administrators_cache.pop(chat_id)
+        _group_admins_cache.pop(chat_id)
 
 
 # -------------------- Декораторы --------------------
@@ -46,41 +127,13 @@ def administrator_access(func):
         try:
             # Если приватный тип чата
             if event.chat_type == ChatType.PRIVATE.value:
-                with db.get_db_session() as session:
-                    chat = db.crud.find_chat(session, event.from_chat)
-                    user = chat.user if chat is not None else None
-                    is_admin = user.administrator is not None \
-                        if user is not None else False
-
                 # Если чат не существует или пользователь не является администратором
-                if chat is None or user is None or not is_admin:
+                if not _is_administrator(event.from_chat):
                     raise PermissionError("⛔️ Нет доступа для выполнения команды.\n"
                                           "Вы не администратор.")
-            else:
-                response = bot.get_chat_admins(event.from_chat)
-                response.raise_for_status()
-
-                response_data = response.json()
-
-                # Если ответ за запрос списка администраторов корректен
-                if response_data.get('ok', False):
-                    is_admin = any(user['userId'] == event.message_author['userId'] for user in response_data.get('admins', []))
-                    'admins'
-                    if not is_admin:
-                        raise PermissionError("⛔️ Нет доступа для выполнения команды.\n"
-                                              "Вы не администратор группы.")
-                else:
-                    error_text = "❌ Нет возможности выполнить команду."
-
-                    desc_error: str = response_data.get('description', "")
-
-                    if "permission denied" in desc_error.lower():
-                        error_text += ("\nБот не обладает правами администратора данной группы, "
-                                       "для выполнения заданного действия.")
-                    else:
-                        error_text += f"\nПричина: {desc_error}"
-
-                    raise PermissionError(error_text)
+            elif event.message_author['userId'] not in _get_group_admins(bot, event.from_chat):
+                raise PermissionError("⛔️ Нет доступа для выполнения команды.\n"
+                                      "Вы не администратор группы.")
         except PermissionError as permission_error:
             # Если кнопка и приватный чат
             if event.type == EventType.CALLBACK_QUERY and event.chat_type == ChatType.PRIVATE.value:
@@ -117,11 +170,13 @@ def catch_and_log_exceptions(func):
         try:
             return func(*args, **kwargs)
         except bot_extensions.MessageDeliveryError as delivery_err:
+            handler_metrics.mark_error()
             module = inspect.getmodule(func)
             logger = logging.getLogger(module.__name__ if module else __name__)
             logger.exception(f"Error in {func.__name__}: {str(delivery_err)}")
             return
         except Exception as e:
+            handler_metrics.mark_error()
             module = inspect.getmodule(func)
             logger = logging.getLogger(module.__name__ if module else __name__)
             logger.exception(f"Error in {func.__name__}: {str(e)}")
@@ -301,7 +356,7 @@ def send_available_database_tables(bot: Bot, chat_id: str):
     :param bot: VKTeams bot.
     :param chat_id: Чат, в который отправляется список.
     """
-    tables: List[str] = list(db.models.Base.metadata.tables.keys())
+    tables: List[str] = db.get_all_tables_names()
 
     output_text = ("<b>Список доступных таблиц базы данных:</b>\n\n"
                    f"{'[' + html.escape(', '.join(tables)) + ']' if tables else 'Нет доступных'}")
@@ -321,18 +376,16 @@ def send_database_table_fields(bot: Bot, chat_id: str, table_name: str, reply_ms
     :param table_name: Название таблицы базы данных.
     :param reply_msd_id: Ответить на сообщение с заданным ID, если таблица не найдена.
     """
-    if not db.model_exists_by_table_name(table_name):
+    table_info = db.registry.get_table_info(table_name)
+    if table_info is None:
         not_found_text = "⛔️ Таблицы с таким названием не существует."
         bot_extensions.send_text_or_raise(
             bot, chat_id, not_found_text, reply_msg_id=reply_msd_id, parse_mode='HTML'
         )
         return
-    cols_info = []
-    for col in db.get_table_columns(table_name):
-        cols_info.append(f"{col.name} — {col.type}")
     text = (
             f"Поля таблицы '{table_name}':\n\n" +
-            "\n".join(line for line in cols_info)
+            "\n".join(f"{name} — {col_type}" for name, col_type in table_info.column_types.items())
     )
     bot_extensions.send_text_or_raise(
         bot, chat_id, text
@@ -392,61 +445,57 @@ def parse_callback_data(data: str) -> Dict[str, Any]:
         raise ValueError("Invalid callback_data format.")
 
 
-def generate_db_records_page(records: List[db.T], total_records: int,
-                             model_config: db_records_format.ModelFormatConfig,
-                             callback_data: str, page_key: str) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
+def generate_db_keyset_page(records: List[db.T], model_config: db_records_format.ModelFormatConfig,
+                            callback_dict: Dict[str, Any], page_key: str,
+                            *,
+                            has_prev: bool, has_next: bool) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
     """
-    Сформировать и отформатировать данные для страничного вывода записей базы данных в чат.
+    Сформировать и отформатировать страницу записей базы данных, полученную keyset-пагинацией.
+    Курсоры переходов (ключи 'a' - после записи, 'b' - до записи) сохраняются в данных кнопок,
+    поэтому следующий запрос страницы не зависит от её номера.
 
-    :param records: Список ORM-моделей записей базы данных.
-    :param total_records: Максимальное количество записей всей выборки (используется для добавления кнопки 'Далее').
+    :param records: Список ORM-моделей записей текущей страницы.
     :param model_config: Конфигурация модели для полученного списка записей.
-    :param callback_data: Полученные данные вызова кнопки чата.
+    :param callback_dict: Разобранные данные вызова кнопки чата.
     :param page_key: Ключ значения страницы в данных вызова кнопки.
+    :param has_prev: Есть ли предыдущая страница.
+    :param has_next: Есть ли следующая страница.
     :return: Кортеж, состоящий из текста и опциональной встроенной клавиатуры.
     """
-    model, model_fields, page_size = model_config
+    model, model_fields, _ = model_config
     table_name = db.get_tablename_by_model(model)
-    callback_dict = parse_callback_data(callback_data)
     page: int = callback_dict[page_key]
 
-    # Последняя ли страница
-    has_next = page * page_size + page_size < total_records
+    # Параметры кнопки без курсоров текущей страницы
+    base_callback_dict = {k: v for k, v in callback_dict.items() if k not in ('a', 'b')}
 
-    # Кнопки перехода
-    markup: Optional[InlineKeyboardMarkup] = None
-    button_back: Optional[KeyboardButton] = None
-    button_next: Optional[KeyboardButton] = None
+    buttons: List[KeyboardButton] = []
 
-    if page > 0:
-        # Обновляем параметры номер страницы
-        back_callback_dict = callback_dict.copy()
-        back_callback_dict[page_key] = page - 1
-        back_callback_data = validate_and_make_callback_data(back_callback_dict)
+    if has_prev and page > 0:
+        back_callback_dict = dict(base_callback_dict, **{page_key: page - 1})
+        # Первая страница запрашивается без курсора
+        if page - 1 > 0 and records:
+            back_callback_dict['b'] = db.crud.get_keyset_cursor(records[0])
+        else:
+            back_callback_dict[page_key] = 0
 
-        button_back = KeyboardButton(
-            text='<< Назад', style='primary', callbackData=back_callback_data
-        )
+        buttons.append(KeyboardButton(
+            text='<< Назад', style='primary', callbackData=validate_and_make_callback_data(back_callback_dict)
+        ))
 
-    if has_next:
-        # Обновляем параметры номер страницы
-        next_callback_dict = callback_dict.copy()
-        next_callback_dict[page_key] = page + 1
-        next_callback_data = validate_and_make_callback_data(next_callback_dict)
+    if has_next and records:
+        next_callback_dict = dict(base_callback_dict, **{page_key: page + 1})
+        next_callback_dict['a'] = db.crud.get_keyset_cursor(records[-1])
 
-        button_next = KeyboardButton(
-            text='Дальше >>', style='primary', callbackData=next_callback_data
-        )
+        buttons.append(KeyboardButton(
+            text='Дальше >>', style='primary', callbackData=validate_and_make_callback_data(next_callback_dict)
+        ))
 
     # Формируем разметку кнопок
-    if button_back is not None or button_next is not None:
+    markup: Optional[InlineKeyboardMarkup] = None
+    if buttons:
         markup = InlineKeyboardMarkup()
-        row = []
-        if button_back is not None:
-            row.append(button_back)
-        if button_next is not None:
-            row.append(button_next)
-        markup.row(*row)
+        markup.row(*buttons)
 
     if not records:
         text = f"Список найденных записей таблицы '{table_name}'\n\n📭 Записей нет."
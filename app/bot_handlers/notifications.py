@@ -1,16 +1,52 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 import logging
+import threading
+from sqlalchemy import event
+from sqlalchemy.orm import Session, ORMExecuteState
 from bot.bot import Bot
 from .constants import NotificationTypes
-from app.core import bot_extensions
+from app.core import bot_extensions, executor_pool
+from app.utils import flapping, ttl_cache
 from app import db
 
+# Интервал проверки окончившихся окон обслуживания, тихих часов и нестабильных триггеров (в секундах)
+ROLLUP_CHECK_INTERVAL = 30.0
+
+# Время жизни кэша подписчиков для уведомлений без данных события (в секундах)
+SUBSCRIBERS_CACHE_TTL = 60.0
+
+# Кэш подписчиков по типу уведомления (до применения окон обслуживания и тихих часов):
+# {тип уведомления: (ID типа уведомления, [получатель])}.
+# Сбрасывается после фиксации транзакции, изменившей подписчиков или чаты
+_subscribers_cache = ttl_cache.TTLCache(SUBSCRIBERS_CACHE_TTL, max_size=16)
+
+# Ключ отметки изменения подписчиков в Session.info
+_SUBSCRIBERS_CHANGED_KEY = "subscribers_changed"
+
+# Таблицы, изменение которых меняет списки подписчиков
+_SUBSCRIBERS_TABLES = (db.NotificationSubscriber.__tablename__, db.Chat.__tablename__)
+
+# Отслеживание дребезга триггеров Zabbix
+zabbix_flapping = flapping.FlapTracker()
+
+# Заголовки сводок по причинам подавления ({title} — название окна обслуживания)
+_ROLLUP_TITLES = {
+    db.suppression.REASON_MAINTENANCE: "Окно обслуживания '{title}' завершено",
+    db.suppression.REASON_QUIET_HOURS: "Тихие часы завершены",
+}
+
 
 def send_notification_to_subscribers(bot: Bot, notification_type: NotificationTypes, text: str,
                                      inline_keyboard_markup=None, parse_mode: str = None, format_=None,
-                                     logger: Optional[logging.Logger] = None):
+                                     logger: Optional[logging.Logger] = None, event_data: Any = None,
+                                     cache_subscribers: bool = False, workload: str = executor_pool.WORKLOAD_ALERTS,
+                                     rate_limiter=None, breaker=None):
     """
     Отправить уведомление в чаты, подписанные за данный тип уведомлений.
+    Если переданы данные события, подписчики с правилами фильтрации получают уведомление,
+    только если событие подходит хотя бы под одно их правило.
+    Уведомления, попавшие в окно обслуживания или тихие часы чата, не отправляются
+    (учитываются в сводке, см. send_suppression_rollups).
 
     :param bot: VKTeams bot.
     :param notification_type: Тип уведомления.
@@ -19,20 +55,25 @@ def send_notification_to_subscribers(bot: Bot, notification_type: NotificationTy
     :param parse_mode: Тип разбора текста.
     :param format_: Описание форматирования текста (передаётся раздельно с parse_mod).
     :param logger: Внешний логгер.
+    :param event_data: Данные события для фильтрации подписчиков (None — без фильтрации).
+    :param cache_subscribers: Использовать список подписчиков из кэша (до SUBSCRIBERS_CACHE_TTL секунд),
+                              только без данных события. Окна обслуживания и тихие часы применяются
+                              к кэшированному списку при каждой отправке.
+    :param workload: Вид нагрузки, пул которого выполняет рассылку (см. executor_pool).
+    :param rate_limiter: Ограничение частоты отправки (None — ограничение вида нагрузки).
+    :param breaker: Автоматический выключатель рассылки (None — выключатель вида нагрузки).
     """
+    cache_subscribers = cache_subscribers and event_data is None
     with db.get_db_session() as session:
-        notify_type = db.crud.find_notification_type(session, notification_type.value)
-
-        if notify_type is None:
-            raise ValueError(f"Notification type '{notification_type.value}' does not exist in the database.")
+        cached = _subscribers_cache.get(notification_type) if cache_subscribers else None
+        if cached is None:
+            cached = _find_recipients(session, notification_type, event_data)
+            if cache_subscribers:
+                _subscribers_cache.set(notification_type, cached)
 
-        subscribers: List[db.NotificationSubscriber] = notify_type.subscribers.all()
-
-        # Получаем список email чатов, для отправки
-        emails = [
-            subscriber.chat.email
-            for subscriber in subscribers
-        ]
+        notification_type_id, recipients = cached
+        recipients = db.suppression.select_recipients(session, notification_type_id, recipients, event_data)
+    emails = [recipient.email for recipient in recipients]
 
     # Если есть хотя-бы один подписчик отправляем уведомление
     if emails:
@@ -47,9 +88,38 @@ def send_notification_to_subscribers(bot: Bot, notification_type: NotificationTy
             wait_for_completion=False,
             logger=logger,
             suppress_notification_log=False,
+            workload=workload,
+            rate_limiter=rate_limiter,
+            breaker=breaker,
         )
 
 
+def _find_recipients(session, notification_type: NotificationTypes,
+                     event_data: Any = None) -> Tuple[int, List[db.suppression.Recipient]]:
+    """
+    Получить чаты, подписанные на тип уведомления (с учётом фильтров, без учёта подавления).
+
+    :param session: Текущая сессия.
+    :param notification_type: Тип уведомления.
+    :param event_data: Данные события для фильтрации подписчиков (None — без фильтрации).
+    :return: ID типа уведомления и список получателей.
+    """
+    notify_type = db.crud.find_notification_type(session, notification_type.value)
+
+    if notify_type is None:
+        raise ValueError(f"Notification type '{notification_type.value}' does not exist in the database.")
+
+    subscribers: List[db.NotificationSubscriber] = notify_type.subscribers.all()
+
+    if event_data is not None:
+        subscribers = db.filter_index.select_subscribers(session, notify_type, subscribers, event_data)
+
+    return notify_type.id, [
+        db.suppression.Recipient(subscriber.chat_id, subscriber.chat.email)
+        for subscriber in subscribers
+    ]
+
+
 def send_notification_to_administrators(bot: Bot, text: str, inline_keyboard_markup=None,
                                         parse_mode: str = None, format_=None):
     """
@@ -84,3 +154,130 @@ def send_notification_to_administrators(bot: Bot, text: str, inline_keyboard_mar
             logger=None,
             suppress_notification_log=False,
         )
+
+
+# -------------------- Сброс кэша подписчиков --------------------
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_subscriber_changes(session: Session, _flush_context):
+    """
+    Отметить сессию, если сброшенные изменения добавляют или удаляют подписчиков или чаты.
+    """
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, (db.NotificationSubscriber, db.Chat)):
+            session.info[_SUBSCRIBERS_CHANGED_KEY] = True
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_subscriber_changes(orm_execute_state: ORMExecuteState):
+    """
+    Отметить сессию при пакетных INSERT/DELETE подписчиков или чатов (в обход ORM).
+    """
+    if not (orm_execute_state.is_insert or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if getattr(table, "name", None) in _SUBSCRIBERS_TABLES:
+        orm_execute_state.session.info[_SUBSCRIBERS_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _reset_subscribers_cache(session: Session):
+    """
+    Сбросить кэш подписчиков после фиксации транзакции, изменившей подписчиков или чаты.
+    """
+    if session.info.pop(_SUBSCRIBERS_CHANGED_KEY, False):
+        _subscribers_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_subscriber_changes(session: Session):
+    """
+    Отбросить отметку изменений отменённой транзакции.
+    """
+    session.info.pop(_SUBSCRIBERS_CHANGED_KEY, None)
+
+
+def format_rollup(rollup: db.suppression.Rollup) -> str:
+    """
+    Сформировать текст сводки подавленных уведомлений.
+
+    :param rollup: Сводка.
+    :return: Текст сводки.
+    """
+    title = _ROLLUP_TITLES.get(rollup.reason, rollup.reason).format(title=rollup.title)
+    lines = [f"🔕 {title}. Подавлено уведомлений: {rollup.count}."]
+    if rollup.severities:
+        severities = sorted(rollup.severities.items(), key=lambda item: (-item[1], item[0]))
+        lines.append("Важность: " + ", ".join(f"{severity} — {count}" for severity, count in severities))
+    if rollup.hosts:
+        hosts = ", ".join(rollup.hosts)
+        if rollup.more_hosts:
+            hosts += f" и ещё {rollup.more_hosts}"
+        lines.append(f"Хосты: {hosts}")
+    return "\n".join(lines)
+
+
+def send_suppression_rollups(bot: Bot, logger: Optional[logging.Logger] = None) -> int:
+    """
+    Отправить сводки подавленных уведомлений окон обслуживания и тихих часов, которые закончились.
+
+    :param bot: VKTeams bot.
+    :param logger: Внешний логгер.
+    :return: Количество отправленных сводок.
+    """
+    rollups = db.suppression.pop_due_rollups()
+    for rollup in rollups:
+        if not rollup.recipients:
+            continue
+        bot_extensions.broadcast_to_chats(
+            bot=bot,
+            chat_ids=sorted(rollup.recipients),
+            text=f"🔔 Новое уведомление.\n\n{format_rollup(rollup)}",
+            wait_for_completion=False,
+            logger=logger,
+            suppress_notification_log=False,
+            workload=executor_pool.WORKLOAD_ALERTS,
+        )
+    return len(rollups)
+
+
+def send_flapping_updates(bot: Bot, updates: List[flapping.FlapUpdate],
+                          logger: Optional[logging.Logger] = None) -> None:
+    """
+    Отправить подписчикам Zabbix сообщения о дребезге триггеров.
+
+    :param bot: VKTeams bot.
+    :param updates: Сообщения о дребезге.
+    :param logger: Внешний логгер.
+    """
+    for update in updates:
+        send_notification_to_subscribers(
+            bot, NotificationTypes.ZABBIX,
+            flapping.format_update(update, zabbix_flapping.window, zabbix_flapping.status_interval),
+            logger=logger, event_data=update.data
+        )
+
+
+def start_background_notifications(bot: Bot, interval: float = ROLLUP_CHECK_INTERVAL) -> threading.Event:
+    """
+    Запустить фоновую отправку сводок подавленных уведомлений и статусов нестабильных триггеров.
+
+    :param bot: VKTeams bot.
+    :param interval: Интервал проверки (в секундах).
+    :return: Событие остановки фоновой отправки.
+    """
+    stop = threading.Event()
+    logger = logging.getLogger(__name__)
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                send_suppression_rollups(bot, logger)
+                send_flapping_updates(bot, zabbix_flapping.tick(), logger)
+            except Exception as e:
+                logger.error(f"❌ Failed to send background notifications: {e}")
+
+    threading.Thread(target=run, name="background-notifications", daemon=True).start()
+    return stop
@@ -7,7 +7,7 @@ from app import db
 from app.utils import date_and_time, db_records_format
 from app.core import bot_extensions
 from app.bot_handlers.helpers import (
-    send_not_found_chat, catch_and_log_exceptions
+    send_not_found_chat, catch_and_log_exceptions, invalidate_admin_access
 )
 from app.bot_handlers.constants import (
     Commands, INFO_REQUEST_MESSAGE, START_REQUEST_MESSAGE, HELP_BASE_MESSAGE
@@ -52,6 +52,10 @@ def send_help_user(bot: Bot, event: Event, initial_text: str = ""):
                         f"для заданного чата;\n"
                         f"🔹 /{Commands.DEL_NOTIFY_SUBSCRIBER.value} - отписка от уведомлений (отправляемых ботом) "
                         f"для заданного чата;\n"
+                        f"🔹 /{Commands.NOTIFY_FILTER.value} - правила фильтрации уведомлений заданного чата;\n"
+                        f"🔹 /{Commands.MAINTENANCE.value} - окна обслуживания (подавление уведомлений);\n"
+                        f"🔹 /{Commands.QUIET_HOURS.value} - тихие часы заданного чата;\n"
+                        f"🔹 /{Commands.HANDLER_STATS.value} - метрики обработки команд бота;\n"
                         f"🔹 /{Commands.ADD_ADMIN.value} - добавление нового администратора;\n"
                         f"🔹 /{Commands.DEL_ADMIN.value} - отзыв доступа администратора;\n"
                         f"🔹 /{Commands.DEL_CHAT.value} - удаление чата из базы данных приложения.\n")
@@ -92,7 +96,7 @@ def register_user(bot: Bot, event: Event):
             user = db.crud.create_user(session, chat, first_name, last_name)
 
             # Если нет ни одного администратора, делаем созданного пользователя администратором
-            if db.crud.count_records(session, db.Administrator) == 0:
+            if not db.crud.has_records(session, db.Administrator):
                 db.crud.create_administrator(
                     session, user, event.message_author['userId'], date_and_time.get_current_date_moscow()
                 )
@@ -104,6 +108,10 @@ def register_user(bot: Bot, event: Event):
             record_format = db_records_format.format_for_chat(user, model_fields=model_fields)
             admin_request_text = f"🆕 Новый пользователь зарегистрирован.\n\nДанные:\n{record_format}"
 
+    # Первый зарегистрированный пользователь становится администратором
+    if is_register:
+        invalidate_admin_access(event.from_chat)
+
     # Отправляем сообщение в текущий чат
     bot_extensions.send_text_or_raise(
         bot, event.from_chat, output_text, parse_mode='HTML'
@@ -142,6 +150,8 @@ def delete_user_registration(bot: Bot, event: Event):
         if db.crud.find_chat(session, event.from_chat) is not None:
             db.crud.delete_chat(session, chat)
 
+    invalidate_admin_access(event.from_chat)
+
     # Отправляем сообщение в текущий чат
     output_text = ("✅ Вы не зарегистрированы в системе бота.\n\n"
                    f"{START_REQUEST_MESSAGE}\n\n"
@@ -1,2 +1,3 @@
 from .filter import ChatTypeFilter
 from .messages import *
+from .dispatcher import *
@@ -0,0 +1,174 @@
+"""
+Параллельная обработка событий бота с сохранением порядка событий одного чата.
+
+Стандартный Dispatcher выполняет обработчики в потоке опроса событий, поэтому медленный обработчик
+задерживает события всех чатов. ConcurrentDispatcher ставит событие в очередь его чата и выполняет
+обработчики в пуле потоков: события одного чата обрабатываются строго по очереди, события разных
+чатов — параллельно (не более max_workers одновременно). Если в очередях накопилось max_queued
+событий, поток опроса ожидает освобождения места.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, Optional, Tuple
+from bot.bot import Bot
+from bot.dispatcher import Dispatcher
+from app.core import log_context
+
+__all__ = ["ConcurrentDispatcher", "install_concurrent_dispatcher", "DISPATCH_MAX_WORKERS", "DISPATCH_MAX_QUEUED"]
+
+# Количество одновременно обрабатываемых событий
+DISPATCH_MAX_WORKERS = 8
+
+# Максимальное количество событий в очередях чатов
+DISPATCH_MAX_QUEUED = 1000
+
+
+def _chat_key(event) -> str:
+    """
+    Получить ключ очереди события (ID чата; события без чата обрабатываются одной очередью).
+    """
+    chat_id = getattr(event, "from_chat", None)
+    if chat_id is None and isinstance(getattr(event, "data", None), dict):
+        chat_id = (event.data.get("chat") or {}).get("chatId")
+    return chat_id or ""
+
+
+class ConcurrentDispatcher(Dispatcher):
+    """
+    Диспетчер событий, выполняющий обработчики в пуле потоков с сохранением порядка событий чата.
+    """
+
+    def __init__(self, bot: Bot, max_workers: int = DISPATCH_MAX_WORKERS, max_queued: int = DISPATCH_MAX_QUEUED):
+        """
+        :param bot: VKTeams bot.
+        :param max_workers: Количество одновременно обрабатываемых событий.
+        :param max_queued: Максимальное количество событий в очередях чатов.
+        """
+        super().__init__(bot)
+        if max_workers < 1 or max_queued < 1:
+            raise ValueError("❌ max_workers and max_queued must be positive")
+
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dispatch")
+        self._condition = threading.Condition()
+        # Очереди чатов, события которых ожидают или обрабатываются: {ключ чата: [(событие, момент постановки)]}
+        self._queues: Dict[str, Deque[Tuple[Any, float]]] = {}
+        # Метрики
+        self._queued = 0
+        self._running = 0
+        self._processed = 0
+        self._max_queued_seen = 0
+        self._wait_total = 0.0
+        self._shutdown = False
+
+    def dispatch(self, event) -> None:
+        """
+        Поставить событие в очередь его чата.
+
+        :param event: Событие.
+        """
+        key = _chat_key(event)
+        with self._condition:
+            while self._queued >= self.max_queued:
+                self._condition.wait()
+
+            self._queued += 1
+            self._max_queued_seen = max(self._max_queued_seen, self._queued)
+            queue = self._queues.get(key)
+            if queue is not None:
+                # Очередь чата уже обрабатывается: событие будет выполнено после предыдущих
+                queue.append((event, time.monotonic()))
+                return
+            self._queues[key] = deque([(event, time.monotonic())])
+
+        self._executor.submit(self._drain, key)
+
+    def _drain(self, key: str) -> None:
+        """
+        Обработать события очереди чата по порядку, пока очередь не опустеет.
+        """
+        while True:
+            with self._condition:
+                queue = self._queues[key]
+                if not queue:
+                    del self._queues[key]
+                    return
+                event, queued_at = queue.popleft()
+                self._queued -= 1
+                self._running += 1
+                self._wait_total += time.monotonic() - queued_at
+                self._condition.notify()
+
+            try:
+                # Исключения обработчиков перехватываются и логируются базовым диспетчером
+                with log_context.bind(chat_id=key or None, event_id=getattr(event, "msgId", None),
+                                      command=log_context.command_of(getattr(event, "text", None))):
+                    super().dispatch(event)
+            except Exception:
+                logging.getLogger(__name__).exception("❌ Exception while dispatching event")
+            finally:
+                with self._condition:
+                    self._running -= 1
+                    self._processed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Получить метрики очередей обработки событий.
+
+        :return: Словарь: workers — размер пула, running — обрабатываемые события, queued — события в очередях,
+                 chats — чаты с ожидающими или обрабатываемыми событиями, max_chat_queued — наибольшая очередь чата,
+                 max_queued — наибольшее количество событий в очередях, processed — обработано событий,
+                 avg_wait_ms — среднее время ожидания события в очереди (мс),
+                 oldest_wait_s — время ожидания самого старого события в очереди (с),
+                 shutdown — остановлен ли пул обработки.
+        """
+        now = time.monotonic()
+        with self._condition:
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queued": self._queued,
+                "chats": len(self._queues),
+                "max_chat_queued": max((len(queue) for queue in self._queues.values()), default=0),
+                "max_queued": self._max_queued_seen,
+                "processed": self._processed,
+                "avg_wait_ms": round(self._wait_total * 1000 / self._processed, 3) if self._processed else 0.0,
+                "oldest_wait_s": round(max((now - queue[0][1] for queue in self._queues.values() if queue),
+                                           default=0.0), 3),
+                "shutdown": self._shutdown,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Остановить пул обработки событий.
+
+        :param wait: Дождаться обработки событий, поставленных в очередь.
+        """
+        self._shutdown = True
+        self._executor.shutdown(wait=wait)
+
+
+def install_concurrent_dispatcher(bot: Bot, max_workers: int = DISPATCH_MAX_WORKERS,
+                                  max_queued: int = DISPATCH_MAX_QUEUED,
+                                  dispatcher: Optional[ConcurrentDispatcher] = None) -> ConcurrentDispatcher:
+    """
+    Заменить диспетчер бота на ConcurrentDispatcher, сохранив уже добавленные обработчики.
+
+    :param bot: VKTeams bot.
+    :param max_workers: Количество одновременно обрабатываемых событий.
+    :param max_queued: Максимальное количество событий в очередях чатов.
+    :param dispatcher: Готовый диспетчер (если не задан, создаётся новый).
+    :return: Установленный диспетчер.
+    """
+    if isinstance(bot.dispatcher, ConcurrentDispatcher):
+        return bot.dispatcher
+
+    dispatcher = dispatcher or ConcurrentDispatcher(bot, max_workers, max_queued)
+    for handler in bot.dispatcher.handlers:
+        dispatcher.add_handler(handler)
+    bot.dispatcher = dispatcher
+    return dispatcher
@@ -3,14 +3,52 @@ from requests import Response
 import time
 import logging
 from bot.bot import Bot
-from bot.constant import ChatType
+from bot.constant import ChatType, ParseMode
 from app.utils import text_format
 from app.core import executor_pool
+from app.core.metrics import REGISTRY
 from tenacity import retry, stop_after_attempt, wait_exponential, RetryError
 from ratelimiter import RateLimiter
 from pybreaker import CircuitBreaker, CircuitBreakerError
 
 
+# Ограничение частоты и автоматический выключатель рассылок по умолчанию (уведомления и администрирование)
+DEFAULT_RATE_LIMITER = RateLimiter(max_calls=15, period=1)
+DEFAULT_BREAKER = CircuitBreaker(fail_max=5, reset_timeout=60)
+
+# Отдельные ограничение частоты и выключатель рассылок журнала ошибок: всплеск ошибок
+# или недоступный чат подписчика SYSTEM не расходуют лимит и не размыкают выключатель уведомлений
+LOGS_RATE_LIMITER = RateLimiter(max_calls=5, period=1)
+LOGS_BREAKER = CircuitBreaker(fail_max=5, reset_timeout=60)
+
+# Ограничение частоты и выключатель по видам нагрузки (остальные используют значения по умолчанию)
+WORKLOAD_PROTECTION = {
+    executor_pool.WORKLOAD_LOGS: (LOGS_RATE_LIMITER, LOGS_BREAKER),
+}
+
+# Числовые значения состояний автоматического выключателя в метриках
+_BREAKER_STATES = {"closed": 0, "half-open": 1, "open": 2}
+
+# --- Метрики отправки сообщений
+MESSAGES_SENT = REGISTRY.counter("bot_messages_sent", "Messages sent via the bot API by result.", ("result",))
+BROADCAST_DELIVERIES = REGISTRY.counter(
+    "broadcast_deliveries", "Broadcast deliveries by result.", ("result",)
+)
+BROADCAST_RETRIES = REGISTRY.counter("broadcast_retries", "Broadcast delivery retries.")
+RATE_LIMITER_WAIT = REGISTRY.histogram(
+    "broadcast_rate_limiter_wait_seconds", "Time spent waiting for the broadcast rate limiter.",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+REGISTRY.gauge(
+    "broadcast_circuit_breaker_state", "State of the default broadcast circuit breaker (0 closed, 1 half-open, 2 open).",
+    function=lambda: _BREAKER_STATES.get(DEFAULT_BREAKER.current_state, -1)
+)
+REGISTRY.gauge(
+    "log_broadcast_circuit_breaker_state", "State of the log broadcast circuit breaker (0 closed, 1 half-open, 2 open).",
+    function=lambda: _BREAKER_STATES.get(LOGS_BREAKER.current_state, -1)
+)
+
+
 class MessageDeliveryError(Exception):
     """
     Ошибка доставки сообщения до адресата.
@@ -63,17 +101,21 @@ def send_text_or_raise(bot: Bot, chat_id: str, text: str, reply_msg_id=None, for
     )
 
     # Выбрасываем исключение при ошибочном статусе
+    if not response.ok:
+        MESSAGES_SENT.inc(result="http_error")
     response.raise_for_status()
     # Тело ответа сервера
     data: dict = response.json()
     # Если ошибка отправки, создаём исключение
     if not data.get('ok'):
+        MESSAGES_SENT.inc(result="not_delivered")
         raise MessageDeliveryError(
             chat_id=chat_id,
             description=data.get("description", "(no description)"),
             response_data=data
         )
 
+    MESSAGES_SENT.inc(result="ok")
     return response
 
 
@@ -137,7 +179,7 @@ def send_long_text(bot: Bot, chat_id: str, text: str, max_len_text: int = 4096,
     :raises MessageDeliveryError: Ошибка доставки сообщения до адресата.
     :raises
     """
-    parts = text_format.split_text(text, max_len_text)
+    parts = text_format.split_text(text, max_len_text, html=parse_mode in (ParseMode.HTML, ParseMode.HTML.value))
 
     # Если количество частей превышает 50, отправить ошибку
     if len(parts) > 50:
@@ -188,8 +230,9 @@ def broadcast_to_chats(
     wait_for_completion: bool = False,
     logger: Optional[logging.Logger] = None,
     suppress_notification_log: bool = False,
-    rate_limiter: RateLimiter = RateLimiter(max_calls=15, period=1),
-    breaker: CircuitBreaker = CircuitBreaker(fail_max=5, reset_timeout=60)
+    rate_limiter: Optional[RateLimiter] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    workload: str = executor_pool.WORKLOAD_ADMIN
 ) -> None:
     """
     Отправить сообщение в заданный список чатов.
@@ -206,10 +249,17 @@ def broadcast_to_chats(
     :param wait_for_completion: Ожидать ли завершения отправки всех сообщений.
     :param logger: Внешний логгер.
     :param suppress_notification_log: Подавлять ли ошибки отправки сообщений.
-    :param rate_limiter: Количество сообщений за период секунд.
-    :param breaker: Остановка после количества ошибок подряд и время восстановления.
+    :param rate_limiter: Количество сообщений за период секунд (None — ограничение вида нагрузки).
+    :param breaker: Остановка после количества ошибок подряд и время восстановления
+                    (None — выключатель вида нагрузки).
+    :param workload: Вид нагрузки, пул которого выполняет отправку (см. executor_pool).
     """
     logger = logger or logging.getLogger(__name__)
+    workload_rate_limiter, workload_breaker = WORKLOAD_PROTECTION.get(
+        workload, (DEFAULT_RATE_LIMITER, DEFAULT_BREAKER)
+    )
+    rate_limiter = rate_limiter or workload_rate_limiter
+    breaker = breaker or workload_breaker
 
     def _do_send(chat_id: str):
         """Фактический вызов API."""
@@ -227,34 +277,48 @@ def broadcast_to_chats(
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=10),
+        before_sleep=lambda retry_state: BROADCAST_RETRIES.inc(),
         reraise=True
     )
     def _protected_send(chat_id: str):
         # rate limit
+        wait_start = time.perf_counter()
         with rate_limiter:
+            RATE_LIMITER_WAIT.observe(time.perf_counter() - wait_start)
             # circuit breaker
             return breaker.call(_do_send, chat_id)
 
     def safe_send(chat_id: str):
         try:
             _protected_send(chat_id)
+            BROADCAST_DELIVERIES.inc(result="ok")
         except CircuitBreakerError as cb_err:
+            BROADCAST_DELIVERIES.inc(result="circuit_open")
             logger.error(f"⚠️ Circuit open, skipping chat {chat_id}: {cb_err}")
         except RetryError as retry_err:
+            BROADCAST_DELIVERIES.inc(result="retry_failed")
             logger.error(f"❌ Retry failed for chat {chat_id}: {retry_err}")
         except MessageDeliveryError as delivery_err:
+            BROADCAST_DELIVERIES.inc(result="not_delivered")
             if not suppress_notification_log:
                 logger.error(delivery_err)
         except Exception as e:
+            BROADCAST_DELIVERIES.inc(result="error")
             err_message = f"❌ Unexpected error sending to {chat_id}: {e}"
             if not suppress_notification_log:
                 logger.exception(err_message)
 
-    executor = executor_pool.get_executor()
+    executor = executor_pool.get_executor(workload)
 
     futures = []
     for cid in chat_ids:
-        future = executor.submit(safe_send, cid)
+        try:
+            future = executor.submit(safe_send, cid)
+        except executor_pool.RejectedTaskError as rejected_err:
+            BROADCAST_DELIVERIES.inc(result="rejected")
+            if not suppress_notification_log:
+                logger.warning(f"⚠️ Skipping chat {cid}: {rejected_err}")
+            continue
         futures.append(future)
 
     if wait_for_completion:
@@ -4,12 +4,46 @@ from bot.handler import (
     BotButtonCommandHandler
 )
 from bot.constant import ChatType
-from . import environment, bot_extensions
+from . import environment, bot_extensions, health
+from .handler_metrics import handler_metrics, install_api_timing
+from .metrics import REGISTRY
 from app import bot_handlers
 
 # Объект бота
 app = Bot(token=environment.BOT_TOKEN, name="monitor-flow-bot")
 
+# Диспетчер событий: обработчики выполняются в пуле потоков с сохранением порядка событий чата
+dispatcher = bot_extensions.install_concurrent_dispatcher(
+    app, max_workers=environment.DISPATCH_MAX_WORKERS, max_queued=environment.DISPATCH_MAX_QUEUED
+)
+
+# Время запросов к API учитывается в метриках обработчиков
+install_api_timing(app)
+
+# Активность цикла опроса событий отражается в проверках работоспособности
+health.install_polling_heartbeat(app)
+
+# --- Метрики очереди событий
+REGISTRY.gauge("bot_dispatch_queued", "Bot events waiting in chat queues.", function=lambda: dispatcher.stats()["queued"])
+REGISTRY.gauge("bot_dispatch_running", "Bot events being handled.", function=lambda: dispatcher.stats()["running"])
+
+
+def instrument_handlers(bot: Bot):
+    """
+    Обернуть обработчики бота измерением метрик (см. app.core.handler_metrics).
+    Обработчики команд учитываются по имени команды, остальные — по имени функции.
+    Уже обёрнутые обработчики повторно не оборачиваются.
+
+    :param bot: VKTeams bot.
+    """
+    for handler in bot.dispatcher.handlers:
+        callback = getattr(handler, "callback", None)
+        if callback is None:
+            continue
+        command = getattr(handler, "command", None)
+        name = f"/{command}" if isinstance(command, str) else getattr(callback, "__name__", repr(callback))
+        handler.callback = handler_metrics.instrument(name, callback)
+
 
 def add_general_commands_to_bot(bot: Bot):
     """
@@ -49,6 +83,8 @@ def add_general_commands_to_bot(bot: Bot):
         UnknownCommandHandler(callback=bot_handlers.unprocessed_command)
     )
 
+    instrument_handlers(bot)
+
 
 def add_user_command_to_bot(bot: Bot):
     """
@@ -62,6 +98,8 @@ def add_user_command_to_bot(bot: Bot):
         command=bot_handlers.Commands.STOP.value, filters=main_filter, callback=bot_handlers.sign_out_command
     ))
 
+    instrument_handlers(bot)
+
 
 def add_admin_commands_to_bot(bot: Bot):
     """
@@ -104,6 +142,26 @@ def add_admin_commands_to_bot(bot: Bot):
         callback=bot_handlers.del_notify_subscriber_command
     ))
 
+    bot.dispatcher.add_handler(CommandHandler(
+        command=bot_handlers.Commands.NOTIFY_FILTER.value, filters=private_filter,
+        callback=bot_handlers.notify_filter_command
+    ))
+
+    bot.dispatcher.add_handler(CommandHandler(
+        command=bot_handlers.Commands.MAINTENANCE.value, filters=private_filter,
+        callback=bot_handlers.maintenance_command
+    ))
+
+    bot.dispatcher.add_handler(CommandHandler(
+        command=bot_handlers.Commands.QUIET_HOURS.value, filters=private_filter,
+        callback=bot_handlers.quiet_hours_command
+    ))
+
+    bot.dispatcher.add_handler(CommandHandler(
+        command=bot_handlers.Commands.HANDLER_STATS.value, filters=private_filter,
+        callback=bot_handlers.handler_stats_command
+    ))
+
     bot.dispatcher.add_handler(CommandHandler(
         command=bot_handlers.Commands.ADD_ADMIN.value, filters=private_filter, callback=bot_handlers.add_admin_command
     ))
@@ -115,3 +173,5 @@ def add_admin_commands_to_bot(bot: Bot):
     bot.dispatcher.add_handler(CommandHandler(
         command=bot_handlers.Commands.DEL_CHAT.value, filters=private_filter, callback=bot_handlers.del_chat_command
     ))
+
+    instrument_handlers(bot)
@@ -60,6 +60,16 @@ API_HOST = os.environ["API_HOST"]
 
 API_PORT = int(os.environ["API_PORT"])
 
+# Путь конечной точки метрик в формате Prometheus (необязательная переменная)
+METRICS_ENDPOINT = os.environ.get("METRICS_ENDPOINT", "/metrics")
+
+# --------------------------------------------------------------------------------------------------
+
+# --------------------------------------- Журнал ---------------------------------------------------
+
+# Формат файла журнала: 'text' или 'json' (необязательная переменная)
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+
 # --------------------------------------------------------------------------------------------------
 
 # --------------------------------------- Данные для работы с потоками -----------------------------
@@ -67,4 +77,10 @@ API_PORT = int(os.environ["API_PORT"])
 EXECUTOR_CPU_LIMIT = os.environ["EXECUTOR_CPU_LIMIT"]
 EXECUTOR_SCALING_FACTOR = os.environ["EXECUTOR_SCALING_FACTOR"]
 
+# Количество одновременно обрабатываемых событий бота (необязательная переменная)
+DISPATCH_MAX_WORKERS = int(os.environ.get("DISPATCH_MAX_WORKERS", "8"))
+
+# Максимальное количество событий бота в очередях чатов (необязательная переменная)
+DISPATCH_MAX_QUEUED = int(os.environ.get("DISPATCH_MAX_QUEUED", "1000"))
+
 # --------------------------------------------------------------------------------------------------
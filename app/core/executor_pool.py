@@ -1,18 +1,74 @@
-from typing import Optional
+"""
+Пулы потоков рассылок, разделённые по видам нагрузки.
+
+Каждый вид нагрузки (workload) получает собственный пул с отдельным количеством потоков,
+ограниченной очередью задач и правилом обработки задачи при переполненной очереди:
+    - 'caller_runs' — задача выполняется в вызывающем потоке (рассылка замедляет источник, но не теряется);
+    - 'abort' — задача отклоняется с исключением RejectedTaskError.
+Поэтому рассылки журнала ошибок не могут занять потоки и очередь доставки уведомлений Zabbix.
+"""
+from typing import Any, Callable, Dict, NamedTuple, Optional
 import logging
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from threading import Lock
 import atexit
+import threading
 from . import environment
+from .metrics import REGISTRY
 
 
-# --- Приватные переменные
-_executor_instance: Optional[ThreadPoolExecutor] = None
-_lock = Lock()
-
 # --- Лимит на выделение количества потоков
 HARD_CAP = 64
 
+# --- Виды нагрузки
+# Уведомления подписчиков (Zabbix, сводки подавления, дребезг)
+WORKLOAD_ALERTS = "alerts"
+# Системные сообщения администрирования (подписки, права, оповещения администраторов)
+WORKLOAD_ADMIN = "admin"
+# Рассылка ошибок журнала подписчикам SYSTEM
+WORKLOAD_LOGS = "logs"
+
+# --- Правила обработки задачи при переполненной очереди
+POLICY_CALLER_RUNS = "caller_runs"
+POLICY_ABORT = "abort"
+POLICIES = (POLICY_CALLER_RUNS, POLICY_ABORT)
+
+
+class PoolConfig(NamedTuple):
+    # Количество потоков (None — по переменным окружения, см. get_max_workers)
+    max_workers: Optional[int]
+    # Максимальное количество задач, ожидающих свободного потока
+    max_queued: int
+    # Правило обработки задачи при переполненной очереди
+    policy: str
+
+
+# --- Параметры пулов по видам нагрузки
+POOL_CONFIGS: Dict[str, PoolConfig] = {
+    WORKLOAD_ALERTS: PoolConfig(max_workers=None, max_queued=5000, policy=POLICY_CALLER_RUNS),
+    WORKLOAD_ADMIN: PoolConfig(max_workers=4, max_queued=1000, policy=POLICY_CALLER_RUNS),
+    WORKLOAD_LOGS: PoolConfig(max_workers=2, max_queued=200, policy=POLICY_ABORT),
+}
+
+# --- Метрики пулов
+TASKS_REJECTED = REGISTRY.counter(
+    "executor_tasks_rejected", "Tasks rejected because the executor queue was full.", ("pool",)
+)
+TASKS_CALLER_RUN = REGISTRY.counter(
+    "executor_tasks_caller_run", "Tasks run in the submitting thread because the executor queue was full.", ("pool",)
+)
+
+
+class RejectedTaskError(RuntimeError):
+    """
+    Задача отклонена: очередь пула заполнена.
+    """
+
+    def __init__(self, pool: str, max_queued: int):
+        super().__init__(f"❌ Executor pool '{pool}' queue is full ({max_queued} tasks), task rejected")
+        self.pool = pool
+        self.max_queued = max_queued
+
 
 def get_max_workers(default: int = 15) -> int:
     """
@@ -35,28 +91,205 @@ def get_max_workers(default: int = 15) -> int:
         return default
 
 
-def get_executor() -> ThreadPoolExecutor:
+class BoundedExecutor(ThreadPoolExecutor):
     """
-    Ленивая инициализация глобального ThreadPoolExecutor.
+    ThreadPoolExecutor с ограниченной очередью задач и правилом обработки задачи при её переполнении.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queued: int, policy: str = POLICY_CALLER_RUNS):
+        """
+        :param name: Название пула (вид нагрузки).
+        :param max_workers: Количество потоков.
+        :param max_queued: Максимальное количество задач, ожидающих свободного потока.
+        :param policy: Правило обработки задачи при переполненной очереди ('caller_runs' или 'abort').
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"❌ Unknown executor rejection policy: {policy}")
+        super().__init__(max_workers=min(max_workers, HARD_CAP), thread_name_prefix=f"pool-{name}")
+        self.name = name
+        self.max_queued = max_queued
+        self.policy = policy
+        self._queued_lock = Lock()
+        self._queued = 0
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        with self._queued_lock:
+            accepted = self._queued < self.max_queued
+            if accepted:
+                self._queued += 1
+
+        if not accepted:
+            if self.policy == POLICY_ABORT:
+                TASKS_REJECTED.inc(pool=self.name)
+                raise RejectedTaskError(self.name, self.max_queued)
+            TASKS_CALLER_RUN.inc(pool=self.name)
+            return self._run_in_caller(fn, *args, **kwargs)
+
+        def run():
+            # Задача покинула очередь
+            self._dequeue()
+            return fn(*args, **kwargs)
+
+        try:
+            future = super().submit(run)
+        except BaseException:
+            self._dequeue()
+            raise
+        # Отменённая задача не будет запущена, но тоже покидает очередь
+        future.add_done_callback(lambda done: done.cancelled() and self._dequeue())
+        return future
+
+    def _dequeue(self) -> None:
+        with self._queued_lock:
+            self._queued -= 1
 
-    :return: Глобальный объект исполнителя потока.
+    @staticmethod
+    def _run_in_caller(fn: Callable, *args, **kwargs) -> Future:
+        """
+        Выполнить задачу в вызывающем потоке и вернуть завершённый Future.
+        """
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Получить состояние пула.
+
+        :return: Словарь: queue_depth — задачи, ожидающие свободного потока, max_queued — ограничение очереди,
+                 utilization — заполненность очереди (0..1), threads — запущенные потоки,
+                 max_workers — максимальное количество потоков, policy — правило переполнения,
+                 rejected — отклонённые задачи, caller_runs — задачи, выполненные вызывающим потоком,
+                 shutdown — остановлен ли пул.
+        """
+        queued = self._queued
+        return {
+            "queue_depth": queued,
+            "max_queued": self.max_queued,
+            "utilization": round(queued / self.max_queued, 3) if self.max_queued else 0.0,
+            "threads": len(self._threads),
+            "max_workers": self._max_workers,
+            "policy": self.policy,
+            "rejected": TASKS_REJECTED.value(pool=self.name),
+            "caller_runs": TASKS_CALLER_RUN.value(pool=self.name),
+            "shutdown": self._shutdown,
+        }
+
+
+class ExecutorRegistry:
+    """
+    Реестр пулов по видам нагрузки. Пулы создаются лениво при первом обращении.
     """
-    global _executor_instance
 
-    if _executor_instance is None:
-        with _lock:
-            if _executor_instance is None:
-                max_workers = get_max_workers()
-                _executor_instance = ThreadPoolExecutor(max_workers=max_workers)
-                atexit.register(_shutdown_executor)
+    def __init__(self, configs: Dict[str, PoolConfig]):
+        """
+        :param configs: Параметры пулов {вид нагрузки: параметры}.
+        """
+        self.configs = dict(configs)
+        self._lock = Lock()
+        self._pools: Dict[str, BoundedExecutor] = {}
+
+    def get(self, workload: str) -> BoundedExecutor:
+        """
+        Получить пул вида нагрузки (создаётся при первом обращении).
 
-    return _executor_instance
+        :param workload: Вид нагрузки.
+        :return: Пул потоков.
+        :raises KeyError: Неизвестный вид нагрузки.
+        """
+        pool = self._pools.get(workload)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(workload)
+                if pool is None:
+                    if workload not in self.configs:
+                        raise KeyError(f"❌ Unknown executor workload: {workload}")
+                    config = self.configs[workload]
+                    max_workers = config.max_workers if config.max_workers is not None else get_max_workers()
+                    pool = BoundedExecutor(workload, max_workers, config.max_queued, config.policy)
+                    self._pools[workload] = pool
+        return pool
 
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Получить состояние созданных пулов.
 
+        :return: Словарь {вид нагрузки: состояние пула} (см. BoundedExecutor.stats).
+        """
+        with self._lock:
+            pools = dict(self._pools)
+        return {workload: pool.stats() for workload, pool in pools.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Остановить все пулы.
+
+        :param wait: Ожидать ли завершения задач.
+        """
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.shutdown(wait=wait)
+
+
+# --- Реестр пулов приложения
+registry = ExecutorRegistry(POOL_CONFIGS)
+
+
+def get_executor(workload: str = WORKLOAD_ALERTS) -> BoundedExecutor:
+    """
+    Ленивая инициализация пула вида нагрузки.
+
+    :param workload: Вид нагрузки (WORKLOAD_ALERTS, WORKLOAD_ADMIN, WORKLOAD_LOGS).
+    :return: Пул потоков.
+    """
+    return registry.get(workload)
+
+
+@atexit.register
 def _shutdown_executor():
     """
-    Автоматическое завершение пула при завершении приложения.
+    Автоматическое завершение пулов при завершении приложения.
+    """
+    registry.shutdown(wait=True)
+
+
+def get_stats(workload: str = WORKLOAD_ALERTS) -> Optional[Dict[str, Any]]:
     """
-    global _executor_instance
-    if _executor_instance is not None:
-        _executor_instance.shutdown(wait=True)
+    Получить состояние пула вида нагрузки.
+
+    :param workload: Вид нагрузки.
+    :return: Состояние пула (см. BoundedExecutor.stats); None, если пул ещё не создан.
+    """
+    return registry.stats().get(workload)
+
+
+def get_all_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Получить состояние всех созданных пулов.
+
+    :return: Словарь {вид нагрузки: состояние пула}.
+    """
+    return registry.stats()
+
+
+def _pool_values(key: str) -> Dict[str, Any]:
+    """
+    Значения поля состояния по пулам для метрик.
+    """
+    return {workload: stats[key] for workload, stats in registry.stats().items()}
+
+
+# --- Метрики пулов
+REGISTRY.gauge("executor_queue_depth", "Tasks waiting for a free executor thread.", ("pool",),
+               function=lambda: _pool_values("queue_depth"))
+REGISTRY.gauge("executor_queue_limit", "Maximum number of tasks waiting in the executor queue.", ("pool",),
+               function=lambda: _pool_values("max_queued"))
+REGISTRY.gauge("executor_threads", "Threads started by the executor.", ("pool",),
+               function=lambda: _pool_values("threads"))
+REGISTRY.gauge("executor_max_workers", "Maximum number of executor threads.", ("pool",),
+               function=lambda: _pool_values("max_workers"))
+REGISTRY.gauge("process_threads", "Active threads in the process.", function=threading.active_count)
@@ -0,0 +1,245 @@
+"""
+Метрики выполнения обработчиков команд бота.
+
+Для каждого обработчика (команды) учитываются количество вызовов, количество ошибок, гистограмма
+времени выполнения, а также время, потраченное на запросы к базе данных и к API VK Teams.
+Время запросов к базе данных и API учитывается только для запросов, выполненных в потоке обработчика.
+"""
+import bisect
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .metrics import REGISTRY
+
+# Границы интервалов гистограммы времени выполнения (в секундах)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Признак обёрнутой функции
+_INSTRUMENTED_ATTR = "__handler_metrics__"
+
+
+class _Measurement:
+    """
+    Измерение текущего вызова обработчика.
+    """
+    __slots__ = ("db_time", "api_time", "error")
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.api_time = 0.0
+        self.error = False
+
+
+class _HandlerStats:
+    """
+    Накопленная статистика одного обработчика.
+    """
+    __slots__ = ("count", "errors", "total", "max", "db_time", "api_time", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.db_time = 0.0
+        self.api_time = 0.0
+        # Последний интервал — превышение наибольшей границы
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def quantile(self, q: float) -> float:
+        """
+        Оценить квантиль времени выполнения по гистограмме (верхняя граница интервала).
+        """
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class HandlerMetrics:
+    """
+    Реестр метрик обработчиков.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers: Dict[str, _HandlerStats] = {}
+        self._local = threading.local()
+
+    @property
+    def current(self) -> Optional[_Measurement]:
+        """
+        Измерение обработчика, выполняемого в текущем потоке (None — поток не выполняет обработчик).
+        """
+        return getattr(self._local, "measurement", None)
+
+    def record(self, name: str, elapsed: float, db_time: float = 0.0, api_time: float = 0.0,
+               error: bool = False) -> None:
+        """
+        Учесть вызов обработчика.
+
+        :param name: Название обработчика.
+        :param elapsed: Время выполнения (в секундах).
+        :param db_time: Время запросов к базе данных (в секундах).
+        :param api_time: Время запросов к API (в секундах).
+        :param error: Завершился ли вызов ошибкой.
+        """
+        index = bisect.bisect_left(LATENCY_BUCKETS, elapsed)
+        with self._lock:
+            stats = self._handlers.get(name)
+            if stats is None:
+                stats = self._handlers[name] = _HandlerStats()
+            stats.count += 1
+            stats.errors += error
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+            stats.db_time += db_time
+            stats.api_time += api_time
+            stats.buckets[index] += 1
+
+    def instrument(self, name: str, func: Callable) -> Callable:
+        """
+        Обернуть обработчик измерением времени выполнения.
+
+        :param name: Название обработчика в метриках.
+        :param func: Обработчик.
+        :return: Обёрнутый обработчик (повторно не оборачивается).
+        """
+        if getattr(func, _INSTRUMENTED_ATTR, None) is self:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            previous = self.current
+            measurement = self._local.measurement = _Measurement()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                measurement.error = True
+                raise
+            finally:
+                self._local.measurement = previous
+                self.record(name, time.perf_counter() - start, measurement.db_time, measurement.api_time,
+                            measurement.error)
+
+        setattr(wrapper, _INSTRUMENTED_ATTR, self)
+        return wrapper
+
+    def mark_error(self) -> None:
+        """
+        Отметить ошибку текущего вызова обработчика (для ошибок, перехваченных внутри обработчика).
+        """
+        measurement = self.current
+        if measurement is not None:
+            measurement.error = True
+
+    def add_db_time(self, seconds: float) -> None:
+        """
+        Учесть время запроса к базе данных в текущем вызове обработчика.
+        """
+        measurement = self.current
+        if measurement is not None:
+            measurement.db_time += seconds
+
+    def add_api_time(self, seconds: float) -> None:
+        """
+        Учесть время запроса к API в текущем вызове обработчика.
+        """
+        measurement = self.current
+        if measurement is not None:
+            measurement.api_time += seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Получить метрики обработчиков.
+
+        :return: Словарь {название обработчика: метрики}. Время указано в миллисекундах,
+                 гистограмма — количество вызовов по верхним границам интервалов (в секундах, '+Inf' — превышение).
+        """
+        with self._lock:
+            result = {}
+            for name, stats in self._handlers.items():
+                bounds = [f"{bound:g}" for bound in LATENCY_BUCKETS] + ["+Inf"]
+                result[name] = {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "avg_ms": _ms(stats.total / stats.count) if stats.count else 0.0,
+                    "p50_ms": _ms(stats.quantile(0.5)),
+                    "p95_ms": _ms(stats.quantile(0.95)),
+                    "p99_ms": _ms(stats.quantile(0.99)),
+                    "max_ms": _ms(stats.max),
+                    "total_ms": _ms(stats.total),
+                    "db_ms": _ms(stats.db_time),
+                    "api_ms": _ms(stats.api_time),
+                    "histogram": dict(zip(bounds, stats.buckets)),
+                }
+            return result
+
+    def reset(self) -> None:
+        """
+        Сбросить накопленные метрики.
+        """
+        with self._lock:
+            self._handlers.clear()
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+# Метрики обработчиков бота
+handler_metrics = HandlerMetrics()
+
+
+# -------------------- Время запросов --------------------
+
+# Время выполнения запросов к базе данных (всех, не только из обработчиков)
+DB_QUERY_DURATION = REGISTRY.histogram(
+    "db_query_duration_seconds", "Database query execution time.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+
+def _query_finished(conn) -> None:
+    starts: List[float] = conn.info.get("query_start") if conn is not None else None
+    if starts:
+        elapsed = time.perf_counter() - starts.pop()
+        DB_QUERY_DURATION.observe(elapsed)
+        handler_metrics.add_db_time(elapsed)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _query_finished(conn)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    _query_finished(context.connection)
+
+
+def install_api_timing(bot) -> None:
+    """
+    Учитывать время запросов бота к API в метриках обработчиков.
+
+    :param bot: VKTeams bot.
+    """
+    hooks = bot.http_session.hooks["response"]
+    if _api_response_hook not in hooks:
+        hooks.append(_api_response_hook)
+
+
+def _api_response_hook(response, *args, **kwargs):
+    handler_metrics.add_api_time(response.elapsed.total_seconds())
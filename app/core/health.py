@@ -0,0 +1,271 @@
+"""
+Проверки работоспособности (liveness) и готовности (readiness) приложения.
+
+Проверки выполняются фоновым потоком HealthMonitor раз в HEALTH_CHECK_INTERVAL секунд, результаты
+сохраняются в снимок. Конечные точки /healthz и /readyz только читают снимок, поэтому их вызов ничего
+не стоит под нагрузкой. Каждая проверка возвращает словарь с признаками 'alive' (компонент работает,
+иначе приложение нужно перезапустить) и 'ok' (компонент готов обрабатывать события) и подробностями.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+# Интервал выполнения проверок (в секундах)
+HEALTH_CHECK_INTERVAL = 5.0
+
+# Запас к длительности long-poll запроса событий бота, после которого цикл опроса считается зависшим (в секундах)
+POLLING_GRACE_PERIOD = 30.0
+
+# Наибольшее количество задач в очереди пула на один поток, при котором приложение готово
+MAX_EXECUTOR_SATURATION = 10.0
+
+# Наибольшее время ожидания события бота в очереди (в секундах), при котором приложение готово
+MAX_DISPATCH_LAG = 60.0
+
+# Наибольшее время проверочного запроса к базе данных (в секундах), при котором приложение готово
+MAX_DB_LATENCY = 1.0
+
+Probe = Callable[[], Dict[str, Any]]
+
+
+class Heartbeat:
+    """
+    Отметки активности цикла: последняя попытка и последнее успешное выполнение.
+    """
+
+    def __init__(self):
+        self.last_beat: Optional[float] = None
+        self.last_success: Optional[float] = None
+
+    def beat(self, success: bool = False) -> None:
+        """
+        Отметить активность.
+
+        :param success: Завершилась ли итерация успешно.
+        """
+        now = time.monotonic()
+        self.last_beat = now
+        if success:
+            self.last_success = now
+
+    @staticmethod
+    def _age(moment: Optional[float]) -> Optional[float]:
+        return round(time.monotonic() - moment, 3) if moment is not None else None
+
+    def age(self) -> Optional[float]:
+        """
+        Время с последней отметки (в секундах; None — отметок не было).
+        """
+        return self._age(self.last_beat)
+
+    def success_age(self) -> Optional[float]:
+        """
+        Время с последней успешной итерации (в секундах; None — успешных итераций не было).
+        """
+        return self._age(self.last_success)
+
+
+# Отметки активности цикла опроса событий бота
+polling_heartbeat = Heartbeat()
+
+
+def install_polling_heartbeat(bot, heartbeat: Heartbeat = polling_heartbeat) -> None:
+    """
+    Отмечать активность цикла опроса событий бота: до и после каждого запроса событий.
+
+    :param bot: VKTeams bot.
+    :param heartbeat: Отметки активности.
+    """
+    events_get = bot.events_get
+    if getattr(events_get, "heartbeat", None) is heartbeat:
+        return
+
+    def events_get_with_heartbeat(*args, **kwargs):
+        heartbeat.beat()
+        response = events_get(*args, **kwargs)
+        heartbeat.beat(success=bool(response is not None and response.ok))
+        return response
+
+    events_get_with_heartbeat.heartbeat = heartbeat
+    bot.events_get = events_get_with_heartbeat
+
+
+# -------------------- Проверки --------------------
+
+
+def polling_probe(bot, heartbeat: Heartbeat = polling_heartbeat) -> Probe:
+    """
+    Проверка цикла опроса событий бота: цикл жив, если запрос событий выполнялся не позднее
+    длительности long-poll запроса с запасом; готов, если такой запрос завершился успешно.
+
+    :param bot: VKTeams bot.
+    :param heartbeat: Отметки активности цикла.
+    """
+    def probe() -> Dict[str, Any]:
+        max_age = bot.poll_time_s + bot.timeout_s + POLLING_GRACE_PERIOD
+        age, success_age = heartbeat.age(), heartbeat.success_age()
+        alive = bool(bot.running) and age is not None and age <= max_age
+        return {
+            "alive": alive,
+            "ok": alive and success_age is not None and success_age <= max_age,
+            "heartbeat_age_s": age,
+            "last_success_age_s": success_age,
+        }
+    return probe
+
+
+def executor_probe(get_stats: Callable[[], Optional[Dict[str, Any]]]) -> Probe:
+    """
+    Проверка пула рассылок: пул жив, если не остановлен; готов, если задач в очереди на один поток
+    не больше MAX_EXECUTOR_SATURATION.
+
+    :param get_stats: Функция состояния пула (см. executor_pool.get_stats).
+    """
+    def probe() -> Dict[str, Any]:
+        stats = get_stats()
+        if stats is None:
+            # Пул создаётся при первой рассылке
+            return {"alive": True, "ok": True, "saturation": 0.0}
+        saturation = round(stats["queue_depth"] / max(stats["max_workers"], 1), 3)
+        return {
+            "alive": not stats["shutdown"],
+            "ok": not stats["shutdown"] and saturation <= MAX_EXECUTOR_SATURATION,
+            "saturation": saturation,
+            "queue_depth": stats["queue_depth"],
+            "threads": stats["threads"],
+        }
+    return probe
+
+
+def dispatcher_probe(dispatcher) -> Probe:
+    """
+    Проверка очереди событий бота: жива, если пул обработки не остановлен; готова, если самое
+    старое событие ожидает обработки не дольше MAX_DISPATCH_LAG.
+
+    :param dispatcher: ConcurrentDispatcher бота.
+    """
+    def probe() -> Dict[str, Any]:
+        stats = dispatcher.stats()
+        return {
+            "alive": not stats["shutdown"],
+            "ok": not stats["shutdown"] and stats["oldest_wait_s"] <= MAX_DISPATCH_LAG,
+            "lag_s": stats["oldest_wait_s"],
+            "queued": stats["queued"],
+            "running": stats["running"],
+        }
+    return probe
+
+
+def database_probe(engine: Engine) -> Probe:
+    """
+    Проверка базы данных: готова, если проверочный запрос выполняется не дольше MAX_DB_LATENCY.
+
+    :param engine: Подключение к базе данных.
+    """
+    def probe() -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except Exception as e:
+            return {"alive": True, "ok": False, "error": str(e)}
+        latency = time.perf_counter() - start
+        return {"alive": True, "ok": latency <= MAX_DB_LATENCY, "latency_ms": round(latency * 1000, 3)}
+    return probe
+
+
+def breaker_probe(breaker) -> Probe:
+    """
+    Проверка автоматического выключателя рассылок: готов, если выключатель не разомкнут.
+
+    :param breaker: pybreaker.CircuitBreaker.
+    """
+    def probe() -> Dict[str, Any]:
+        state = breaker.current_state
+        return {"alive": True, "ok": state != "open", "state": state}
+    return probe
+
+
+# -------------------- Монитор --------------------
+
+
+class HealthMonitor:
+    """
+    Периодическое выполнение проверок и хранение снимка их результатов.
+    """
+
+    def __init__(self, probes: Dict[str, Probe], interval: float = HEALTH_CHECK_INTERVAL):
+        """
+        :param probes: Проверки {название: функция проверки}.
+        :param interval: Интервал выполнения проверок (в секундах).
+        """
+        self.probes = probes
+        self.interval = interval
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._checked_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> Dict[str, Any]:
+        """
+        Выполнить все проверки и сохранить снимок.
+
+        :return: Результаты проверок {название: результат}.
+        """
+        checks = {}
+        for name, probe in self.probes.items():
+            try:
+                checks[name] = probe()
+            except Exception as e:
+                checks[name] = {"alive": False, "ok": False, "error": str(e)}
+        # Снимок заменяется целиком, поэтому читатели видят согласованные результаты
+        self._snapshot = checks
+        self._checked_at = time.monotonic()
+        return checks
+
+    def start(self) -> None:
+        """
+        Запустить фоновое выполнение проверок (повторный запуск ничего не делает).
+        """
+        if self._thread is not None:
+            return
+
+        logger = logging.getLogger(__name__)
+
+        def run():
+            while True:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"❌ Health check failed: {e}")
+                if self._stop.wait(self.interval):
+                    return
+
+        self._thread = threading.Thread(target=run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Остановить фоновое выполнение проверок.
+        """
+        self._stop.set()
+
+    def status(self, readiness: bool) -> Dict[str, Any]:
+        """
+        Получить состояние по последнему снимку (без выполнения проверок).
+
+        :param readiness: True — проверка готовности ('ok'), False — работоспособности ('alive').
+        :return: Словарь: healthy — результат, snapshot_age_s — возраст снимка, checks — результаты проверок.
+                 Снимок, устаревший больше чем на три интервала, считается неработоспособным.
+        """
+        snapshot, checked_at = self._snapshot, self._checked_at
+        if snapshot is None:
+            return {"healthy": False, "snapshot_age_s": None, "checks": {}}
+
+        age = round(time.monotonic() - checked_at, 3)
+        key = "ok" if readiness else "alive"
+        healthy = age <= 3 * self.interval and all(check.get(key, False) for check in snapshot.values())
+        return {"healthy": healthy, "snapshot_age_s": age, "checks": snapshot}
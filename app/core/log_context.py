@@ -0,0 +1,69 @@
+"""
+Контекст обработки события для записей журнала: ID чата, команда, ID события и время с начала обработки.
+
+Контекст хранится для текущего потока и добавляется к записям фильтром ContextFilter в момент
+логирования (до постановки записи в очередь журнала, которая обрабатывается другим потоком).
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+# Поля контекста, добавляемые к записям журнала
+CONTEXT_FIELDS = ("chat_id", "command", "event_id")
+
+_local = threading.local()
+
+
+def current() -> Optional[Dict[str, Any]]:
+    """
+    Получить контекст текущего потока (None — поток не обрабатывает событие).
+    """
+    return getattr(_local, "context", None)
+
+
+@contextmanager
+def bind(**fields: Any):
+    """
+    Задать контекст обработки события для текущего потока на время блока with.
+
+    :param fields: Поля контекста (chat_id, command, event_id).
+    """
+    previous = current()
+    context = dict(previous or {})
+    context.update({key: value for key, value in fields.items() if value is not None})
+    context["started_at"] = time.perf_counter()
+    _local.context = context
+    try:
+        yield context
+    finally:
+        _local.context = previous
+
+
+def command_of(text: Any) -> Optional[str]:
+    """
+    Получить команду из текста сообщения ('/status ...' -> '/status').
+
+    :param text: Текст сообщения.
+    :return: Команда или None, если текст не является командой.
+    """
+    if not isinstance(text, str) or not text.startswith("/"):
+        return None
+    return text.split(maxsplit=1)[0] if text.strip() else None
+
+
+class ContextFilter(logging.Filter):
+    """
+    Фильтр, добавляющий к записи поля контекста и latency_ms — время с начала обработки события.
+    Записи не отбрасываются.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = current()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field) if context else None)
+        if not hasattr(record, "latency_ms"):
+            record.latency_ms = round((time.perf_counter() - context["started_at"]) * 1000, 3) if context else None
+        return True
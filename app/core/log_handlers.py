@@ -0,0 +1,165 @@
+"""
+Форматы и файловые обработчики журнала: структурированный JSON-формат и ротация файла
+по размеру и времени со сжатием ротированных частей в фоне.
+"""
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+from .log_context import CONTEXT_FIELDS
+
+# Формат времени в названиях ротированных файлов
+ROTATED_SUFFIX_FORMAT = "%Y-%m-%d_%H-%M-%S"
+
+# Периоды ротации по времени
+ROTATE_WHEN = ("midnight", "hourly")
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Форматирование записи журнала в одну строку JSON с полями контекста обработки события.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for field in CONTEXT_FIELDS + ("latency_ms",):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info and record.exc_info[0] is not None:
+            entry["exc_type"] = record.exc_info[0].__name__
+            entry["exc"] = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """
+    Файловый обработчик с ротацией по размеру и времени.
+    Ротированный файл переименовывается в '<файл>.<время ротации>' и сжимается gzip в фоновом потоке,
+    хранится не больше backup_count сжатых файлов.
+    """
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int, when: Optional[str] = "midnight",
+                 compress: bool = True, encoding: str = "utf-8"):
+        """
+        :param filename: Путь к файлу журнала.
+        :param max_bytes: Размер файла, после которого выполняется ротация (0 — без ротации по размеру).
+        :param backup_count: Количество хранимых ротированных файлов.
+        :param when: Ротация по времени: 'midnight' — в полночь, 'hourly' — каждый час, None — без ротации по времени.
+        :param compress: Сжимать ли ротированные файлы.
+        :param encoding: Кодировка файла.
+        """
+        if when is not None and when not in ROTATE_WHEN:
+            raise ValueError(f"❌ Unknown log rotation period: {when}")
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding)
+        self.when = when
+        self.compress = compress
+        # Время и номер последней ротации: номер файлов одной секунды только растёт, поэтому имя
+        # файла, уже удалённого как превышающего backup_count, не используется повторно
+        self._last_rotation = ("", 0)
+        self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compress")
+        self.rollover_at = self._next_rollover(datetime.now())
+
+        # Сжимаем файлы, ротированные, но не сжатые до предыдущего завершения приложения
+        if compress:
+            for path in self._rotated_files():
+                if not path.endswith(".gz"):
+                    self._compressor.submit(self._compress, path)
+
+    def _next_rollover(self, now: datetime) -> Optional[datetime]:
+        if self.when == "midnight":
+            return datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        if self.when == "hourly":
+            return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        return None
+
+    def _rotated_files(self):
+        """
+        Получить ротированные файлы (сжатые и нет) по возрастанию времени ротации.
+        """
+        directory, base = os.path.split(self.baseFilename)
+        pattern = re.compile(re.escape(base) + r"\.(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})(?:\.(\d+))?(?:\.gz)?$")
+        rotated = []
+        for name in os.listdir(directory or "."):
+            match = pattern.match(name)
+            if match:
+                # Файлы, ротированные в одну секунду, упорядочиваются по номеру
+                rotated.append(((match.group(1), int(match.group(2) or 0)), name))
+        return [os.path.join(directory, name) for _, name in sorted(rotated)]
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.rollover_at is not None and datetime.now() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        now = datetime.now()
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            suffix = now.strftime(ROTATED_SUFFIX_FORMAT)
+            last_suffix, last_index = self._last_rotation
+            index = last_index + 1 if suffix == last_suffix else 0
+            rotated = f"{self.baseFilename}.{suffix}" + (f".{index}" if index else "")
+            while os.path.exists(rotated) or os.path.exists(rotated + ".gz"):
+                index += 1
+                rotated = f"{self.baseFilename}.{suffix}.{index}"
+            self._last_rotation = (suffix, index)
+            os.replace(self.baseFilename, rotated)
+            if self.compress:
+                self._compressor.submit(self._compress, rotated)
+            else:
+                self._remove_old_files()
+
+        self.rollover_at = self._next_rollover(now)
+        if not self.delay:
+            self.stream = self._open()
+
+    def _compress(self, path: str) -> None:
+        """
+        Сжать ротированный файл (выполняется в фоновом потоке).
+        """
+        if not os.path.exists(path):
+            # Файл уже удалён как превышающий backup_count
+            return
+        try:
+            with open(path, "rb") as source, gzip.open(path + ".gz.tmp", "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.replace(path + ".gz.tmp", path + ".gz")
+            os.remove(path)
+        except OSError:
+            logging.getLogger(__name__).exception(f"❌ Failed to compress log file {path}")
+        self._remove_old_files()
+
+    def _remove_old_files(self) -> None:
+        """
+        Удалить ротированные файлы сверх backup_count.
+        """
+        files = self._rotated_files()
+        for path in files[:max(len(files) - self.backupCount, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        super().close()
+        # Дожидаемся сжатия уже ротированных файлов
+        self._compressor.shutdown(wait=True)
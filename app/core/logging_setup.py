@@ -1,27 +1,144 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Optional
 import sys
 from bot.bot import Bot
-from . import environment
+from . import environment, executor_pool, bot_extensions
+from .metrics import REGISTRY
+from .log_context import ContextFilter
+from .log_handlers import CompressingRotatingFileHandler, JsonFormatter
 from app.bot_handlers import notifications, constants
+from app.utils import error_digest
 
 
 # --- Основной конфиг
 LOG_DIRECTORY = Path(environment.LOG_DIRECTORY)
 LOG_FILENAME = "app.log"
-MAX_LOG_SIZE = 2 * 1024 * 1024
-BACKUP_COUNT = 5
+# Ротация файла журнала: по размеру и по времени ('midnight', 'hourly' или None), ротированные файлы сжимаются gzip
+MAX_LOG_SIZE = 20 * 1024 * 1024
+BACKUP_COUNT = 30
+ROTATE_WHEN = "midnight"
+COMPRESS_ROTATED = True
+# Формат файла журнала: 'text' или 'json' (структурированный, с полями контекста обработки события)
+LOG_FORMAT = environment.LOG_FORMAT
+
+# --- Очередь записей журнала
+# Максимальное количество записей в очереди
+LOG_QUEUE_SIZE = 10000
+# Поведение при переполненной очереди: 'drop' — отбросить запись, 'block' — ждать место не дольше LOG_BLOCK_TIMEOUT
+LOG_QUEUE_POLICY = "drop"
+LOG_BLOCK_TIMEOUT = 1.0
+
+# --- Рассылка ошибок подписчикам системных уведомлений
+# Интервал проверки закончившихся окон сводок повторяющихся ошибок (в секундах)
+DIGEST_FLUSH_INTERVAL = 30.0
+
+# Записи журнала, разосланные подписчикам системных уведомлений
+LOG_BROADCASTS = REGISTRY.counter("log_broadcasts", "Log records broadcast to system notification subscribers.",
+                                  ("level",))
+LOG_DIGESTS = REGISTRY.counter("log_digests", "Digests of repeated log errors broadcast to subscribers.")
+LOG_REPEATS_SUPPRESSED = REGISTRY.counter(
+    "log_repeats_suppressed", "Repeated log records aggregated into digests instead of being broadcast."
+)
+LOG_RECORDS_DROPPED = REGISTRY.counter("log_records_dropped", "Log records dropped because the log queue was full.",
+                                       ("level",))
+
+# Очередь журнала текущей конфигурации: обработчик записи в очередь и поток обработки записей
+_queue_handler: Optional["BoundedQueueHandler"] = None
+_queue_listener: Optional["LogQueueListener"] = None
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler с ограниченной очередью: при переполнении запись отбрасывается
+    (или, при политике 'block', ожидается место в очереди не дольше block_timeout).
+    """
+
+    def __init__(self, queue_: queue.Queue, policy: str = LOG_QUEUE_POLICY, block_timeout: float = LOG_BLOCK_TIMEOUT):
+        """
+        :param queue_: Ограниченная очередь записей.
+        :param policy: Поведение при переполнении очереди ('drop' или 'block').
+        :param block_timeout: Наибольшее время ожидания места в очереди при политике 'block' (в секундах).
+        """
+        if policy not in ("drop", "block"):
+            raise ValueError(f"❌ Unknown log queue policy: {policy}")
+        super().__init__(queue_)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Подготовить запись к постановке в очередь: аргументы подставляются в сообщение сразу,
+        информация об исключении сохраняется (очередь в пределах процесса, сериализация не нужна).
+        """
+        # Шаблон сообщения нужен для группировки повторяющихся ошибок
+        record.msg_template = record.msg
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc(level=record.levelname)
+
+
+class LogQueueListener(QueueListener):
+    """
+    QueueListener, дожидающийся места в ограниченной очереди при остановке.
+    """
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
 
 
 class BotChatLoggingHandler(logging.Handler):
     """
     Logging-Handler, делающий рассылку подписчикам уведомлений.
+    Повторы ошибки (по логгеру, шаблону сообщения и типу исключения) в течение окна не рассылаются,
+    а отправляются периодической сводкой (см. app.utils.error_digest).
     """
-    def __init__(self, bot: Bot, level=logging.ERROR):
+    def __init__(self, bot: Bot, level=logging.ERROR, digest: Optional[error_digest.ErrorDigest] = None,
+                 flush_interval: float = DIGEST_FLUSH_INTERVAL):
+        """
+        :param bot: VKTeams bot.
+        :param level: Минимальный уровень рассылаемых записей.
+        :param digest: Группировка повторяющихся ошибок (по умолчанию с параметрами error_digest).
+        :param flush_interval: Интервал отправки сводок (в секундах).
+        """
         super().__init__(level)
         self.bot = bot
+        self.digest = digest or error_digest.ErrorDigest()
+        self.flush_interval = flush_interval
         self._internal_logger = logging.getLogger(__name__)
+        self._stop = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def fingerprint(record: logging.LogRecord) -> str:
+        """
+        Получить отпечаток записи: логгер, шаблон сообщения и тип исключения.
+        """
+        exc_type = record.exc_info[0].__name__ if record.exc_info and record.exc_info[0] else None
+        template = getattr(record, "msg_template", record.msg)
+        return error_digest.fingerprint(record.name, template, exc_type)
+
+    def _broadcast(self, msg: str) -> None:
+        notifications.send_notification_to_subscribers(
+            self.bot, constants.NotificationTypes.SYSTEM, msg, logger=self._internal_logger, cache_subscribers=True,
+            workload=executor_pool.WORKLOAD_LOGS,
+            rate_limiter=bot_extensions.LOGS_RATE_LIMITER, breaker=bot_extensions.LOGS_BREAKER
+        )
 
     def emit(self, record: logging.LogRecord):
         try:
@@ -29,21 +146,64 @@ class BotChatLoggingHandler(logging.Handler):
             if record.name == __name__:
                 return
 
+            self._start_flush_thread()
             msg = self.format(record)
-            notifications.send_notification_to_subscribers(
-                self.bot, constants.NotificationTypes.SYSTEM, msg, logger=self._internal_logger
-            )
+            if not self.digest.observe(self.fingerprint(record), msg):
+                LOG_REPEATS_SUPPRESSED.inc()
+                return
+
+            LOG_BROADCASTS.inc(level=record.levelname)
+            self._broadcast(msg)
 
         except Exception as e:
             self._internal_logger.exception(f"Error sending logs to subscribers: {str(e)}")
 
+    def flush_digests(self) -> None:
+        """
+        Разослать сводки повторяющихся ошибок, окно которых закончилось.
+        """
+        for digest in self.digest.due():
+            try:
+                LOG_DIGESTS.inc()
+                self._broadcast(error_digest.format_digest(digest))
+            except Exception as e:
+                self._internal_logger.exception(f"Error sending log digest to subscribers: {str(e)}")
+
+    def _start_flush_thread(self) -> None:
+        """
+        Запустить фоновую отправку сводок (при первой рассылаемой записи).
+        """
+        if self._flush_thread is not None:
+            return
+
+        def run():
+            while not self._stop.wait(self.flush_interval):
+                self.flush_digests()
+
+        self._flush_thread = threading.Thread(target=run, name="log-digests", daemon=True)
+        self._flush_thread.start()
+
+    def close(self):
+        self._stop.set()
+        super().close()
 
-def enable_logging(level: str = "INFO"):
+
+def enable_logging(level: str = "INFO", log_format: str = LOG_FORMAT, max_bytes: int = MAX_LOG_SIZE,
+                   backup_count: int = BACKUP_COUNT, rotate_when: Optional[str] = ROTATE_WHEN,
+                   compress: bool = COMPRESS_ROTATED):
     """
     Включает централизованное логирование для всего проекта.
 
     :param level: Уровень логирования (DEBUG, INFO, WARNING, ERROR, CRITICAL).
+    :param log_format: Формат файла журнала: 'text' или 'json'.
+    :param max_bytes: Размер файла журнала, после которого выполняется ротация.
+    :param backup_count: Количество хранимых ротированных файлов.
+    :param rotate_when: Ротация по времени: 'midnight', 'hourly' или None.
+    :param compress: Сжимать ли ротированные файлы gzip.
     """
+    if log_format not in ("text", "json"):
+        raise ValueError(f"❌ Unknown log format: {log_format}")
+
     log_level = getattr(logging, level.upper(), logging.INFO)
 
     LOG_DIRECTORY.mkdir(parents=True, exist_ok=True)
@@ -60,14 +220,33 @@ def enable_logging(level: str = "INFO"):
     console_handler.setFormatter(formatter)
 
     # --- Файловый хендлер с ротацией
-    file_handler = RotatingFileHandler(
-        filename=log_path,
-        maxBytes=MAX_LOG_SIZE,
-        backupCount=BACKUP_COUNT,
+    file_handler = CompressingRotatingFileHandler(
+        filename=str(log_path),
+        max_bytes=max_bytes,
+        backup_count=backup_count,
+        when=rotate_when,
+        compress=compress,
         encoding='utf-8'
     )
     file_handler.setLevel(log_level)
-    file_handler.setFormatter(formatter)
+    file_handler.setFormatter(JsonFormatter() if log_format == "json" else formatter)
+
+    from app.core.bot_setup import app
+    notify_handler = BotChatLoggingHandler(app, level=logging.ERROR)
+    notify_handler.setFormatter(formatter)
+
+    # --- Обработчики выполняются отдельным потоком, логгеры только ставят записи в очередь
+    global _queue_handler, _queue_listener
+    _stop_queue_listener()
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _queue_handler = BoundedQueueHandler(log_queue)
+    # Контекст обработки события добавляется в потоке, создавшем запись
+    _queue_handler.addFilter(ContextFilter())
+    _queue_listener = LogQueueListener(
+        log_queue, console_handler, file_handler, notify_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
 
     # --- Настройка root-логгера
     root_logger = logging.getLogger()
@@ -76,13 +255,7 @@ def enable_logging(level: str = "INFO"):
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
 
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
-
-    from app.core.bot_setup import app
-    notify_handler = BotChatLoggingHandler(app, level=logging.ERROR)
-    notify_handler.setFormatter(formatter)
-    root_logger.addHandler(notify_handler)
+    root_logger.addHandler(_queue_handler)
 
     # Подавляем лишний шум
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
@@ -92,6 +265,37 @@ def enable_logging(level: str = "INFO"):
     sys.excepthook = _handle_exception
 
 
+def get_log_queue_stats() -> dict:
+    """
+    Получить состояние очереди журнала.
+
+    :return: Словарь: queued — записи в очереди, capacity — размер очереди, dropped — отброшенные записи.
+    """
+    if _queue_handler is None:
+        return {"queued": 0, "capacity": LOG_QUEUE_SIZE, "dropped": 0}
+    return {
+        "queued": _queue_handler.queue.qsize(),
+        "capacity": _queue_handler.queue.maxsize,
+        "dropped": _queue_handler.dropped,
+    }
+
+
+REGISTRY.gauge("log_queue_depth", "Log records waiting in the log queue.",
+               function=lambda: get_log_queue_stats()["queued"])
+
+
+@atexit.register
+def _stop_queue_listener():
+    """
+    Остановить поток обработки записей журнала, дописав записи из очереди (при завершении приложения
+    или смене конфигурации).
+    """
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
 def _handle_exception(exc_type, exc_value, exc_traceback):
     """
     Глобальный перехватчик исключений для логирования ошибок, не пойманных вручную.
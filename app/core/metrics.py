@@ -0,0 +1,296 @@
+"""
+Метрики приложения в текстовом формате Prometheus.
+
+Счётчики и гистограммы не используют блокировок при обновлении: каждый поток пишет в собственную
+часть (shard) значений, а при сборе метрик части суммируются. Блокировка берётся только при первом
+обращении потока к метрике. Значения измерителей (Gauge) задаются присваиванием или вычисляются
+функцией в момент сбора, поэтому обновление не стоит ничего.
+"""
+import math
+import threading
+import bisect
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Границы интервалов гистограмм по умолчанию (в секундах)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Тип содержимого ответа с метриками
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric:
+    """
+    Базовый класс метрики.
+    """
+    type_name = ""
+    # Суффикс названия семейства значений (для счётчиков — '_total')
+    family_suffix = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        :param name: Название метрики.
+        :param documentation: Описание метрики.
+        :param labelnames: Названия меток.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"❌ Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, LabelValues, float, Tuple[str, ...], Tuple[str, ...]]]:
+        """
+        Получить значения метрики: (суффикс, значения меток, значение, доп. метки, значения доп. меток).
+        """
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """
+        Сформировать строки метрики в текстовом формате Prometheus.
+        """
+        family = self.name + self.family_suffix
+        lines = [f"# HELP {family} {_escape(self.documentation)}", f"# TYPE {family} {self.type_name}"]
+        for suffix, values, value, extra_names, extra_values in self.samples():
+            labels = _format_labels(self.labelnames + extra_names, values + extra_values)
+            lines.append(f"{family}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class _Sharded(_Metric):
+    """
+    Метрика, значения которой хранятся по частям для каждого потока.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Dict[LabelValues, object]] = []
+
+    def _shard(self) -> Dict[LabelValues, object]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _collect(self) -> List[Dict[LabelValues, object]]:
+        with self._lock:
+            shards = list(self._shards)
+        # Копирование словаря атомарно, поэтому поток-владелец может продолжать запись
+        return [shard.copy() for shard in shards]
+
+
+class Counter(_Sharded):
+    """
+    Монотонно возрастающий счётчик.
+    """
+    type_name = "counter"
+    family_suffix = "_total"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """
+        Увеличить счётчик.
+
+        :param amount: Величина увеличения (неотрицательная).
+        :param labels: Значения меток.
+        """
+        key = self._key(labels) if labels or self.labelnames else ()
+        shard = self._shard()
+        shard[key] = shard.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """
+        Получить значение счётчика.
+        """
+        key = self._key(labels) if labels or self.labelnames else ()
+        return sum(shard.get(key, 0) for shard in self._collect())
+
+    def samples(self):
+        totals: Dict[LabelValues, float] = {}
+        for shard in self._collect():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0) + value
+        for key in sorted(totals):
+            yield "", key, totals[key], (), ()
+
+
+class Histogram(_Sharded):
+    """
+    Гистограмма с фиксированными границами интервалов.
+    """
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        :param name: Название метрики.
+        :param documentation: Описание метрики.
+        :param labelnames: Названия меток.
+        :param buckets: Возрастающие верхние границы интервалов.
+        """
+        super().__init__(name, documentation, labelnames)
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("❌ Histogram buckets must be a non-empty increasing sequence")
+        self.buckets = tuple(float(bound) for bound in buckets)
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Учесть наблюдение.
+
+        :param value: Значение.
+        :param labels: Значения меток.
+        """
+        key = self._key(labels) if labels or self.labelnames else ()
+        shard = self._shard()
+        # [количество по интервалам..., превышение, сумма]
+        counts = shard.get(key)
+        if counts is None:
+            counts = shard[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def samples(self):
+        totals: Dict[LabelValues, List[float]] = {}
+        for shard in self._collect():
+            for key, counts in shard.items():
+                counts = list(counts)
+                total = totals.get(key)
+                if total is None:
+                    totals[key] = counts
+                else:
+                    totals[key] = [a + b for a, b in zip(total, counts)]
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for key in sorted(totals):
+            counts = totals[key]
+            cumulative = 0
+            for bound, count in zip(bounds, counts[:-1]):
+                cumulative += count
+                yield "_bucket", key, cumulative, ("le",), (bound,)
+            yield "_sum", key, counts[-1], (), ()
+            yield "_count", key, cumulative, (), ()
+
+
+class Gauge(_Metric):
+    """
+    Измеритель: значение задаётся присваиванием или вычисляется функцией при сборе метрик.
+    """
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 function: Optional[Callable[[], object]] = None):
+        """
+        :param name: Название метрики.
+        :param documentation: Описание метрики.
+        :param labelnames: Названия меток.
+        :param function: Функция, возвращающая значение (без меток) или словарь {значения меток: значение}.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """
+        Задать значение.
+
+        :param value: Значение.
+        :param labels: Значения меток.
+        """
+        self._values[self._key(labels) if labels or self.labelnames else ()] = value
+
+    def samples(self):
+        values = dict(self._values)
+        if self.function is not None:
+            result = self.function()
+            if isinstance(result, dict):
+                values.update({key if isinstance(key, tuple) else (key,): value for key, value in result.items()})
+            elif result is not None:
+                values[()] = result
+        for key in sorted(values):
+            yield "", key, float(values[key]), (), ()
+
+
+class Registry:
+    """
+    Реестр метрик.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """
+        Зарегистрировать метрику.
+
+        :param metric: Метрика.
+        :return: Метрика.
+        :raises ValueError: Метрика с таким названием уже зарегистрирована.
+        """
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"❌ Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """
+        Получить метрику по названию.
+        """
+        return self._metrics.get(name)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              function: Optional[Callable[[], object]] = None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, function))
+
+    def render(self) -> str:
+        """
+        Сформировать все метрики в текстовом формате Prometheus.
+
+        :return: Текст метрик.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                # Ошибка вычисления одной метрики не должна ломать выдачу остальных
+                lines.append(f"# ERROR {metric.name} {_escape(str(e))}")
+        return "\n".join(lines) + "\n"
+
+
+# Реестр метрик приложения
+REGISTRY = Registry()
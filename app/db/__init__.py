@@ -1,3 +1,8 @@
 from .base import *
 from .models import *
+from . import registry
+from . import row_counts
+from . import fulltext
+from . import filter_index
+from . import suppression
 from . import crud
@@ -2,6 +2,7 @@ from typing import Type, TypeVar, List
 from sqlalchemy.orm import Session, declarative_base
 from contextlib import contextmanager
 from .database import SessionLocal
+from . import registry
 from sqlalchemy.ext.declarative import DeclarativeMeta
 
 # Добавление моделей в базу данных
@@ -11,6 +12,9 @@ Base = models.Base
 # Базовый тип ORM моделей
 T = TypeVar("T", bound=declarative_base())
 
+# Ключ флага режима единицы работы в Session.info
+UNIT_OF_WORK_KEY = "unit_of_work"
+
 
 def enable_foreign_keys(session: Session):
     """
@@ -22,23 +26,66 @@ def enable_foreign_keys(session: Session):
 
 
 @contextmanager
-def get_db_session(enable_foreign_key: bool = True):
+def get_db_session(enable_foreign_key: bool = True, unit_of_work: bool = True):
     """
     Получить сессию работы с базой данных.
 
+    В режиме единицы работы CRUD-функции только сбрасывают изменения в базу (flush),
+    а фиксация выполняется один раз при успешном выходе из контекста.
+    При исключении транзакция откатывается.
+
     :param enable_foreign_key: Включить ли проверку внешних ключей.
+    :param unit_of_work: Фиксировать ли все изменения одной транзакцией при выходе из контекста.
     :return: Экземпляр сессии SQLAlchemy.
     """
-    db = SessionLocal()
+    # Сессия закрывается сразу после фиксации, поэтому объекты не требуется помечать устаревшими
+    db = SessionLocal(expire_on_commit=not unit_of_work)
+    db.info[UNIT_OF_WORK_KEY] = unit_of_work
     try:
         if enable_foreign_key:
             enable_foreign_keys(db)
 
         yield db
+
+        if unit_of_work:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
 
+def is_unit_of_work(session: Session) -> bool:
+    """
+    Проверить, работает ли сессия в режиме единицы работы.
+
+    :param session: Текущая сессия.
+    :return: True, если фиксацию изменений выполняет владелец сессии.
+    """
+    return bool(session.info.get(UNIT_OF_WORK_KEY, False))
+
+
+def save_changes(session: Session, *instances) -> None:
+    """
+    Сохранить изменения, внесённые CRUD-функцией.
+
+    В режиме единицы работы изменения только сбрасываются в базу (flush),
+    первичные ключи новых объектов при этом уже доступны.
+    Иначе изменения фиксируются (commit), а переданные объекты перечитываются из базы.
+
+    :param session: Текущая сессия.
+    :param instances: Объекты, которые необходимо обновить после фиксации.
+    """
+    if is_unit_of_work(session):
+        session.flush()
+        return
+
+    session.commit()
+    for instance in instances:
+        session.refresh(instance)
+
+
 def get_tablename_by_model(model: Type[T]):
     """
     Получить название таблицы по типу модели.
@@ -55,34 +102,27 @@ def get_model_by_tablename(table_name: str) -> Type[DeclarativeMeta]:
     """
     Найти ORM‑класс по имени таблицы.
 
-    Поддерживает SQLAlchemy 1.x и 2.x.
+    :param table_name: Имя таблицы.
+    :return: ORM-класс.
+    :raises ValueError: Модель с такой таблицей не зарегистрирована.
     """
-    # 2.x: Registry → mappers
-    try:
-        for mapper in Base.registry.mappers:
-            cls = mapper.class_
-            if getattr(cls, "__tablename__", None) == table_name:
-                return cls
-    except AttributeError:
-        # fallback для 1.x
-        for cls in Base._decl_class_registry.values():
-            if isinstance(cls, type) and getattr(cls, "__tablename__", None) == table_name:
-                return cls
-
-    raise ValueError(f"Model with table '{table_name}' is not registered in Base")
+    info = registry.get_table_info(table_name)
+    if info is None:
+        raise ValueError(f"Model with table '{table_name}' is not registered in Base")
+    return info.model
 
 
 def get_table_columns(table_name: str):
     """
-    Возвращает объект Table.columns по имени таблицы из метаданных Base.
+    Возвращает колонки таблицы по её имени.
 
     :param table_name: Имя таблицы.
-    :return: sqlalchemy.sql.base.ImmutableColumnCollection (словарь колонок).
+    :return: Кортеж колонок таблицы в порядке объявления.
     """
-    table = Base.metadata.tables.get(table_name)
-    if table is None:
+    info = registry.get_table_info(table_name)
+    if info is None:
         raise ValueError(f"Model with table '{table_name}' is not registered in Base")
-    return table.columns
+    return info.columns
 
 
 def get_all_tables_names() -> List[str]:
@@ -91,7 +131,7 @@ def get_all_tables_names() -> List[str]:
 
     :return: Список названий всех таблиц.
     """
-    return list(Base.metadata.tables.keys())
+    return list(registry.TABLES)
 
 
 def model_exists_by_table_name(table_name: str) -> bool:
@@ -101,7 +141,4 @@ def model_exists_by_table_name(table_name: str) -> bool:
     :param table_name: Имя таблицы для проверки.
     :return: True, если таблица с таким названием существует, иначе False.
     """
-    for mapper in Base.registry.mappers:
-        if mapper.class_.__table__.name == table_name:
-            return True
-    return False
+    return table_name in registry.TABLES
@@ -3,6 +3,9 @@ from .chat_types import *
 from .chats import *
 from .groups import *
 from .notification_subscribers import *
+from .notification_filters import *
 from .notification_types import *
+from .maintenance_windows import *
+from .quiet_hours import *
 from .universal import *
 from .users import *
@@ -1,7 +1,11 @@
-from typing import Optional
+from typing import Optional, Iterable, List
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
 from datetime import datetime
 from app.db.models import Administrator, User
+from app.db.base import save_changes
+from app.db import row_counts
 
 
 def create_administrator(db: Session, user: User, authorizer_id: str, granted_at: datetime) -> Administrator:
@@ -19,11 +23,42 @@ def create_administrator(db: Session, user: User, authorizer_id: str, granted_at
 
     admin = Administrator(user_id=user.id, granted_by=authorizer_id, granted_at=granted_at)
     db.add(admin)
-    db.commit()
-    db.refresh(admin)
+    save_changes(db, admin)
     return admin
 
 
+def create_administrators(db: Session, users: Iterable[User], authorizer_id: str, granted_at: datetime) -> List[User]:
+    """
+    Добавить список пользователей в администраторы одним пакетным запросом.
+    Пользователи, которые уже являются администраторами, пропускаются.
+
+    :param db: Сессия базы данных.
+    :param users: Пользователи, которым предоставляется доступ.
+    :param authorizer_id: Кем предоставлен доступ.
+    :param granted_at: Время назначения.
+    :return: Список пользователей, ставших администраторами.
+    """
+    users = {user.id: user for user in users if user is not None}
+    if not users:
+        return []
+
+    existing = set(db.execute(
+        select(Administrator.user_id).where(Administrator.user_id.in_(users.keys()))
+    ).scalars().all())
+    granted = [user for user_id, user in users.items() if user_id not in existing]
+
+    if granted:
+        stmt = insert(Administrator).on_conflict_do_nothing(index_elements=[Administrator.user_id])
+        result = db.execute(stmt, [
+            {"user_id": user.id, "granted_by": authorizer_id, "granted_at": granted_at}
+            for user in granted
+        ])
+        row_counts.add_pending(db, Administrator, result.rowcount)
+        save_changes(db)
+
+    return granted
+
+
 def delete_administrator(db: Session, admin: Optional[Administrator]) -> bool:
     """
     Удалить запись администратора по основному объекту.
@@ -36,5 +71,5 @@ def delete_administrator(db: Session, admin: Optional[Administrator]) -> bool:
         return False
 
     db.delete(admin)
-    db.commit()
+    save_changes(db)
     return True
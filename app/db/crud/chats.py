@@ -1,8 +1,12 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from app.db.models import Chat, ChatType
+from sqlalchemy import select, delete
+from app.db.models import (
+    Chat, ChatType, User, Group, Administrator, NotificationSubscriber, NotificationFilter, QuietHours
+)
+from app.db.base import save_changes
+from app.db import row_counts, filter_index, suppression
 from . import chat_types
-from typing import Optional, Union
+from typing import Optional, Union, Iterable, List
 
 
 def create_chat(db: Session, email: str, chat_type: Union[ChatType, int, str]) -> Chat:
@@ -30,8 +34,7 @@ def create_chat(db: Session, email: str, chat_type: Union[ChatType, int, str]) -
 
     chat = Chat(email=email, chat_type=chat_type_id)
     db.add(chat)
-    db.commit()
-    db.refresh(chat)
+    save_changes(db, chat)
     return chat
 
 
@@ -54,6 +57,30 @@ def find_chat(db: Session, identifier: Union[int, str]) -> Optional[Chat]:
     return db.execute(stmt).scalar_one_or_none()
 
 
+def find_chats(db: Session, identifiers: Iterable[Union[int, str]]) -> List[Chat]:
+    """
+    Найти список чатов по идентификаторам одним запросом.
+
+    :param db: Сессия базы данных.
+    :param identifiers: Идентификаторы чатов (int - ID чата, str - email чата).
+    :return: Список найденных чатов (отсутствующие идентификаторы пропускаются).
+    """
+    ids, emails = set(), set()
+    for identifier in identifiers:
+        if isinstance(identifier, int):
+            ids.add(identifier)
+        elif isinstance(identifier, str):
+            emails.add(identifier)
+        else:
+            raise TypeError(f"❌ Identifier must be int or str, received {type(identifier).__name__}")
+
+    if not ids and not emails:
+        return []
+
+    stmt = select(Chat).where(Chat.id.in_(ids) | Chat.email.in_(emails))
+    return db.execute(stmt).unique().scalars().all()
+
+
 def delete_chat(db: Session, chat: Optional[Chat]) -> bool:
     """
     Удалить чат по основному объекту.
@@ -66,7 +93,7 @@ def delete_chat(db: Session, chat: Optional[Chat]) -> bool:
         return False
 
     db.delete(chat)
-    db.commit()
+    save_changes(db)
     return True
 
 
@@ -80,3 +107,42 @@ def delete_chat_by_data(db: Session, identifier: Union[int, str]) -> bool:
     """
     chat = find_chat(db, identifier)
     return delete_chat(db, chat)
+
+
+def delete_chats(db: Session, chats: Iterable[Chat]) -> int:
+    """
+    Удалить список чатов вместе со связанными пользователями, группами,
+    администраторами, подписками, их правилами фильтрации и тихими часами в одной транзакции.
+
+    Удаление выполняется пакетными запросами без загрузки объектов,
+    поэтому переданные объекты чатов после вызова использовать нельзя.
+
+    :param db: Сессия базы данных.
+    :param chats: Объекты чатов на удаление.
+    :return: Количество удалённых чатов.
+    """
+    chat_ids = {chat.id for chat in chats if chat is not None}
+    if not chat_ids:
+        return 0
+
+    user_ids = select(User.id).where(User.chat_id.in_(chat_ids))
+    subscriber_ids = select(NotificationSubscriber.id).where(NotificationSubscriber.chat_id.in_(chat_ids))
+    dependent_deletes = (
+        delete(Administrator).where(Administrator.user_id.in_(user_ids)),
+        delete(NotificationFilter).where(NotificationFilter.subscriber_id.in_(subscriber_ids)),
+        delete(User).where(User.chat_id.in_(chat_ids)),
+        delete(Group).where(Group.chat_id.in_(chat_ids)),
+        delete(QuietHours).where(QuietHours.chat_id.in_(chat_ids)),
+        delete(NotificationSubscriber).where(NotificationSubscriber.chat_id.in_(chat_ids)),
+    )
+    for stmt in dependent_deletes:
+        result = db.execute(stmt.execution_options(synchronize_session=False))
+        row_counts.add_pending(db, stmt.table.name, -result.rowcount)
+
+    stmt = delete(Chat).where(Chat.id.in_(chat_ids)).execution_options(synchronize_session=False)
+    result = db.execute(stmt)
+    row_counts.add_pending(db, Chat, -result.rowcount)
+    filter_index.mark_changed(db)
+    suppression.mark_changed(db)
+    save_changes(db)
+    return result.rowcount
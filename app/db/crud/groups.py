@@ -1,6 +1,7 @@
 from typing import Optional
 from sqlalchemy.orm import Session
 from app.db.models import Chat, Group
+from app.db.base import save_changes
 from . import chats
 
 
@@ -18,8 +19,7 @@ def create_group(db: Session, chat: Chat, title: str) -> Group:
 
     group = Group(chat_id=chat.id, title=title)
     db.add(group)
-    db.commit()
-    db.refresh(group)
+    save_changes(db, group)
     return group
 
 
@@ -35,8 +35,7 @@ def update_group(db: Session, group: Group, title: Optional[str] = None) -> Grou
     if title is not None:
         group.title = title
 
-    db.commit()
-    db.refresh(group)
+    save_changes(db, group)
     return group
 
 
@@ -53,7 +52,7 @@ def delete_group(db: Session, group: Optional[Group], delete_chat: bool) -> bool
         return False
 
     db.delete(group)
-    db.commit()
+    save_changes(db)
 
     # Если нужно удалить чат
     if delete_chat:
@@ -0,0 +1,95 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import Optional, List
+from app.db.models import MaintenanceWindow, NotificationType
+from app.db.base import save_changes
+
+
+def add_maintenance_window(db: Session,
+                           notification_type: NotificationType,
+                           name: str,
+                           starts_at: datetime,
+                           ends_at: datetime,
+                           created_by: str,
+                           *,
+                           host_group: Optional[str] = None,
+                           host_pattern: Optional[str] = None,
+                           tag_key: Optional[str] = None,
+                           tag_value: Optional[str] = None,
+                           rollup: bool = False
+                           ) -> MaintenanceWindow:
+    """
+    Добавить окно обслуживания: уведомления типа, подходящие под условия окна,
+    не отправляются подписчикам в интервале [starts_at, ends_at).
+    Окно без условий подавляет все уведомления типа.
+
+    :param db: Сессия базы данных.
+    :param notification_type: Тип уведомлений.
+    :param name: Название окна.
+    :param starts_at: Начало окна (по Москве).
+    :param ends_at: Конец окна (по Москве).
+    :param created_by: Кто добавил окно.
+    :param host_group: Группа хостов.
+    :param host_pattern: Имя хоста или шаблон имени ('db-*').
+    :param tag_key: Ключ тега события.
+    :param tag_value: Значение тега события (только вместе с ключом тега).
+    :param rollup: Отправить сводку подавленных событий по окончании окна.
+    :return: Добавленная запись.
+    """
+    if notification_type is None:
+        raise ValueError(f"❌ notification_type is required, got {type(notification_type).__name__}")
+
+    if starts_at >= ends_at:
+        raise ValueError("❌ Maintenance window must end after it starts")
+
+    if tag_value is not None and tag_key is None:
+        raise ValueError("❌ tag_value requires tag_key")
+
+    window = MaintenanceWindow(
+        notification_type=notification_type.id,
+        name=name,
+        starts_at=starts_at.replace(tzinfo=None),
+        ends_at=ends_at.replace(tzinfo=None),
+        host_group=host_group,
+        host_pattern=host_pattern,
+        tag_key=tag_key,
+        tag_value=tag_value,
+        rollup=rollup,
+        created_by=created_by
+    )
+
+    db.add(window)
+    save_changes(db, window)
+    return window
+
+
+def find_maintenance_windows(db: Session, ends_after: Optional[datetime] = None) -> List[MaintenanceWindow]:
+    """
+    Найти окна обслуживания.
+
+    :param db: Сессия базы данных.
+    :param ends_after: Вернуть только окна, которые заканчиваются позже этого момента (по Москве).
+    :return: Список окон в порядке начала.
+    """
+    stmt = select(MaintenanceWindow)
+    if ends_after is not None:
+        stmt = stmt.where(MaintenanceWindow.ends_at > ends_after.replace(tzinfo=None))
+    return db.execute(stmt.order_by(MaintenanceWindow.starts_at, MaintenanceWindow.id)).scalars().all()
+
+
+def delete_maintenance_window(db: Session, window_id: int) -> bool:
+    """
+    Удалить окно обслуживания.
+
+    :param db: Сессия базы данных.
+    :param window_id: ID окна.
+    :return: Удалено ли окно.
+    """
+    window = db.get(MaintenanceWindow, window_id)
+    if window is None:
+        return False
+
+    db.delete(window)
+    save_changes(db)
+    return True
@@ -0,0 +1,88 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import Optional, List
+from app.db.models import NotificationFilter, NotificationSubscriber
+from app.db.base import save_changes
+
+
+def add_notification_filter(db: Session,
+                            subscriber: NotificationSubscriber,
+                            *,
+                            severity: Optional[str] = None,
+                            host_group: Optional[str] = None,
+                            host_pattern: Optional[str] = None,
+                            tag_key: Optional[str] = None,
+                            tag_value: Optional[str] = None
+                            ) -> NotificationFilter:
+    """
+    Добавить правило фильтрации уведомлений подписчика.
+    Подписчик получает событие, если оно подходит хотя бы под одно его правило
+    (все заданные условия правила выполнены).
+
+    :param db: Сессия базы данных.
+    :param subscriber: Подписчик уведомлений.
+    :param severity: Важность события.
+    :param host_group: Группа хостов.
+    :param host_pattern: Имя хоста или шаблон имени ('db-*').
+    :param tag_key: Ключ тега события.
+    :param tag_value: Значение тега события (только вместе с ключом тега).
+    :return: Добавленная запись.
+    """
+    if subscriber is None:
+        raise ValueError(f"❌ subscriber is required, got {type(subscriber).__name__}")
+
+    if tag_value is not None and tag_key is None:
+        raise ValueError("❌ tag_value requires tag_key")
+
+    if all(value is None for value in (severity, host_group, host_pattern, tag_key)):
+        raise ValueError("❌ Notification filter must have at least one condition")
+
+    notification_filter = NotificationFilter(
+        subscriber_id=subscriber.id,
+        severity=severity,
+        host_group=host_group,
+        host_pattern=host_pattern,
+        tag_key=tag_key,
+        tag_value=tag_value
+    )
+
+    db.add(notification_filter)
+    save_changes(db, notification_filter)
+    return notification_filter
+
+
+def find_notification_filters(db: Session, subscriber: Optional[NotificationSubscriber]) -> List[NotificationFilter]:
+    """
+    Найти правила фильтрации уведомлений подписчика.
+
+    :param db: Сессия базы данных.
+    :param subscriber: Подписчик уведомлений.
+    :return: Список правил в порядке добавления.
+    """
+    if subscriber is None:
+        return []
+
+    stmt = select(NotificationFilter).where(
+        NotificationFilter.subscriber_id == subscriber.id
+    ).order_by(NotificationFilter.id)
+    return db.execute(stmt).scalars().all()
+
+
+def delete_notification_filters(db: Session, subscriber: Optional[NotificationSubscriber]) -> int:
+    """
+    Удалить все правила фильтрации уведомлений подписчика
+    (подписчик снова получает все уведомления своего типа).
+
+    :param db: Сессия базы данных.
+    :param subscriber: Подписчик уведомлений.
+    :return: Количество удалённых правил.
+    """
+    if subscriber is None:
+        return 0
+
+    filters = find_notification_filters(db, subscriber)
+    for notification_filter in filters:
+        db.delete(notification_filter)
+    if filters:
+        save_changes(db)
+    return len(filters)
@@ -1,8 +1,11 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select, and_
-from typing import Optional
+from sqlalchemy import select, delete, and_
+from sqlalchemy.dialects.sqlite import insert
+from typing import Optional, Iterable, List
 from datetime import datetime
-from app.db.models import NotificationSubscriber, Chat, NotificationType
+from app.db.models import NotificationSubscriber, NotificationFilter, Chat, NotificationType
+from app.db.base import save_changes
+from app.db import row_counts, filter_index
 
 
 def add_notification_subscriber(db: Session,
@@ -32,8 +35,7 @@ def add_notification_subscriber(db: Session,
     )
 
     db.add(subscriber)
-    db.commit()
-    db.refresh(subscriber)
+    save_changes(db, subscriber)
     return subscriber
 
 
@@ -49,7 +51,7 @@ def delete_notifications_subscriber(db: Session, subscriber: Optional[Notificati
         return False
 
     db.delete(subscriber)
-    db.commit()
+    save_changes(db)
     return True
 
 
@@ -81,3 +83,107 @@ def delete_notification_subscriber_by_data(db: Session, chat: Optional[Chat], no
         return False
 
     return delete_notifications_subscriber(db, subscriber)
+
+
+def _find_subscribed_chat_ids(db: Session, chat_ids: Iterable[int], notification_type: NotificationType) -> set:
+    """
+    Найти ID чатов из заданного набора, подписанных на тип уведомлений.
+
+    :param db: Сессия базы данных.
+    :param chat_ids: ID проверяемых чатов.
+    :param notification_type: Тип уведомлений.
+    :return: Множество ID подписанных чатов.
+    """
+    stmt = select(NotificationSubscriber.chat_id).where(
+        and_(
+            NotificationSubscriber.chat_id.in_(chat_ids),
+            NotificationSubscriber.notification_type == notification_type.id
+        )
+    )
+    return set(db.execute(stmt).scalars().all())
+
+
+def add_notification_subscribers(db: Session,
+                                 chats: Iterable[Chat],
+                                 notification_type: NotificationType,
+                                 authorizer_id: str, granted_at: datetime
+                                 ) -> List[Chat]:
+    """
+    Подписать список чатов на определённый тип уведомлений одним пакетным запросом.
+    Уже подписанные чаты пропускаются.
+
+    :param db: Сессия базы данных.
+    :param chats: Чаты, которые становятся подписчиками уведомлений.
+    :param notification_type: Тип уведомлений, на который подписываются чаты.
+    :param authorizer_id: Кем предоставлен доступ.
+    :param granted_at: Время предоставления.
+    :return: Список чатов, подписанных в результате вызова.
+    """
+    if notification_type is None:
+        raise ValueError(f"❌ notification_type is required, got {type(notification_type).__name__}")
+
+    chats = {chat.id: chat for chat in chats if chat is not None}
+    if not chats:
+        return []
+
+    existing = _find_subscribed_chat_ids(db, chats.keys(), notification_type)
+    subscribed = [chat for chat_id, chat in chats.items() if chat_id not in existing]
+
+    if subscribed:
+        stmt = insert(NotificationSubscriber).on_conflict_do_nothing(
+            index_elements=[NotificationSubscriber.chat_id, NotificationSubscriber.notification_type]
+        )
+        result = db.execute(stmt, [
+            {
+                "chat_id": chat.id,
+                "notification_type": notification_type.id,
+                "granted_by": authorizer_id,
+                "granted_at": granted_at
+            }
+            for chat in subscribed
+        ])
+        row_counts.add_pending(db, NotificationSubscriber, result.rowcount)
+        save_changes(db)
+
+    return subscribed
+
+
+def delete_notification_subscribers(db: Session,
+                                    chats: Iterable[Chat],
+                                    notification_type: NotificationType) -> List[Chat]:
+    """
+    Отписать список чатов от определённого типа уведомлений одним пакетным запросом.
+
+    :param db: Сессия базы данных.
+    :param chats: Чаты, которые отписываются от уведомлений.
+    :param notification_type: Тип уведомлений, от которого отписываются чаты.
+    :return: Список чатов, отписанных в результате вызова.
+    """
+    if notification_type is None:
+        raise ValueError(f"❌ notification_type is required, got {type(notification_type).__name__}")
+
+    chats = {chat.id: chat for chat in chats if chat is not None}
+    if not chats:
+        return []
+
+    existing = _find_subscribed_chat_ids(db, chats.keys(), notification_type)
+    if not existing:
+        return []
+
+    condition = and_(
+        NotificationSubscriber.chat_id.in_(existing),
+        NotificationSubscriber.notification_type == notification_type.id
+    )
+    stmt = delete(NotificationFilter).where(
+        NotificationFilter.subscriber_id.in_(select(NotificationSubscriber.id).where(condition))
+    ).execution_options(synchronize_session=False)
+    result = db.execute(stmt)
+    row_counts.add_pending(db, NotificationFilter, -result.rowcount)
+
+    stmt = delete(NotificationSubscriber).where(condition).execution_options(synchronize_session=False)
+    result = db.execute(stmt)
+    row_counts.add_pending(db, NotificationSubscriber, -result.rowcount)
+    filter_index.mark_changed(db)
+    save_changes(db)
+
+    return [chat for chat_id, chat in chats.items() if chat_id in existing]
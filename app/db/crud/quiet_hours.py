@@ -0,0 +1,80 @@
+from datetime import time
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import Optional
+from app.db.models import QuietHours, Chat
+from app.db.base import save_changes
+from app.utils import date_and_time
+
+
+def set_quiet_hours(db: Session,
+                    chat: Chat,
+                    starts_at: time,
+                    ends_at: time,
+                    timezone: str = "Europe/Moscow",
+                    rollup: bool = False
+                    ) -> QuietHours:
+    """
+    Задать (или заменить) тихие часы чата: в интервале [starts_at, ends_at) по часовому поясу чата
+    уведомления подписок чата не отправляются. Интервал может переходить через полночь.
+
+    :param db: Сессия базы данных.
+    :param chat: Чат.
+    :param starts_at: Начало тихих часов.
+    :param ends_at: Конец тихих часов.
+    :param timezone: Часовой пояс чата (pytz timezone name).
+    :param rollup: Отправить сводку подавленных уведомлений по окончании тихих часов.
+    :return: Запись тихих часов.
+    """
+    if chat is None:
+        raise ValueError(f"❌ chat is required, got {type(chat).__name__}")
+
+    if starts_at == ends_at:
+        raise ValueError("❌ Quiet hours must not be empty")
+
+    # Проверка названия часового пояса
+    date_and_time.get_timezone(timezone)
+
+    quiet_hours = find_quiet_hours(db, chat)
+    if quiet_hours is None:
+        quiet_hours = QuietHours(chat_id=chat.id)
+        db.add(quiet_hours)
+
+    quiet_hours.starts_at = starts_at
+    quiet_hours.ends_at = ends_at
+    quiet_hours.timezone = timezone
+    quiet_hours.rollup = rollup
+
+    save_changes(db, quiet_hours)
+    return quiet_hours
+
+
+def find_quiet_hours(db: Session, chat: Optional[Chat]) -> Optional[QuietHours]:
+    """
+    Найти тихие часы чата.
+
+    :param db: Сессия базы данных.
+    :param chat: Чат.
+    :return: Запись тихих часов или None.
+    """
+    if chat is None:
+        return None
+
+    return db.execute(select(QuietHours).where(QuietHours.chat_id == chat.id)).scalars().first()
+
+
+def delete_quiet_hours(db: Session, chat: Optional[Chat]) -> bool:
+    """
+    Удалить тихие часы чата.
+
+    :param db: Сессия базы данных.
+    :param chat: Чат.
+    :return: Были ли удалены тихие часы.
+    """
+    quiet_hours = find_quiet_hours(db, chat)
+    if quiet_hours is None:
+        return False
+
+    db.delete(quiet_hours)
+    save_changes(db)
+    return True
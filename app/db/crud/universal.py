@@ -1,30 +1,33 @@
-from typing import List, Type, Optional, Union, Any, Dict
+from typing import List, Type, Optional, Union, Any, Dict, Tuple, Sequence, Set
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import ColumnElement
-from sqlalchemy import select, func, String, Text, DateTime, and_
+from sqlalchemy import select, func, String, Text, DateTime, Column, and_, tuple_, inspect
 from app.db.base import T
-from datetime import datetime
-import dateutil.parser
+from app.db import row_counts, fulltext
+from datetime import datetime, timedelta
+from app.utils import date_and_time
 
 
 def _build_condition(
     model: Type[T],
     field: Union[str, InstrumentedAttribute],
     value: Any,
-    partial_match: bool = False
+    partial_match: bool = False,
+    fulltext_tables: Optional[Set[str]] = None
 ):
     """
     Формирует SQLAlchemy-условие для одного поля модели.
 
     Поддерживает:
-    - partial_match=True для String/Text и Datetime (по дате).
+    - partial_match=True для String/Text и Datetime (по интервалу года, месяца, дня, часа...).
     - Точное сравнение для всех типов.
 
     :param model: ORM-модель.
     :param field: Название или атрибут поля.
     :param value: Значение.
-    :param partial_match: Для строк — LIKE, для datetime — по дате.
+    :param partial_match: Для строк — полнотекстовый индекс или LIKE, для datetime — по интервалу даты.
+    :param fulltext_tables: Таблицы с доступным полнотекстовым индексом (см. fulltext.available_tables).
     :return: Сформированное условие.
     """
     # получаем InstrumentedAttribute
@@ -41,29 +44,57 @@ def _build_condition(
     is_string = isinstance(col_type, (String, Text))
     is_datetime = isinstance(col_type, DateTime)
 
-    # Строка для LIKE
+    # Строка через полнотекстовый индекс, иначе LIKE
     if is_string and partial_match and isinstance(value, str):
+        if fulltext_tables:
+            condition = fulltext.build_match_condition(model, col, value, fulltext_tables)
+            if condition is not None:
+                return condition
         return col.like(f"%{value}%")
 
-    # Частичный поиск по дате
+    # Частичный поиск по дате: полуоткрытый интервал, который может использовать индекс колонки
     if is_datetime and partial_match:
         if isinstance(value, str):
             try:
-                value_dt = dateutil.parser.parse(value)
+                start, end = date_and_time.parse_datetime_range(value)
             except (ValueError, TypeError):
                 # Если ошибка, не преобразуем к datetime
                 return col == value
         elif isinstance(value, datetime):
-            value_dt = value
+            # Интервал дня без учёта времени
+            start = value.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+            end = start + timedelta(days=1)
         else:
             raise TypeError(f"Unsupported type for datetime partial match: {type(value)}")
-        # Сравнение только по дате без учёта времени
-        return func.date(col) == value_dt.date()
+        return and_(col >= start, col < end)
 
     # Строгое сравнение
     return col == value
 
 
+def _build_conditions(
+    db: Session,
+    model: Type[T],
+    conditions: Dict[Union[str, InstrumentedAttribute], Any],
+    partial_match: bool = False
+) -> ColumnElement:
+    """
+    Формирует SQLAlchemy-условие (AND) для набора полей модели.
+    Частичный поиск по строкам направляется в полнотекстовый индекс, если он создан.
+
+    :param db: Сессия SQLAlchemy.
+    :param model: ORM-модель.
+    :param conditions: Словарь {поле: значение, …}.
+    :param partial_match: Включить частичный поиск по значению.
+    :return: Сформированное условие.
+    """
+    fulltext_tables = fulltext.available_tables(db) if partial_match else None
+    return and_(*(
+        _build_condition(model, fld, val, partial_match, fulltext_tables)
+        for fld, val in conditions.items()
+    ))
+
+
 def get_all_records(db: Session, model: Type[T]) -> List[T]:
     """
     Получить все записи из таблицы модели.
@@ -143,6 +174,107 @@ def get_records_range(
     return db.execute(stmt).scalars().all()
 
 
+def _keyset_columns(model: Type[T], order_by: Optional[Union[Column, InstrumentedAttribute]] = None) -> List[Column]:
+    """
+    Определить колонки ключа курсора: колонка сортировки (если задана) и первичный ключ.
+    Первичный ключ добавляется для уникальности курсора при одинаковых значениях сортировки.
+
+    :param model: ORM-модель.
+    :param order_by: Индексированная колонка сортировки (по умолчанию - первичный ключ).
+    :return: Список колонок ключа.
+    """
+    pks = list(model.__table__.primary_key.columns)
+    if not pks:
+        raise ValueError(f"❌ Model '{model.__name__}' has no primary key for keyset pagination")
+
+    if order_by is None:
+        return pks
+
+    col = order_by.property.columns[0] if isinstance(order_by, InstrumentedAttribute) else order_by
+    return [col] + [pk for pk in pks if pk is not col]
+
+
+def get_keyset_cursor(
+    record: T,
+    *,
+    order_by: Optional[Union[Column, InstrumentedAttribute]] = None
+) -> List[Any]:
+    """
+    Получить курсор (значения ключа сортировки) записи для keyset-пагинации.
+
+    :param record: Экземпляр модели.
+    :param order_by: Колонка сортировки, с которой запрашивалась страница.
+    :return: Список значений ключа.
+    """
+    mapper = inspect(type(record))
+    return [
+        getattr(record, mapper.get_property_by_column(col).key)
+        for col in _keyset_columns(type(record), order_by)
+    ]
+
+
+def get_records_keyset(
+    db: Session,
+    model: Type[T],
+    *,
+    limit: int,
+    after: Optional[Sequence[Any]] = None,
+    before: Optional[Sequence[Any]] = None,
+    order_by: Optional[Union[Column, InstrumentedAttribute]] = None,
+    conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+    partial_match: bool = False
+) -> Tuple[List[T], bool]:
+    """
+    Получить страницу записей модели курсорной (keyset) пагинацией.
+
+    В отличие от OFFSET, страница ищется по индексу от значения курсора,
+    поэтому стоимость запроса зависит только от размера страницы, а не от её номера.
+
+    :param db: Сессия SQLAlchemy.
+    :param model: Класс ORM‑модели.
+    :param limit: Размер страницы.
+    :param after: Курсор записи, после которой начинается страница (см. get_keyset_cursor).
+    :param before: Курсор записи, перед которой заканчивается страница.
+    :param order_by: Индексированная колонка сортировки (по умолчанию - первичный ключ).
+    :param conditions: Словарь условий отбора {поле: значение, …} (AND).
+    :param partial_match: Включить частичный поиск по значениям условий.
+    :return: Кортеж (записи страницы по возрастанию ключа, есть ли ещё записи в направлении перехода).
+    """
+    if limit < 1:
+        raise ValueError("limit must be >= 1")
+    if after is not None and before is not None:
+        raise ValueError("Only one of 'after' or 'before' may be provided")
+
+    cols = _keyset_columns(model, order_by)
+    key = cols[0] if len(cols) == 1 else tuple_(*cols)
+
+    def cursor_value(cursor: Sequence[Any]):
+        if len(cursor) != len(cols):
+            raise ValueError(f"Cursor must contain {len(cols)} value(s), received {len(cursor)}")
+        return cursor[0] if len(cols) == 1 else tuple_(*cursor)
+
+    stmt = select(model)
+    if conditions:
+        stmt = stmt.where(_build_conditions(db, model, conditions, partial_match))
+
+    if before is not None:
+        stmt = stmt.where(key < cursor_value(before)).order_by(*(col.desc() for col in cols))
+    else:
+        if after is not None:
+            stmt = stmt.where(key > cursor_value(after))
+        stmt = stmt.order_by(*cols)
+
+    # Запрашиваем на одну запись больше, чтобы узнать о наличии следующей страницы
+    records = db.execute(stmt.limit(limit + 1)).unique().scalars().all()
+    has_more = len(records) > limit
+    records = records[:limit]
+
+    if before is not None:
+        records.reverse()
+
+    return records, has_more
+
+
 def find_one_record(
     db: Session,
     model: Type[T],
@@ -164,11 +296,7 @@ def find_one_record(
     if not conditions:
         raise ValueError("At least one condition must be provided")
 
-    conds = [
-        _build_condition(model, fld, val, partial_match)
-        for fld, val in conditions.items()
-    ]
-    stmt = select(model).where(and_(*conds))
+    stmt = select(model).where(_build_conditions(db, model, conditions, partial_match))
     return db.execute(stmt).scalars().one_or_none()
 
 
@@ -192,22 +320,41 @@ def find_records(
     if not conditions:
         stmt = select(model)
     else:
-        conds = [
-            _build_condition(model, fld, val, partial_match)
-            for fld, val in conditions.items()
-        ]
-        stmt = select(model).where(and_(*conds))
+        stmt = select(model).where(_build_conditions(db, model, conditions, partial_match))
 
     return db.execute(stmt).scalars().all()
 
 
-def count_records(db: Session, model: Type[T]) -> int:
+def count_records(
+    db: Session,
+    model: Type[T],
+    conditions: Optional[Dict[Union[str, InstrumentedAttribute], Any]] = None,
+    *,
+    partial_match: bool = False
+) -> int:
     """
     Возвращает количество записей в заданной таблице.
+    Без условий количество берётся из кэша количества строк (см. app.db.row_counts).
 
     :param db: Активная сессия SQLAlchemy.
     :param model: Класс ORM-модели таблицы.
+    :param conditions: Словарь условий отбора {поле: значение, …} (AND), если None — вся таблица.
+    :param partial_match: Включить частичный поиск по значениям условий.
     :return: Количество записей.
     """
-    stmt = select(func.count()).select_from(model)
+    if not conditions:
+        return row_counts.count(db, model)
+
+    stmt = select(func.count()).select_from(model).where(_build_conditions(db, model, conditions, partial_match))
     return db.execute(stmt).scalar_one()
+
+
+def has_records(db: Session, model: Type[T]) -> bool:
+    """
+    Проверить, есть ли в таблице хотя бы одна запись (без подсчёта всех строк).
+
+    :param db: Активная сессия SQLAlchemy.
+    :param model: Класс ORM-модели таблицы.
+    :return: True, если таблица не пустая.
+    """
+    return row_counts.exists_any(db, model)
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from app.db.models import Chat, User
+from app.db.base import save_changes
 from typing import Optional
 from . import chats
 
@@ -19,8 +20,7 @@ def create_user(db: Session, chat: Chat, first_name: str, last_name: Optional[st
 
     user = User(chat_id=chat.id, first_name=first_name, last_name=last_name)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    save_changes(db, user)
     return user
 
 
@@ -39,8 +39,7 @@ def update_user(db: Session, user: User, first_name: Optional[str] = None, last_
     if last_name is not None:
         user.last_name = last_name
 
-    db.commit()
-    db.refresh(user)
+    save_changes(db, user)
     return user
 
 
@@ -57,7 +56,7 @@ def delete_user(db: Session, user: Optional[User], delete_chat: bool) -> bool:
         return False
 
     db.delete(user)
-    db.commit()
+    save_changes(db)
 
     if delete_chat:
         chats.delete_chat_by_data(db, user.chat_id)
@@ -0,0 +1,374 @@
+"""
+Индекс правил фильтрации уведомлений подписчиков.
+
+Правила (таблица notification_filters) типа уведомлений компилируются один раз в инвертированный
+индекс: каждое правило попадает в корзину по самому избирательному условию (тег со значением,
+точное имя хоста, группа хостов, важность, ключ тега, шаблон имени хоста). Сопоставление события
+проверяет только правила из корзин, совпавших с атрибутами события, поэтому его стоимость зависит
+от количества подходящих правил, а не от общего количества правил.
+
+Подписчик без правил получает все уведомления своего типа, подписчик с правилами — только события,
+подходящие хотя бы под одно его правило. Индекс сбрасывается после фиксации транзакции,
+изменившей правила или подписчиков.
+"""
+import re
+import threading
+import weakref
+from fnmatch import translate
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Pattern, Set, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine, Connection
+from sqlalchemy.orm import Session
+from .models import NotificationFilter, NotificationSubscriber, NotificationType
+
+# Поля данных события Zabbix, по которым выполняется фильтрация
+SEVERITY_FIELD = "severity"
+HOST_FIELD = "host"
+HOST_GROUPS_FIELD = "host_groups"
+TAGS_FIELD = "tags"
+
+# Признак изменения правил или подписчиков в Session.info
+_CHANGED_KEY = "notification_filters_changed"
+
+# Символы шаблона имени хоста (glob)
+_GLOB_CHARS = frozenset("*?[")
+
+_lock = threading.Lock()
+
+# Индексы по движкам: engine -> {ID типа уведомлений: индекс}
+_indexes: "weakref.WeakKeyDictionary[Engine, Dict[int, FilterIndex]]" = weakref.WeakKeyDictionary()
+
+# Поколения изменений правил по движкам
+_generations: "weakref.WeakKeyDictionary[Engine, int]" = weakref.WeakKeyDictionary()
+
+
+class EventAttributes(NamedTuple):
+    # Важность события (в нижнем регистре)
+    severity: Optional[str]
+    # Имя хоста (в нижнем регистре)
+    host: Optional[str]
+    # Группы хоста (в нижнем регистре)
+    host_groups: FrozenSet[str]
+    # Теги события: пары (ключ, значение)
+    tags: FrozenSet[Tuple[str, str]]
+
+
+class FilterRule(NamedTuple):
+    # ID подписчика уведомлений
+    subscriber_id: int
+    severity: Optional[str]
+    host_group: Optional[str]
+    # Точное имя хоста или скомпилированный шаблон
+    host: Optional[str]
+    host_pattern: Optional[Pattern]
+    tag_key: Optional[str]
+    tag_value: Optional[str]
+
+
+def _normalize(value: Any) -> Optional[str]:
+    """
+    Привести значение условия или атрибута к виду для сравнения без учёта регистра.
+    """
+    if value is None:
+        return None
+    value = str(value).strip().lower()
+    return value or None
+
+
+def _split_list(value: Any) -> List[str]:
+    """
+    Получить элементы списка или строки со значениями через запятую.
+    """
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return [str(item) for item in value]
+    return str(value).split(",")
+
+
+def _parse_tags(value: Any) -> FrozenSet[Tuple[str, str]]:
+    """
+    Разобрать теги события: словарь, список {"tag": ..., "value": ...} ({EVENT.TAGSJSON})
+    или строка 'ключ:значение, ключ:значение' ({EVENT.TAGS}).
+    """
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, (list, tuple)):
+        items = [
+            (item.get("tag"), item.get("value", "")) if isinstance(item, dict) else str(item).partition(":")[::2]
+            for item in value
+        ]
+    else:
+        items = [item.partition(":")[::2] for item in _split_list(value)]
+
+    return frozenset(
+        (str(key).strip(), str(tag_value if tag_value is not None else "").strip())
+        for key, tag_value in items
+        if key is not None and str(key).strip()
+    )
+
+
+def event_attributes(data: Any) -> EventAttributes:
+    """
+    Получить атрибуты события, по которым выполняется фильтрация.
+
+    :param data: Данные события.
+    :return: Атрибуты события.
+    """
+    if not isinstance(data, dict):
+        return EventAttributes(None, None, frozenset(), frozenset())
+
+    return EventAttributes(
+        severity=_normalize(data.get(SEVERITY_FIELD)),
+        host=_normalize(data.get(HOST_FIELD)),
+        host_groups=frozenset(filter(None, map(_normalize, _split_list(data.get(HOST_GROUPS_FIELD))))),
+        tags=_parse_tags(data.get(TAGS_FIELD)),
+    )
+
+
+def make_rule(owner_id: int, *, severity: Optional[str] = None, host_group: Optional[str] = None,
+              host_pattern: Optional[str] = None, tag_key: Optional[str] = None,
+              tag_value: Optional[str] = None) -> FilterRule:
+    """
+    Скомпилировать условия отбора событий в правило.
+
+    :param owner_id: ID владельца правила (подписчика или окна обслуживания).
+    :param severity: Важность события.
+    :param host_group: Группа хостов.
+    :param host_pattern: Имя хоста или шаблон имени.
+    :param tag_key: Ключ тега события.
+    :param tag_value: Значение тега события.
+    :return: Правило.
+    """
+    host = _normalize(host_pattern)
+    compiled_pattern = None
+    if host is not None and _GLOB_CHARS.intersection(host):
+        compiled_pattern, host = re.compile(translate(host)), None
+
+    return FilterRule(
+        subscriber_id=owner_id,
+        severity=_normalize(severity),
+        host_group=_normalize(host_group),
+        host=host,
+        host_pattern=compiled_pattern,
+        tag_key=tag_key.strip() if tag_key else None,
+        tag_value=tag_value.strip() if tag_value is not None else None,
+    )
+
+
+def compile_rule(record: NotificationFilter) -> FilterRule:
+    """
+    Скомпилировать запись правила фильтрации.
+
+    :param record: Запись правила.
+    :return: Правило.
+    """
+    return make_rule(
+        record.subscriber_id,
+        severity=record.severity,
+        host_group=record.host_group,
+        host_pattern=record.host_pattern,
+        tag_key=record.tag_key,
+        tag_value=record.tag_value,
+    )
+
+
+def rule_matches(rule: FilterRule, attrs: EventAttributes) -> bool:
+    """
+    Проверить, выполнены ли все условия правила для события.
+
+    :param rule: Правило.
+    :param attrs: Атрибуты события.
+    :return: True, если событие подходит под правило.
+    """
+    if rule.severity is not None and rule.severity != attrs.severity:
+        return False
+    if rule.host_group is not None and rule.host_group not in attrs.host_groups:
+        return False
+    if rule.host is not None and rule.host != attrs.host:
+        return False
+    if rule.host_pattern is not None and (attrs.host is None or not rule.host_pattern.match(attrs.host)):
+        return False
+    if rule.tag_key is not None:
+        if rule.tag_value is None:
+            return any(key == rule.tag_key for key, _ in attrs.tags)
+        return (rule.tag_key, rule.tag_value) in attrs.tags
+    return True
+
+
+class FilterIndex:
+    """
+    Инвертированный индекс правил фильтрации одного типа уведомлений.
+    """
+
+    def __init__(self, rules: Iterable[FilterRule]):
+        """
+        :param rules: Правила фильтрации подписчиков типа уведомлений.
+        """
+        self.by_tag: Dict[Tuple[str, str], List[FilterRule]] = {}
+        self.by_host: Dict[str, List[FilterRule]] = {}
+        self.by_host_group: Dict[str, List[FilterRule]] = {}
+        self.by_severity: Dict[str, List[FilterRule]] = {}
+        self.by_tag_key: Dict[str, List[FilterRule]] = {}
+        # Правила, единственное условие которых — шаблон имени хоста
+        self.host_patterns: List[FilterRule] = []
+
+        filtered = set()
+        for rule in rules:
+            filtered.add(rule.subscriber_id)
+            # Корзина по самому избирательному условию правила
+            if rule.tag_key is not None and rule.tag_value is not None:
+                self.by_tag.setdefault((rule.tag_key, rule.tag_value), []).append(rule)
+            elif rule.host is not None:
+                self.by_host.setdefault(rule.host, []).append(rule)
+            elif rule.host_group is not None:
+                self.by_host_group.setdefault(rule.host_group, []).append(rule)
+            elif rule.severity is not None:
+                self.by_severity.setdefault(rule.severity, []).append(rule)
+            elif rule.tag_key is not None:
+                self.by_tag_key.setdefault(rule.tag_key, []).append(rule)
+            else:
+                self.host_patterns.append(rule)
+
+        # ID подписчиков, у которых есть правила
+        self.filtered: FrozenSet[int] = frozenset(filtered)
+
+    def _candidates(self, attrs: EventAttributes) -> Iterable[FilterRule]:
+        """
+        Получить правила из корзин, совпавших с атрибутами события.
+        """
+        for tag in attrs.tags:
+            yield from self.by_tag.get(tag, ())
+        if attrs.host is not None:
+            yield from self.by_host.get(attrs.host, ())
+        for group in attrs.host_groups:
+            yield from self.by_host_group.get(group, ())
+        if attrs.severity is not None:
+            yield from self.by_severity.get(attrs.severity, ())
+        if self.by_tag_key:
+            for key in {key for key, _ in attrs.tags}:
+                yield from self.by_tag_key.get(key, ())
+        yield from self.host_patterns
+
+    def match(self, attrs: EventAttributes) -> Set[int]:
+        """
+        Найти подписчиков с правилами, под которые подходит событие.
+
+        :param attrs: Атрибуты события.
+        :return: Множество ID подписчиков.
+        """
+        return {
+            rule.subscriber_id
+            for rule in self._candidates(attrs)
+            if rule_matches(rule, attrs)
+        }
+
+
+def _engine(session: Session) -> Engine:
+    """
+    Получить движок, к которому привязана сессия.
+    """
+    bind = session.get_bind()
+    return bind.engine if isinstance(bind, Connection) else bind
+
+
+def get_index(session: Session, notification_type: NotificationType) -> FilterIndex:
+    """
+    Получить (скомпилировать при первом обращении) индекс правил типа уведомлений.
+
+    :param session: Текущая сессия.
+    :param notification_type: Тип уведомлений.
+    :return: Индекс правил.
+    """
+    engine = _engine(session)
+    with _lock:
+        index = _indexes.get(engine, {}).get(notification_type.id)
+        generation = _generations.get(engine, 0)
+    if index is not None:
+        return index
+
+    stmt = select(NotificationFilter).join(NotificationFilter.subscriber).where(
+        NotificationSubscriber.notification_type == notification_type.id
+    )
+    index = FilterIndex(compile_rule(record) for record in session.execute(stmt).scalars().all())
+
+    with _lock:
+        # Не сохраняем индекс, если за время сборки другая транзакция изменила правила
+        if _generations.get(engine, 0) == generation:
+            _indexes.setdefault(engine, {})[notification_type.id] = index
+    return index
+
+
+def select_subscribers(session: Session, notification_type: NotificationType,
+                       subscribers: Iterable[NotificationSubscriber], data: Any) -> List[NotificationSubscriber]:
+    """
+    Отобрать подписчиков, которые должны получить событие, по их правилам фильтрации.
+
+    :param session: Текущая сессия.
+    :param notification_type: Тип уведомлений.
+    :param subscribers: Подписчики типа уведомлений.
+    :param data: Данные события.
+    :return: Список подписчиков без правил и подписчиков, под правила которых подходит событие.
+    """
+    index = get_index(session, notification_type)
+    if not index.filtered:
+        return list(subscribers)
+
+    matched = index.match(event_attributes(data))
+    return [
+        subscriber for subscriber in subscribers
+        if subscriber.id not in index.filtered or subscriber.id in matched
+    ]
+
+
+def mark_changed(session: Session) -> None:
+    """
+    Отметить изменение правил или подписчиков, выполненное в обход ORM (пакетные запросы).
+    Индексы сбрасываются после фиксации транзакции.
+
+    :param session: Текущая сессия.
+    """
+    session.info[_CHANGED_KEY] = True
+
+
+def invalidate(session_or_engine) -> None:
+    """
+    Сбросить индексы правил движка.
+
+    :param session_or_engine: Сессия или движок.
+    """
+    engine = _engine(session_or_engine) if isinstance(session_or_engine, Session) else session_or_engine
+    with _lock:
+        _indexes.pop(engine, None)
+        _generations[engine] = _generations.get(engine, 0) + 1
+
+
+# -------------------- Обработчики событий сессии --------------------
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, _flush_context):
+    """
+    Отметить сессию, если сброшенные изменения затрагивают правила или подписчиков.
+    """
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (NotificationFilter, NotificationSubscriber)):
+            session.info[_CHANGED_KEY] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session):
+    """
+    Сбросить индексы после фиксации транзакции, изменившей правила или подписчиков.
+    """
+    if session.info.pop(_CHANGED_KEY, False):
+        invalidate(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session):
+    """
+    Отбросить отметку изменений отменённой транзакции.
+    """
+    session.info.pop(_CHANGED_KEY, None)
@@ -0,0 +1,176 @@
+"""
+Полнотекстовые индексы SQLite FTS5 для частичного поиска по текстовым полям.
+
+Для каждой модели из MODEL_FORMATS создаётся теневая таблица 'fts_<таблица>'
+(external content, токенизатор trigram) по её текстовым колонкам, синхронизируемая триггерами.
+Частичный поиск строки длиной от трёх символов выполняется через MATCH по теневой таблице,
+вместо LIKE '%значение%' с полным просмотром таблицы.
+"""
+import threading
+import weakref
+from typing import Dict, List, Optional, Set, Tuple, Type
+from sqlalchemy import Integer, String, Text, text, select, table, column
+from sqlalchemy.engine import Engine, Connection
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.sql import ColumnElement
+
+# Префикс теневых таблиц полнотекстового поиска
+FTS_TABLE_PREFIX = "fts_"
+
+# Минимальная длина строки поиска для токенизатора trigram
+MIN_QUERY_LENGTH = 3
+
+_lock = threading.Lock()
+
+# Найденные теневые таблицы по движкам: engine -> {название таблицы модели}
+_available: "weakref.WeakKeyDictionary[Engine, Set[str]]" = weakref.WeakKeyDictionary()
+
+_indexed_columns: Optional[Dict[str, Tuple[str, List[str]]]] = None
+
+
+def fts_table_name(table_name: str) -> str:
+    """
+    Получить название теневой таблицы полнотекстового поиска.
+
+    :param table_name: Название таблицы модели.
+    :return: Название теневой таблицы.
+    """
+    return f"{FTS_TABLE_PREFIX}{table_name}"
+
+
+def indexed_columns() -> Dict[str, Tuple[str, List[str]]]:
+    """
+    Получить текстовые колонки моделей из MODEL_FORMATS, которые индексируются полнотекстово.
+    Учитываются только собственные колонки модели (без вложенных связей) и модели
+    с целочисленным первичным ключом (он используется как rowid теневой таблицы).
+
+    :return: Словарь {название таблицы: (колонка первичного ключа, [текстовые колонки])}.
+    """
+    global _indexed_columns
+    if _indexed_columns is not None:
+        return _indexed_columns
+
+    # Импорт при вызове: конфигурация форматов сама зависит от пакета app.db
+    from app.utils.db_records_format import MODEL_FORMATS
+
+    result = {}
+    for model, model_fields, _ in MODEL_FORMATS:
+        pks = list(model.__table__.primary_key.columns)
+        if len(pks) != 1 or not isinstance(pks[0].type, Integer):
+            continue
+
+        columns = []
+        for field in model_fields:
+            if isinstance(field, tuple):
+                continue
+            col = getattr(model, field) if isinstance(field, str) else field
+            col = col.property.columns[0] if isinstance(col, InstrumentedAttribute) else col
+            if isinstance(col.type, (String, Text)) and col.name not in columns:
+                columns.append(col.name)
+
+        if columns:
+            result[model.__table__.name] = (pks[0].name, columns)
+
+    _indexed_columns = result
+    return result
+
+
+def available_tables(session: Session) -> Set[str]:
+    """
+    Получить (однократно для движка) таблицы моделей, для которых создан полнотекстовый индекс.
+
+    :param session: Текущая сессия.
+    :return: Множество названий таблиц моделей.
+    """
+    bind = session.get_bind()
+    engine = bind.engine if isinstance(bind, Connection) else bind
+    if engine.dialect.name != "sqlite":
+        return set()
+
+    with _lock:
+        found = _available.get(engine)
+    if found is None:
+        names = session.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars().all()
+        found = {
+            name[len(FTS_TABLE_PREFIX):]
+            for name in names
+            if name.startswith(FTS_TABLE_PREFIX)
+        } & set(indexed_columns())
+        with _lock:
+            _available[engine] = found
+    return found
+
+
+def build_match_condition(model: Type, col: InstrumentedAttribute, value: str,
+                          tables: Set[str]) -> Optional[ColumnElement]:
+    """
+    Сформировать условие частичного поиска строки через полнотекстовый индекс.
+
+    :param model: ORM-модель.
+    :param col: Атрибут текстовой колонки.
+    :param value: Искомая подстрока.
+    :param tables: Таблицы моделей с доступным полнотекстовым индексом (см. available_tables).
+    :return: Условие 'pk IN (SELECT rowid FROM fts WHERE col MATCH ...)' или None,
+             если индекс для колонки недоступен или строка короче MIN_QUERY_LENGTH.
+    """
+    table_name = model.__table__.name
+    if table_name not in tables or len(value) < MIN_QUERY_LENGTH:
+        return None
+
+    pk_name, columns = indexed_columns()[table_name]
+    col_name = col.property.columns[0].name
+    if col_name not in columns:
+        return None
+
+    fts = table(fts_table_name(table_name), column("rowid"), column(col_name))
+    # Строка поиска передаётся как фраза, чтобы спецсимволы не разбирались синтаксисом FTS5
+    phrase = '"' + value.replace('"', '""') + '"'
+    subquery = select(fts.c.rowid).where(fts.c[col_name].op("MATCH")(phrase))
+    return model.__table__.c[pk_name].in_(subquery)
+
+
+def install_fulltext(connection: Connection) -> List[str]:
+    """
+    Создать теневые таблицы FTS5 и триггеры синхронизации для текстовых колонок MODEL_FORMATS
+    и заполнить их текущими данными. Если SQLite собран без FTS5 или токенизатора trigram,
+    индексы не создаются и поиск продолжает работать через LIKE.
+
+    :param connection: Соединение с базой данных SQLite.
+    :return: Список таблиц моделей, для которых создан индекс.
+    """
+    installed = []
+    for table_name, (pk_name, columns) in indexed_columns().items():
+        fts_name = fts_table_name(table_name)
+        cols = ", ".join(columns)
+        new_cols = ", ".join(f"new.{c}" for c in columns)
+        old_cols = ", ".join(f"old.{c}" for c in columns)
+
+        try:
+            connection.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_name} USING fts5("
+                f"{cols}, content='{table_name}', content_rowid='{pk_name}', tokenize='trigram')"
+            ))
+        except OperationalError:
+            break
+
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{fts_name}_insert AFTER INSERT ON {table_name} BEGIN "
+            f"INSERT INTO {fts_name} (rowid, {cols}) VALUES (new.{pk_name}, {new_cols}); END;"
+        ))
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{fts_name}_delete AFTER DELETE ON {table_name} BEGIN "
+            f"INSERT INTO {fts_name} ({fts_name}, rowid, {cols}) VALUES ('delete', old.{pk_name}, {old_cols}); END;"
+        ))
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{fts_name}_update AFTER UPDATE ON {table_name} BEGIN "
+            f"INSERT INTO {fts_name} ({fts_name}, rowid, {cols}) VALUES ('delete', old.{pk_name}, {old_cols}); "
+            f"INSERT INTO {fts_name} (rowid, {cols}) VALUES (new.{pk_name}, {new_cols}); END;"
+        ))
+        connection.execute(text(f"INSERT INTO {fts_name} ({fts_name}) VALUES ('rebuild')"))
+        installed.append(table_name)
+
+    with _lock:
+        _available.pop(connection.engine, None)
+    return installed
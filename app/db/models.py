@@ -1,5 +1,5 @@
 from typing import Optional, List
-from sqlalchemy import Column, Integer, Text, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, Text, String, DateTime, Time, Boolean, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm.dynamic import AppenderQuery
 
@@ -23,7 +23,7 @@ class Chat(Base):
 
     id = Column(Integer, primary_key=True, nullable=False)
     email = Column(String, nullable=False, unique=True)
-    chat_type = Column(Integer, ForeignKey(ChatType.id, ondelete="CASCADE"), nullable=False)
+    chat_type = Column(Integer, ForeignKey(ChatType.id, ondelete="CASCADE"), nullable=False, index=True)
 
     # Связь с моделью типа чата
     chat_type_model: "ChatType" = relationship(
@@ -45,6 +45,11 @@ class Chat(Base):
         "NotificationSubscriber", back_populates="chat", cascade="all, delete", lazy="selectin"
     )
 
+    # Один к одному: Chat -> QuietHours
+    quiet_hours: Optional["QuietHours"] = relationship(
+        "QuietHours", uselist=False, back_populates="chat", cascade="all, delete"
+    )
+
 
 class User(Base):
     __tablename__ = "users"
@@ -83,7 +88,7 @@ class Administrator(Base):
 
     user_id = Column(Integer, ForeignKey(User.id, ondelete="CASCADE"), primary_key=True, nullable=False)
     granted_by = Column(String, nullable=False)
-    granted_at = Column(DateTime, nullable=False)
+    granted_at = Column(DateTime, nullable=False, index=True)
 
     # Связь с моделью пользователя
     user: "User" = relationship(
@@ -103,6 +108,11 @@ class NotificationType(Base):
         "NotificationSubscriber", back_populates="notification_type_model", cascade="all, delete", lazy="dynamic"
     )
 
+    # Один ко многим: NotificationType -> MaintenanceWindows
+    maintenance_windows: List["MaintenanceWindow"] = relationship(
+        "MaintenanceWindow", back_populates="notification_type_model", cascade="all, delete"
+    )
+
 
 class NotificationSubscriber(Base):
     __tablename__ = "notification_subscribers"
@@ -111,11 +121,13 @@ class NotificationSubscriber(Base):
     chat_id = Column(Integer, ForeignKey(Chat.id, ondelete="CASCADE"), nullable=False)
     notification_type = Column(Integer, ForeignKey(NotificationType.id, ondelete="CASCADE"), nullable=False)
     granted_by = Column(String, nullable=False)
-    granted_at = Column(DateTime, nullable=False)
+    granted_at = Column(DateTime, nullable=False, index=True)
 
-    # Добавляет уникальность сочетания двух полей
+    # Добавляет уникальность сочетания двух полей (индекс также обслуживает поиск подписок чата),
+    # индекс выборки подписчиков по типу уведомлений
     __table_args__ = (
         UniqueConstraint(chat_id, notification_type, name='uix_chat_notification_type'),
+        Index('ix_notification_subscribers_notification_type', notification_type, chat_id),
     )
 
     # Связи с моделями Chat и NotificationType
@@ -126,3 +138,69 @@ class NotificationSubscriber(Base):
     notification_type_model: "NotificationType" = relationship(
         "NotificationType", back_populates="subscribers", lazy="joined"
     )
+
+    # Один ко многим: NotificationSubscriber -> NotificationFilters
+    filters: List["NotificationFilter"] = relationship(
+        "NotificationFilter", back_populates="subscriber", cascade="all, delete"
+    )
+
+
+class NotificationFilter(Base):
+    __tablename__ = "notification_filters"
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    subscriber_id = Column(Integer, ForeignKey(NotificationSubscriber.id, ondelete="CASCADE"),
+                           nullable=False, index=True)
+    # Условия правила (событие подходит, если выполнены все заданные условия)
+    severity = Column(String, nullable=True)
+    host_group = Column(String, nullable=True)
+    host_pattern = Column(String, nullable=True)
+    tag_key = Column(String, nullable=True)
+    tag_value = Column(String, nullable=True)
+
+    # Связь с моделью подписчика уведомлений
+    subscriber: "NotificationSubscriber" = relationship(
+        "NotificationSubscriber", back_populates="filters", lazy="joined"
+    )
+
+
+class MaintenanceWindow(Base):
+    __tablename__ = "maintenance_windows"
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    notification_type = Column(Integer, ForeignKey(NotificationType.id, ondelete="CASCADE"), nullable=False)
+    name = Column(String, nullable=False)
+    # Границы окна [начало, конец) по Москве
+    starts_at = Column(DateTime, nullable=False)
+    ends_at = Column(DateTime, nullable=False, index=True)
+    # Условия отбора событий окна (без условий окно подавляет все события типа)
+    host_group = Column(String, nullable=True)
+    host_pattern = Column(String, nullable=True)
+    tag_key = Column(String, nullable=True)
+    tag_value = Column(String, nullable=True)
+    # Отправить сводку подавленных событий по окончании окна
+    rollup = Column(Boolean, nullable=False, default=False)
+    created_by = Column(String, nullable=False)
+
+    # Связь с моделью типа уведомлений
+    notification_type_model: "NotificationType" = relationship(
+        "NotificationType", back_populates="maintenance_windows", lazy="joined"
+    )
+
+
+class QuietHours(Base):
+    __tablename__ = "quiet_hours"
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    chat_id = Column(Integer, ForeignKey(Chat.id, ondelete="CASCADE"), nullable=False, unique=True)
+    # Время начала и окончания тихих часов в часовом поясе чата (может переходить через полночь)
+    starts_at = Column(Time, nullable=False)
+    ends_at = Column(Time, nullable=False)
+    timezone = Column(String, nullable=False, default="Europe/Moscow")
+    # Отправить сводку подавленных уведомлений по окончании тихих часов
+    rollup = Column(Boolean, nullable=False, default=False)
+
+    # Связь с моделью чата
+    chat: "Chat" = relationship(
+        "Chat", back_populates="quiet_hours", lazy="joined"
+    )
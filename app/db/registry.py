@@ -0,0 +1,75 @@
+"""
+Неизменяемый реестр метаданных ORM-моделей.
+
+Реестр строится один раз при импорте и связывает название таблицы с моделью,
+колонками, их типами и заранее подготовленными функциями доступа к полям,
+чтобы служебные функции не обходили Base.registry.mappers при каждом вызове.
+"""
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, NamedTuple, Optional, Tuple, Type
+from sqlalchemy import Column, inspect
+from .models import Base
+
+
+class TableInfo(NamedTuple):
+    # Название таблицы
+    name: str
+    # ORM-модель таблицы
+    model: Type
+    # Колонки таблицы в порядке объявления
+    columns: Tuple[Column, ...]
+    # Типы колонок: {название колонки: тип в виде строки}
+    column_types: Mapping[str, str]
+    # Функции получения значений полей записи: {атрибут модели: функция}
+    getters: Mapping[str, Callable[[Any], Any]]
+    # Атрибуты связей модели
+    relationships: Tuple[str, ...]
+
+
+def _build_table_info(model: Type) -> TableInfo:
+    """
+    Собрать метаданные таблицы модели.
+
+    :param model: ORM-модель.
+    :return: Метаданные таблицы.
+    """
+    mapper = inspect(model)
+    table = model.__table__
+    return TableInfo(
+        name=table.name,
+        model=model,
+        columns=tuple(table.columns),
+        column_types=MappingProxyType({col.name: str(col.type) for col in table.columns}),
+        getters=MappingProxyType({attr.key: attrgetter(attr.key) for attr in mapper.attrs}),
+        relationships=tuple(rel.key for rel in mapper.relationships),
+    )
+
+
+def _build_registry() -> Tuple[Mapping[str, TableInfo], Mapping[Type, TableInfo]]:
+    """
+    Построить реестр по всем моделям Base.
+
+    :return: Кортеж словарей (по названию таблицы, по модели).
+    """
+    by_table = {}
+    for mapper in Base.registry.mappers:
+        info = _build_table_info(mapper.class_)
+        by_table[info.name] = info
+
+    # Порядок таблиц совпадает с порядком метаданных
+    by_table = {name: by_table[name] for name in Base.metadata.tables if name in by_table}
+    return MappingProxyType(by_table), MappingProxyType({info.model: info for info in by_table.values()})
+
+
+TABLES, MODELS = _build_registry()
+
+
+def get_table_info(table_name: str) -> Optional[TableInfo]:
+    """
+    Получить метаданные таблицы по её названию.
+
+    :param table_name: Название таблицы.
+    :return: Метаданные таблицы или None, если модели с такой таблицей нет.
+    """
+    return TABLES.get(table_name)
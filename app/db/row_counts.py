@@ -0,0 +1,382 @@
+"""
+Кэш количества строк таблиц.
+
+Количество строк таблицы вычисляется один раз (через таблицу счётчиков,
+поддерживаемую триггерами SQLite, или SELECT count(*)), а затем поддерживается
+инкрементально: изменения, внесённые сессией, накапливаются в Session.info
+и применяются к кэшу только после успешной фиксации транзакции.
+
+Пока транзакция с изменениями таблицы фиксируется (от before_commit до after_commit), прочитанное
+другими потоками количество строк не сохраняется в кэш: оно может уже включать изменения транзакции,
+которые затем будут применены к кэшу повторно.
+"""
+import threading
+import weakref
+from typing import Dict, Iterable, Optional, Tuple, Type, Union
+from sqlalchemy import event, select, func, exists, text, Table
+from sqlalchemy.engine import Engine, Connection
+from sqlalchemy.orm import Session
+from .models import Base
+
+# Таблица счётчиков строк, поддерживаемая триггерами SQLite
+COUNTS_TABLE_NAME = "table_row_counts"
+
+# Ключ накопленных изменений количества строк в Session.info
+_PENDING_KEY = "row_count_deltas"
+
+# Ключ таблиц, отмеченных фиксируемыми, в Session.info
+_COMMITTING_KEY = "row_count_committing"
+
+_lock = threading.Lock()
+
+# Кэш по движкам: engine -> {название таблицы: количество строк}
+_counts: "weakref.WeakKeyDictionary[Engine, Dict[str, int]]" = weakref.WeakKeyDictionary()
+
+# Поколения изменений по движкам: engine -> {название таблицы: номер поколения}
+_generations: "weakref.WeakKeyDictionary[Engine, Dict[str, int]]" = weakref.WeakKeyDictionary()
+
+# Количество фиксируемых транзакций с изменениями таблиц по движкам: engine -> {название таблицы: количество}
+_committing: "weakref.WeakKeyDictionary[Engine, Dict[str, int]]" = weakref.WeakKeyDictionary()
+
+# Наличие таблицы счётчиков по движкам
+_has_counts_table: "weakref.WeakKeyDictionary[Engine, bool]" = weakref.WeakKeyDictionary()
+
+
+def _table_name(model: Union[Type, str]) -> str:
+    """
+    Получить название таблицы модели.
+
+    :param model: ORM-модель или название таблицы.
+    :return: Название таблицы.
+    """
+    if isinstance(model, str):
+        return model
+    if hasattr(model, "__table__"):
+        return model.__table__.name
+    raise TypeError(f"❌ {model} is not a valid SQLAlchemy model class")
+
+
+def _table(model: Union[Type, str]) -> Table:
+    """
+    Получить объект таблицы модели.
+
+    :param model: ORM-модель или название таблицы.
+    :return: Объект Table.
+    """
+    if isinstance(model, str):
+        return Base.metadata.tables[model]
+    return model.__table__
+
+
+def _engine(session: Session) -> Engine:
+    """
+    Получить движок, к которому привязана сессия.
+
+    :param session: Текущая сессия.
+    :return: Объект Engine.
+    """
+    bind = session.get_bind()
+    return bind.engine if isinstance(bind, Connection) else bind
+
+
+def _pending(session: Session) -> Dict[str, int]:
+    """
+    Получить изменения количества строк, не зафиксированные сессией.
+
+    :param session: Текущая сессия.
+    :return: Словарь {название таблицы: изменение}.
+    """
+    return session.info.setdefault(_PENDING_KEY, {})
+
+
+def add_pending(session: Session, model: Union[Type, str], delta: int) -> None:
+    """
+    Учесть изменение количества строк таблицы, выполненное в обход ORM
+    (пакетные INSERT/DELETE). Применяется к кэшу после фиксации транзакции.
+
+    :param session: Текущая сессия.
+    :param model: ORM-модель или название таблицы.
+    :param delta: Изменение количества строк.
+    """
+    if delta:
+        pending = _pending(session)
+        table = _table_name(model)
+        pending[table] = pending.get(table, 0) + delta
+
+
+def invalidate(session_or_engine: Union[Session, Engine], model: Optional[Union[Type, str]] = None) -> None:
+    """
+    Сбросить кэш количества строк таблицы (или всех таблиц) движка.
+    Следующий запрос количества пересчитает значение.
+
+    :param session_or_engine: Сессия или движок.
+    :param model: ORM-модель или название таблицы, если None — все таблицы.
+    """
+    engine = _engine(session_or_engine) if isinstance(session_or_engine, Session) else session_or_engine
+    with _lock:
+        counts = _counts.get(engine)
+        generations = _generations.setdefault(engine, {})
+        tables = list(counts or ()) if model is None else [_table_name(model)]
+        for table in tables:
+            if counts is not None:
+                counts.pop(table, None)
+            generations[table] = generations.get(table, 0) + 1
+        if model is None:
+            _has_counts_table.pop(engine, None)
+
+
+def _counts_table_exists(session: Session, engine: Engine) -> bool:
+    """
+    Проверить (однократно для движка) наличие таблицы счётчиков.
+
+    :param session: Текущая сессия.
+    :param engine: Движок сессии.
+    :return: True, если таблица счётчиков существует.
+    """
+    found = _has_counts_table.get(engine)
+    if found is None:
+        found = session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": COUNTS_TABLE_NAME}
+        ).first() is not None
+        _has_counts_table[engine] = found
+    return found
+
+
+def _read_count(session: Session, engine: Engine, model: Union[Type, str]) -> int:
+    """
+    Прочитать количество строк таблицы из таблицы счётчиков, либо посчитать его.
+
+    :param session: Текущая сессия.
+    :param engine: Движок сессии.
+    :param model: ORM-модель или название таблицы.
+    :return: Количество строк (с учётом незафиксированных изменений сессии).
+    """
+    table = _table_name(model)
+    if engine.dialect.name == "sqlite" and _counts_table_exists(session, engine):
+        value = session.execute(
+            text(f"SELECT row_count FROM {COUNTS_TABLE_NAME} WHERE table_name = :name"),
+            {"name": table}
+        ).scalar()
+        if value is not None:
+            return value
+
+    return session.execute(select(func.count()).select_from(_table(model))).scalar_one()
+
+
+def count(session: Session, model: Union[Type, str]) -> int:
+    """
+    Получить количество строк таблицы из кэша (с учётом незафиксированных изменений сессии).
+
+    :param session: Текущая сессия.
+    :param model: ORM-модель или название таблицы.
+    :return: Количество строк.
+    """
+    table = _table_name(model)
+    engine = _engine(session)
+    # Изменения, уже сброшенные в базу (flush), видны запросам этой сессии
+    session.flush()
+    delta = _pending(session).get(table, 0)
+
+    with _lock:
+        cached = _counts.get(engine, {}).get(table)
+        generation = _generations.get(engine, {}).get(table, 0)
+
+    if cached is not None:
+        return cached + delta
+
+    actual = _read_count(session, engine, model)
+    with _lock:
+        # Не сохраняем значение, если за время подсчёта другая транзакция изменила таблицу
+        # или фиксирует изменения таблицы в данный момент
+        if _generations.get(engine, {}).get(table, 0) == generation and not _committing.get(engine, {}).get(table):
+            _counts.setdefault(engine, {})[table] = actual - delta
+    return actual
+
+
+def exists_any(session: Session, model: Union[Type, str]) -> bool:
+    """
+    Проверить, есть ли в таблице хотя бы одна строка.
+    Если количество строк в кэше, запрос к базе не выполняется,
+    иначе выполняется EXISTS, который останавливается на первой строке.
+
+    :param session: Текущая сессия.
+    :param model: ORM-модель или название таблицы.
+    :return: True, если таблица не пустая.
+    """
+    table = _table_name(model)
+    engine = _engine(session)
+    session.flush()
+
+    with _lock:
+        cached = _counts.get(engine, {}).get(table)
+
+    if cached is not None:
+        return cached + _pending(session).get(table, 0) > 0
+
+    return session.execute(select(exists().select_from(_table(model)))).scalar()
+
+
+def verify(session: Session, models: Optional[Iterable[Union[Type, str]]] = None) -> Dict[str, Tuple[int, int]]:
+    """
+    Проверить согласованность кэша (и таблицы счётчиков) с фактическим количеством строк.
+    Найденные расхождения исправляются.
+
+    :param session: Текущая сессия.
+    :param models: ORM-модели или названия таблиц, если None — все таблицы из кэша.
+    :return: Словарь расхождений {название таблицы: (ожидаемое количество, фактическое количество)}.
+    """
+    engine = _engine(session)
+    session.flush()
+    pending = _pending(session)
+    has_counts_table = engine.dialect.name == "sqlite" and _counts_table_exists(session, engine)
+
+    with _lock:
+        cached_counts = dict(_counts.get(engine, {}))
+
+    models = list(cached_counts) if models is None else list(models)
+    mismatches = {}
+    for model in models:
+        table = _table_name(model)
+        actual = session.execute(select(func.count()).select_from(_table(model))).scalar_one()
+        expected = cached_counts.get(table)
+        if has_counts_table:
+            stored = session.execute(
+                text(f"SELECT row_count FROM {COUNTS_TABLE_NAME} WHERE table_name = :name"),
+                {"name": table}
+            ).scalar()
+            if stored is not None and stored != actual:
+                mismatches[table] = (stored, actual)
+                session.execute(
+                    text(f"UPDATE {COUNTS_TABLE_NAME} SET row_count = :count WHERE table_name = :name"),
+                    {"count": actual, "name": table}
+                )
+
+        if expected is not None and expected + pending.get(table, 0) != actual:
+            mismatches[table] = (expected + pending.get(table, 0), actual)
+            with _lock:
+                _counts.setdefault(engine, {})[table] = actual - pending.get(table, 0)
+                generations = _generations.setdefault(engine, {})
+                generations[table] = generations.get(table, 0) + 1
+
+    return mismatches
+
+
+def install_count_triggers(connection: Connection, tables: Optional[Iterable[str]] = None) -> None:
+    """
+    Создать в SQLite таблицу счётчиков строк и триггеры, поддерживающие её при INSERT/DELETE.
+    Используется для баз, созданных без миграций (например, через metadata.create_all).
+
+    :param connection: Соединение с базой данных.
+    :param tables: Названия таблиц, если None — все таблицы моделей.
+    """
+    tables = list(Base.metadata.tables) if tables is None else list(tables)
+
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {COUNTS_TABLE_NAME} ("
+        "table_name VARCHAR PRIMARY KEY NOT NULL, row_count INTEGER NOT NULL)"
+    ))
+    for table in tables:
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_row_count_insert AFTER INSERT ON {table} "
+            f"BEGIN UPDATE {COUNTS_TABLE_NAME} SET row_count = row_count + 1 WHERE table_name = '{table}'; END;"
+        ))
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_row_count_delete AFTER DELETE ON {table} "
+            f"BEGIN UPDATE {COUNTS_TABLE_NAME} SET row_count = row_count - 1 WHERE table_name = '{table}'; END;"
+        ))
+        connection.execute(text(
+            f"INSERT OR REPLACE INTO {COUNTS_TABLE_NAME} (table_name, row_count) "
+            f"SELECT '{table}', count(*) FROM {table}"
+        ))
+
+    invalidate(connection.engine)
+
+
+# -------------------- Обработчики событий сессии --------------------
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_rows(session: Session, _flush_context):
+    """
+    Учесть строки, добавленные и удалённые ORM при сбросе изменений.
+    """
+    for instance in session.new:
+        table = getattr(type(instance), "__table__", None)
+        if table is not None:
+            add_pending(session, table.name, 1)
+    for instance in session.deleted:
+        table = getattr(type(instance), "__table__", None)
+        if table is not None:
+            add_pending(session, table.name, -1)
+
+
+def _release_committing(session: Session, engine: Engine) -> None:
+    """
+    Снять отметку фиксации с таблиц сессии.
+    """
+    tables = session.info.pop(_COMMITTING_KEY, None)
+    if not tables:
+        return
+    committing = _committing.setdefault(engine, {})
+    for table in tables:
+        left = committing.get(table, 0) - 1
+        if left > 0:
+            committing[table] = left
+        else:
+            committing.pop(table, None)
+
+
+@event.listens_for(Session, "before_commit")
+def _mark_committing(session: Session):
+    """
+    Отметить таблицы с изменениями фиксируемой транзакции до фиксации в базе данных.
+    """
+    if session.in_nested_transaction():
+        return
+
+    # Изменения ORM, ещё не сброшенные в базу, учитываются при сбросе
+    session.flush()
+    pending = session.info.get(_PENDING_KEY)
+    if not pending or _COMMITTING_KEY in session.info:
+        return
+
+    engine = _engine(session)
+    with _lock:
+        committing = _committing.setdefault(engine, {})
+        generations = _generations.setdefault(engine, {})
+        for table in pending:
+            committing[table] = committing.get(table, 0) + 1
+            generations[table] = generations.get(table, 0) + 1
+    session.info[_COMMITTING_KEY] = list(pending)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session):
+    """
+    Применить к кэшу изменения зафиксированной транзакции.
+    """
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending and _COMMITTING_KEY not in session.info:
+        return
+
+    engine = _engine(session)
+    with _lock:
+        counts = _counts.setdefault(engine, {})
+        generations = _generations.setdefault(engine, {})
+        for table, delta in (pending or {}).items():
+            if table in counts:
+                counts[table] += delta
+            generations[table] = generations.get(table, 0) + 1
+        _release_committing(session, engine)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session):
+    """
+    Отбросить изменения отменённой транзакции.
+    """
+    session.info.pop(_PENDING_KEY, None)
+    if _COMMITTING_KEY in session.info:
+        with _lock:
+            _release_committing(session, _engine(session))
@@ -0,0 +1,471 @@
+"""
+Подавление уведомлений: окна обслуживания и тихие часы чатов.
+
+Окна обслуживания (таблица maintenance_windows) каждого типа уведомлений собираются в интервальный
+индекс: границы окон сортируются, и для каждого отрезка между соседними границами заранее вычисляется
+набор действующих окон. Поиск окон, действующих в момент события, — бинарный поиск по границам
+(O(log n)) и проверка условий только найденных окон. Тихие часы (таблица quiet_hours) задаются
+временем суток в часовом поясе чата.
+
+Подавленные события считаются. Для окон и тихих часов со сводкой подавленные события накапливаются
+и выдаются одной сводкой по окончании окна (см. pop_due_rollups). Время окон хранится по Москве,
+как и остальные даты приложения. Индекс сбрасывается после фиксации транзакции,
+изменившей окна или тихие часы.
+"""
+import threading
+import weakref
+from bisect import bisect_right
+from datetime import datetime, time, tzinfo
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from sqlalchemy.engine import Engine, Connection
+from app.utils import date_and_time
+from .models import MaintenanceWindow, QuietHours, NotificationSubscriber, NotificationType
+from .filter_index import FilterRule, EventAttributes, event_attributes, make_rule, rule_matches
+
+# Часовой пояс дат приложения
+TIMEZONE = "Europe/Moscow"
+
+# Причины подавления
+REASON_MAINTENANCE = "maintenance"
+REASON_QUIET_HOURS = "quiet_hours"
+
+# Максимальное количество хостов, перечисляемых в сводке
+ROLLUP_MAX_HOSTS = 10
+
+# Признак изменения окон или тихих часов в Session.info
+_CHANGED_KEY = "suppression_changed"
+
+_lock = threading.Lock()
+
+# Индексы по движкам
+_indexes: "weakref.WeakKeyDictionary[Engine, SuppressionIndex]" = weakref.WeakKeyDictionary()
+
+# Поколения изменений окон и тихих часов по движкам
+_generations: "weakref.WeakKeyDictionary[Engine, int]" = weakref.WeakKeyDictionary()
+
+_stats_lock = threading.Lock()
+
+# Количество подавленных уведомлений (событие × чат) по причинам
+_suppressed: Dict[str, int] = {REASON_MAINTENANCE: 0, REASON_QUIET_HOURS: 0}
+
+# Накапливаемые сводки: {(причина, ID окна или чата, окончание): сводка}
+_rollups: Dict[Tuple[str, int, datetime], "Rollup"] = {}
+
+
+class WindowRule(NamedTuple):
+    # ID окна обслуживания
+    id: int
+    name: str
+    # Границы окна [начало, конец) по Москве
+    starts_at: datetime
+    ends_at: datetime
+    # Условия отбора событий окна
+    conditions: FilterRule
+    rollup: bool
+
+
+class QuietRule(NamedTuple):
+    # ID чата
+    chat_id: int
+    # Тихие часы [начало, конец) в часовом поясе чата
+    starts_at: time
+    ends_at: time
+    timezone: tzinfo
+    rollup: bool
+
+
+class Recipient(NamedTuple):
+    # ID чата
+    chat_id: int
+    # Email чата
+    email: str
+
+
+class IntervalIndex:
+    """
+    Интервальный индекс окон обслуживания: отсортированные границы окон
+    и наборы окон, действующих на каждом отрезке между соседними границами.
+    """
+
+    def __init__(self, windows: Iterable[WindowRule]):
+        """
+        :param windows: Окна обслуживания.
+        """
+        starts: Dict[datetime, List[WindowRule]] = {}
+        ends: Dict[datetime, List[WindowRule]] = {}
+        for window in windows:
+            if window.starts_at < window.ends_at:
+                starts.setdefault(window.starts_at, []).append(window)
+                ends.setdefault(window.ends_at, []).append(window)
+
+        self.boundaries: List[datetime] = sorted(set(starts).union(ends))
+        # Окна, действующие на отрезке [boundaries[i], boundaries[i + 1])
+        self.segments: List[Tuple[WindowRule, ...]] = []
+
+        active: Dict[int, WindowRule] = {}
+        for boundary in self.boundaries:
+            for window in ends.get(boundary, ()):
+                active.pop(window.id, None)
+            for window in starts.get(boundary, ()):
+                active[window.id] = window
+            self.segments.append(tuple(active.values()))
+
+    def at(self, moment: datetime) -> Tuple[WindowRule, ...]:
+        """
+        Получить окна, действующие в заданный момент.
+
+        :param moment: Момент времени по Москве (без часового пояса).
+        :return: Действующие окна.
+        """
+        position = bisect_right(self.boundaries, moment) - 1
+        return self.segments[position] if position >= 0 else ()
+
+
+class SuppressionIndex(NamedTuple):
+    # Интервальные индексы окон по ID типа уведомлений
+    windows: Dict[int, IntervalIndex]
+    # Тихие часы по ID чата
+    quiet_hours: Dict[int, QuietRule]
+
+
+class Rollup:
+    """
+    Сводка уведомлений, подавленных окном обслуживания или тихими часами чата.
+    """
+
+    def __init__(self, reason: str, title: str, due_at: datetime):
+        """
+        :param reason: Причина подавления.
+        :param title: Название окна обслуживания (для тихих часов — пустая строка).
+        :param due_at: Момент отправки сводки по Москве (без часового пояса).
+        """
+        self.reason = reason
+        self.title = title
+        self.due_at = due_at
+        # Количество подавленных событий
+        self.count = 0
+        # Количество событий по важности
+        self.severities: Dict[str, int] = {}
+        # Хосты событий (не более ROLLUP_MAX_HOSTS) и количество неперечисленных хостов
+        self.hosts: List[str] = []
+        self.more_hosts = 0
+        # Email чатов, которые получат сводку
+        self.recipients: Set[str] = set()
+
+    def add(self, attrs: EventAttributes, recipients: Iterable[str]) -> None:
+        """
+        Учесть подавленное событие.
+
+        :param attrs: Атрибуты события.
+        :param recipients: Email чатов, которым не было отправлено событие.
+        """
+        self.count += 1
+        severity = attrs.severity or "-"
+        self.severities[severity] = self.severities.get(severity, 0) + 1
+        if attrs.host is not None and attrs.host not in self.hosts:
+            if len(self.hosts) < ROLLUP_MAX_HOSTS:
+                self.hosts.append(attrs.host)
+            else:
+                self.more_hosts += 1
+        self.recipients.update(recipients)
+
+
+def _engine(session: Session) -> Engine:
+    """
+    Получить движок, к которому привязана сессия.
+    """
+    bind = session.get_bind()
+    return bind.engine if isinstance(bind, Connection) else bind
+
+
+def _window_rule(record: MaintenanceWindow) -> WindowRule:
+    """
+    Скомпилировать запись окна обслуживания.
+    """
+    return WindowRule(
+        id=record.id,
+        name=record.name,
+        starts_at=record.starts_at,
+        ends_at=record.ends_at,
+        conditions=make_rule(
+            record.id,
+            host_group=record.host_group,
+            host_pattern=record.host_pattern,
+            tag_key=record.tag_key,
+            tag_value=record.tag_value,
+        ),
+        rollup=bool(record.rollup),
+    )
+
+
+def _quiet_rule(record: QuietHours) -> QuietRule:
+    """
+    Скомпилировать запись тихих часов.
+    """
+    return QuietRule(
+        chat_id=record.chat_id,
+        starts_at=record.starts_at,
+        ends_at=record.ends_at,
+        timezone=date_and_time.get_timezone(record.timezone),
+        rollup=bool(record.rollup),
+    )
+
+
+def current_time() -> datetime:
+    """
+    Получить текущее время по Москве (с часовым поясом).
+
+    :return: Текущее время.
+    """
+    return date_and_time.get_current_date_moscow()
+
+
+def _aware(now: Optional[datetime]) -> datetime:
+    """
+    Привести момент времени к дате с часовым поясом (дата без пояса считается московской).
+    """
+    if now is None:
+        return current_time()
+    if now.tzinfo is None:
+        return date_and_time.get_timezone(TIMEZONE).localize(now)
+    return now
+
+
+def _local(now: datetime) -> datetime:
+    """
+    Перевести момент времени в московское время без часового пояса (как хранятся окна).
+    """
+    return now.astimezone(date_and_time.get_timezone(TIMEZONE)).replace(tzinfo=None)
+
+
+def _matching_windows(index: "SuppressionIndex", notification_type_id: int, attrs: EventAttributes,
+                      now: datetime) -> List[WindowRule]:
+    """
+    Найти в индексе действующие окна типа уведомлений, подходящие под атрибуты события.
+    """
+    windows = index.windows.get(notification_type_id)
+    if windows is None:
+        return []
+    return [window for window in windows.at(_local(now)) if rule_matches(window.conditions, attrs)]
+
+
+def get_index(session: Session) -> SuppressionIndex:
+    """
+    Получить (собрать при первом обращении) индекс окон обслуживания и тихих часов.
+    В индекс попадают окна, не закончившиеся к моменту сборки.
+
+    :param session: Текущая сессия.
+    :return: Индекс подавления.
+    """
+    engine = _engine(session)
+    with _lock:
+        index = _indexes.get(engine)
+        generation = _generations.get(engine, 0)
+    if index is not None:
+        return index
+
+    now = _local(current_time())
+    windows: Dict[int, List[WindowRule]] = {}
+    for record in session.execute(select(MaintenanceWindow).where(MaintenanceWindow.ends_at > now)).scalars():
+        windows.setdefault(record.notification_type, []).append(_window_rule(record))
+
+    index = SuppressionIndex(
+        windows={type_id: IntervalIndex(rules) for type_id, rules in windows.items()},
+        quiet_hours={
+            record.chat_id: _quiet_rule(record)
+            for record in session.execute(select(QuietHours)).scalars()
+        },
+    )
+
+    with _lock:
+        # Не сохраняем индекс, если за время сборки другая транзакция изменила окна
+        if _generations.get(engine, 0) == generation:
+            _indexes[engine] = index
+    return index
+
+
+def active_windows(session: Session, notification_type: NotificationType, data: Any = None,
+                   now: Optional[datetime] = None) -> List[WindowRule]:
+    """
+    Найти окна обслуживания типа уведомлений, действующие в заданный момент и подходящие под событие.
+
+    :param session: Текущая сессия.
+    :param notification_type: Тип уведомлений.
+    :param data: Данные события (None — только окна без условий).
+    :param now: Момент времени (None — текущее время).
+    :return: Список окон.
+    """
+    return _matching_windows(get_index(session), notification_type.id, event_attributes(data), _aware(now))
+
+
+def _record(key: Tuple[str, int, datetime], title: str, attrs: EventAttributes, recipients: List[str]) -> None:
+    """
+    Учесть подавленное событие в сводке (вызывается под _stats_lock).
+    """
+    rollup = _rollups.get(key)
+    if rollup is None:
+        rollup = _rollups[key] = Rollup(key[0], title, key[2])
+    rollup.add(attrs, recipients)
+
+
+def select_subscribers(session: Session, notification_type: NotificationType,
+                       subscribers: Iterable[NotificationSubscriber], data: Any = None,
+                       now: Optional[datetime] = None) -> List[NotificationSubscriber]:
+    """
+    Отобрать подписчиков, уведомление которым не подавлено окном обслуживания или тихими часами.
+    Подавленные уведомления учитываются в счётчиках и сводках.
+
+    :param session: Текущая сессия.
+    :param notification_type: Тип уведомлений.
+    :param subscribers: Подписчики, которым предназначено уведомление.
+    :param data: Данные события.
+    :param now: Момент события (None — текущее время).
+    :return: Список подписчиков, которым нужно отправить уведомление.
+    """
+    subscribers = list(subscribers)
+    if not subscribers:
+        return subscribers
+
+    recipients = [Recipient(subscriber.chat_id, subscriber.chat.email) for subscriber in subscribers]
+    selected = {
+        recipient.chat_id
+        for recipient in select_recipients(session, notification_type.id, recipients, data, now)
+    }
+    return [subscriber for subscriber in subscribers if subscriber.chat_id in selected]
+
+
+def select_recipients(session: Session, notification_type_id: int, recipients: Iterable[Recipient],
+                      data: Any = None, now: Optional[datetime] = None) -> List[Recipient]:
+    """
+    Отобрать получателей, уведомление которым не подавлено окном обслуживания или тихими часами.
+    В отличие от select_subscribers, не требует объектов подписчиков, поэтому подходит для
+    заранее полученного (кэшированного) списка. Подавленные уведомления учитываются в счётчиках и сводках.
+
+    :param session: Текущая сессия.
+    :param notification_type_id: ID типа уведомлений.
+    :param recipients: Получатели, которым предназначено уведомление.
+    :param data: Данные события.
+    :param now: Момент события (None — текущее время).
+    :return: Список получателей, которым нужно отправить уведомление.
+    """
+    recipients = list(recipients)
+    if not recipients:
+        return recipients
+
+    now = _aware(now)
+    index = get_index(session)
+    attrs = event_attributes(data)
+    windows = _matching_windows(index, notification_type_id, attrs, now)
+    if windows:
+        emails = [recipient.email for recipient in recipients]
+        with _stats_lock:
+            _suppressed[REASON_MAINTENANCE] += len(recipients)
+            for window in windows:
+                if window.rollup:
+                    _record((REASON_MAINTENANCE, window.id, window.ends_at), window.name, attrs, emails)
+        return []
+
+    if not index.quiet_hours:
+        return recipients
+
+    result = []
+    quiet = []
+    for recipient in recipients:
+        rule = index.quiet_hours.get(recipient.chat_id)
+        if rule is None:
+            result.append(recipient)
+            continue
+        local = now.astimezone(rule.timezone)
+        if date_and_time.is_time_in_range(local.time(), rule.starts_at, rule.ends_at):
+            quiet.append((recipient, rule))
+        else:
+            result.append(recipient)
+
+    if quiet:
+        with _stats_lock:
+            _suppressed[REASON_QUIET_HOURS] += len(quiet)
+            for recipient, rule in quiet:
+                if rule.rollup:
+                    due_at = _local(date_and_time.next_time_of_day(now, rule.ends_at, rule.timezone))
+                    _record((REASON_QUIET_HOURS, rule.chat_id, due_at), "", attrs, [recipient.email])
+
+    return result
+
+
+def suppressed_counts() -> Dict[str, int]:
+    """
+    Получить количество подавленных уведомлений по причинам.
+
+    :return: Словарь {причина: количество}.
+    """
+    with _stats_lock:
+        return dict(_suppressed)
+
+
+def pop_due_rollups(now: Optional[datetime] = None) -> List[Rollup]:
+    """
+    Извлечь сводки, окно которых закончилось.
+
+    :param now: Текущий момент (None — текущее время).
+    :return: Список сводок в порядке окончания окон.
+    """
+    moment = _local(_aware(now))
+    with _stats_lock:
+        due = [key for key in _rollups if key[2] <= moment]
+        rollups = [_rollups.pop(key) for key in sorted(due, key=lambda key: key[2])]
+    return rollups
+
+
+def mark_changed(session: Session) -> None:
+    """
+    Отметить изменение окон или тихих часов, выполненное в обход ORM (пакетные запросы).
+    Индекс сбрасывается после фиксации транзакции.
+
+    :param session: Текущая сессия.
+    """
+    session.info[_CHANGED_KEY] = True
+
+
+def invalidate(session_or_engine) -> None:
+    """
+    Сбросить индекс подавления движка.
+
+    :param session_or_engine: Сессия или движок.
+    """
+    engine = _engine(session_or_engine) if isinstance(session_or_engine, Session) else session_or_engine
+    with _lock:
+        _indexes.pop(engine, None)
+        _generations[engine] = _generations.get(engine, 0) + 1
+
+
+# -------------------- Обработчики событий сессии --------------------
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, _flush_context):
+    """
+    Отметить сессию, если сброшенные изменения затрагивают окна обслуживания или тихие часы.
+    """
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (MaintenanceWindow, QuietHours)):
+            session.info[_CHANGED_KEY] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session: Session):
+    """
+    Сбросить индекс после фиксации транзакции, изменившей окна или тихие часы.
+    """
+    if session.info.pop(_CHANGED_KEY, False):
+        invalidate(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session):
+    """
+    Отбросить отметку изменений отменённой транзакции.
+    """
+    session.info.pop(_CHANGED_KEY, None)
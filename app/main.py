@@ -1,5 +1,5 @@
 from app.core import bot_setup, logging_setup
-from app import api
+from app import api, bot_handlers
 
 # --- Enable logging
 logging_setup.enable_logging("ERROR")
@@ -18,6 +18,9 @@ def main():
     # --- Admin commands -----
     bot_setup.add_admin_commands_to_bot(app)
 
+    # --- Background notifications ---
+    bot_handlers.start_background_notifications(app)
+
     app.start_polling()
     app.idle()
 
@@ -1,7 +1,21 @@
-from typing import Optional, Union
-from datetime import datetime
+from typing import Optional, Union, Tuple
+from datetime import datetime, timedelta, time, tzinfo
 from dateutil import parser
+from dateutil.relativedelta import relativedelta
 import pytz
+import re
+
+
+# Дата с точностью до года, месяца, дня, часа, минуты или секунды:
+# 'YYYY[-MM[-DD]]' или '[[DD.]MM.]YYYY', далее необязательно '[ T]HH[:MM[:SS]]'
+_DATETIME_PREFIX_PATTERNS = (
+    re.compile(r"^(?P<year>\d{4})(?:-(?P<month>\d{1,2})(?:-(?P<day>\d{1,2}))?)?"),
+    re.compile(r"^(?:(?:(?P<day>\d{1,2})\.)?(?P<month>\d{1,2})\.)?(?P<year>\d{4})"),
+)
+_TIME_PATTERN = re.compile(r"^(?:[ T](?P<hour>\d{1,2})(?::(?P<minute>\d{1,2})(?::(?P<second>\d{1,2}))?)?)?$")
+
+# Время суток 'HH:MM'
+_TIME_OF_DAY_PATTERN = re.compile(r"^(?P<hour>\d{1,2}):(?P<minute>\d{2})$")
 
 
 def get_current_date_moscow() -> datetime:
@@ -93,3 +107,113 @@ def format_datetime(
 
     # 3. Форматируем
     return dt_obj.strftime(fmt)
+
+
+def parse_datetime_range(value: str) -> Tuple[datetime, datetime]:
+    """
+    Преобразовать строку даты/времени в полуоткрытый интервал [начало, конец)
+    с точностью, заданной самой строкой:
+    '2024' - год, '2024-05' / '05.2024' - месяц, '2024-05-17' / '17.05.2024' - день,
+    '2024-05-17 10' - час, '2024-05-17 10:30' - минута, '2024-05-17 10:30:15' - секунда.
+    Строки другого формата разбираются dateutil с точностью до дня.
+
+    :param value: Строка даты/времени.
+    :return: Кортеж (начало интервала включительно, конец интервала не включительно).
+    :raises ValueError: Строка не может быть распознана как дата.
+    """
+    value = value.strip()
+    for pattern in _DATETIME_PREFIX_PATTERNS:
+        date_match = pattern.match(value)
+        if date_match is None:
+            continue
+        time_match = _TIME_PATTERN.match(value[date_match.end():])
+        if time_match is None:
+            continue
+
+        parts = {k: int(v) for k, v in date_match.groupdict().items() if v is not None}
+        parts.update({k: int(v) for k, v in time_match.groupdict().items() if v is not None})
+        # Пропущенные промежуточные компоненты (например, день без месяца) недопустимы
+        if ("day" in parts and "month" not in parts) or ("hour" in parts and "day" not in parts):
+            continue
+
+        # Шаг интервала определяется последним заданным компонентом
+        steps = (
+            ("second", relativedelta(seconds=1)), ("minute", relativedelta(minutes=1)),
+            ("hour", relativedelta(hours=1)), ("day", relativedelta(days=1)),
+            ("month", relativedelta(months=1)), ("year", relativedelta(years=1)),
+        )
+        step = next(delta for key, delta in steps if key in parts)
+
+        start = datetime(
+            parts["year"], parts.get("month", 1), parts.get("day", 1),
+            parts.get("hour", 0), parts.get("minute", 0), parts.get("second", 0)
+        )
+        return start, start + step
+
+    try:
+        day = parser.parse(value).replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    except (ValueError, OverflowError) as e:
+        raise ValueError(f"Cannot parse datetime string: {value}") from e
+    return day, day + timedelta(days=1)
+
+
+def get_timezone(tz: str) -> tzinfo:
+    """
+    Получить часовой пояс по названию.
+
+    :param tz: Название часового пояса (pytz timezone name).
+    :return: Часовой пояс.
+    :raises ValueError: Неизвестный часовой пояс.
+    """
+    try:
+        return pytz.timezone(tz)
+    except pytz.UnknownTimeZoneError as e:
+        raise ValueError(f"Unknown timezone: {tz}") from e
+
+
+def parse_time_of_day(value: str) -> time:
+    """
+    Преобразовать строку 'HH:MM' во время суток.
+
+    :param value: Строка времени.
+    :return: Время суток.
+    :raises ValueError: Строка не является временем суток.
+    """
+    match = _TIME_OF_DAY_PATTERN.match(value.strip())
+    if match is None:
+        raise ValueError(f"Cannot parse time of day: {value}")
+    hour, minute = int(match.group("hour")), int(match.group("minute"))
+    if hour > 23 or minute > 59:
+        raise ValueError(f"Cannot parse time of day: {value}")
+    return time(hour, minute)
+
+
+def is_time_in_range(moment: time, start: time, end: time) -> bool:
+    """
+    Проверить, попадает ли время суток в полуоткрытый интервал [начало, конец).
+    Интервал, у которого конец не позже начала, переходит через полночь ('22:00'-'08:00').
+
+    :param moment: Проверяемое время суток.
+    :param start: Начало интервала.
+    :param end: Конец интервала.
+    :return: True, если время попадает в интервал.
+    """
+    if start < end:
+        return start <= moment < end
+    return moment >= start or moment < end
+
+
+def next_time_of_day(now: datetime, moment: time, tz: tzinfo) -> datetime:
+    """
+    Получить ближайший после заданной даты момент с указанным временем суток в часовом поясе.
+
+    :param now: Текущая дата (с часовым поясом).
+    :param moment: Время суток.
+    :param tz: Часовой пояс времени суток (pytz).
+    :return: Дата с часовым поясом tz.
+    """
+    local = now.astimezone(tz).replace(tzinfo=None)
+    candidate = datetime.combine(local.date(), moment)
+    if candidate <= local:
+        candidate += timedelta(days=1)
+    return tz.localize(candidate)
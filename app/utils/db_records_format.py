@@ -1,5 +1,8 @@
-from typing import Iterable, List, Optional, Union, Tuple, Type
-from datetime import datetime, date
+import threading
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Union, Tuple, Type, Mapping
+from types import MappingProxyType
+from datetime import datetime, date, time
 from sqlalchemy.ext.declarative import DeclarativeMeta
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm.attributes import InstrumentedAttribute
@@ -65,19 +68,227 @@ MODEL_FORMATS: List[ModelFormatConfig] = [
         ],
         20
     ),
+    (
+        db.NotificationFilter,
+        [
+            db.NotificationFilter.id,
+            (db.NotificationFilter.subscriber, [
+                (db.NotificationSubscriber.chat, [db.Chat.email]),
+                (db.NotificationSubscriber.notification_type_model, [db.NotificationType.type])
+            ]),
+            db.NotificationFilter.severity,
+            db.NotificationFilter.host_group,
+            db.NotificationFilter.host_pattern,
+            db.NotificationFilter.tag_key,
+            db.NotificationFilter.tag_value
+        ],
+        20
+    ),
+    (
+        db.MaintenanceWindow,
+        [
+            db.MaintenanceWindow.id,
+            (db.MaintenanceWindow.notification_type_model, [db.NotificationType.type]),
+            db.MaintenanceWindow.name,
+            db.MaintenanceWindow.starts_at,
+            db.MaintenanceWindow.ends_at,
+            db.MaintenanceWindow.host_group,
+            db.MaintenanceWindow.host_pattern,
+            db.MaintenanceWindow.tag_key,
+            db.MaintenanceWindow.tag_value,
+            db.MaintenanceWindow.rollup
+        ],
+        20
+    ),
+    (
+        db.QuietHours,
+        [
+            db.QuietHours.id,
+            (db.QuietHours.chat, [db.Chat.email]),
+            db.QuietHours.starts_at,
+            db.QuietHours.ends_at,
+            db.QuietHours.timezone,
+            db.QuietHours.rollup
+        ],
+        20
+    ),
 ]
 
 
+# Конфигурации моделей по названию таблицы (строится один раз при импорте)
+MODEL_FORMATS_BY_TABLE: Mapping[str, ModelFormatConfig] = MappingProxyType({
+    conf[0].__tablename__: conf for conf in MODEL_FORMATS
+})
+
+
 def find_config_model_format(table_name: str) -> Optional[ModelFormatConfig]:
     """
     Найти конфигурацию модели для заданной таблицы.
     :param table_name: Название таблицы ORM-модели.
     :return: Найденная конфигурация/None
     """
-    return next(
-        (conf for conf in MODEL_FORMATS if conf[0].__tablename__ == table_name),
-        None
+    return MODEL_FORMATS_BY_TABLE.get(table_name)
+
+
+# Формат вывода даты/времени в записях
+DATETIME_FORMAT = "%Y-%m-%d %H:%M"
+# Формат вывода времени суток в записях
+TIME_FORMAT = "%H:%M"
+
+# Нормализованный список полей: имена простых полей и пары (связь, нормализованные подполя)
+FieldsKey = Tuple[Union[str, Tuple[str, "FieldsKey"]], ...]
+
+
+class FormatPlan(NamedTuple):
+    # ORM-модель, для которой составлен план
+    model: Type
+    # Простые поля: (префикс 'поле=', функция получения значения)
+    fields: Tuple[Tuple[str, Callable[[Any], Any]], ...]
+    # Вложенные связи: (префикс 'связь=', функция получения связи или None, если связи нет,
+    #                   план связанной модели, нормализованные подполя)
+    nested: Tuple[Tuple[str, Optional[Callable[[Any], Any]], Optional["FormatPlan"], FieldsKey], ...]
+
+
+_plans_lock = threading.Lock()
+
+# Скомпилированные планы: (модель, нормализованные поля) -> план
+_plans: Dict[Tuple[Type, FieldsKey], FormatPlan] = {}
+
+
+def _fields_key(model_fields: Optional[Iterable]) -> FieldsKey:
+    """
+    Привести список полей к хешируемому виду из имён полей и связей.
+
+    :param model_fields: Список полей (см. format_for_chat).
+    :return: Нормализованные поля.
+    :raises ValueError: Если тип поля не поддерживается.
+    """
+    key = []
+    for mf in model_fields or ():
+        if isinstance(mf, tuple):
+            rel, sub = mf
+            key.append((rel.key if isinstance(rel, InstrumentedAttribute) else rel, _fields_key(sub)))
+        elif isinstance(mf, InstrumentedAttribute):
+            key.append(mf.key)
+        elif isinstance(mf, Column):
+            key.append(mf.name)
+        elif isinstance(mf, str):
+            key.append(mf)
+        else:
+            raise ValueError(f"Unsupported model_field type: {mf!r}")
+    return tuple(key)
+
+
+def _default_getter(name: str) -> Callable[[Any], Any]:
+    """
+    Функция получения значения атрибута, которого нет среди атрибутов маппера.
+    """
+    return lambda obj: getattr(obj, name, None)
+
+
+def _get_plan(model: Type, key: FieldsKey) -> FormatPlan:
+    """
+    Получить план форматирования из кэша или скомпилировать его.
+
+    :param model: ORM-модель.
+    :param key: Нормализованные поля.
+    :return: План форматирования.
+    """
+    plan = _plans.get((model, key))
+    if plan is not None:
+        return plan
+
+    mapper = inspect(model)
+    info = db.registry.MODELS.get(model)
+    getters = info.getters if info is not None else {attr.key: attrgetter(attr.key) for attr in mapper.attrs}
+
+    flat_fields: List[str] = []
+    nested_fields: Dict[str, FieldsKey] = {}
+    for item in key:
+        if isinstance(item, tuple):
+            nested_fields[item[0]] = item[1]
+        elif item not in flat_fields:
+            flat_fields.append(item)
+
+    # если не указали поля — берём все колонки в порядке декларации
+    if not flat_fields and not nested_fields:
+        flat_fields = [col.key for col in mapper.columns]
+
+    nested = []
+    for rel_name, sub_key in nested_fields.items():
+        rel = mapper.relationships.get(rel_name)
+        if rel is None:
+            nested.append((f"{rel_name}=", None, None, sub_key))
+        else:
+            nested.append((f"{rel_name}=", attrgetter(rel_name), _get_plan(rel.mapper.class_, sub_key), sub_key))
+
+    plan = FormatPlan(
+        model=model,
+        fields=tuple((f"{name}=", getters.get(name) or _default_getter(name)) for name in flat_fields),
+        nested=tuple(nested),
     )
+    with _plans_lock:
+        plan = _plans.setdefault((model, key), plan)
+    return plan
+
+
+def compile_format_plan(
+    model: Type[db.T],
+    model_fields: Optional[List[Union[str, Column, InstrumentedAttribute, NestedField]]] = None
+) -> FormatPlan:
+    """
+    Скомпилировать (однократно) план форматирования записей модели.
+
+    План содержит заранее подготовленные функции получения значений полей и планы
+    вложенных связей, поэтому форматирование записи не требует интроспекции модели.
+
+    :param model: ORM-модель.
+    :param model_fields: Список полей для вывода (см. format_for_chat).
+    :return: План форматирования.
+    """
+    return _get_plan(model, _fields_key(model_fields))
+
+
+def _format_record(plan: FormatPlan, obj, field_separator: str, record_separator: str) -> str:
+    """
+    Отформатировать запись модели по скомпилированному плану.
+
+    :param plan: План форматирования модели записи.
+    :param obj: Экземпляр модели.
+    :param field_separator: Разделитель между полями в одной записи.
+    :param record_separator: Разделитель между записями (для списков во вложенных связях).
+    :return: Строка `{ field1=..., field2=... }`.
+    """
+    parts = []
+    for prefix, getter in plan.fields:
+        val = getter(obj)
+        # Если datetime, форматируем в строку
+        if isinstance(val, (datetime, date)):
+            val = date_and_time.format_datetime(val, fmt=DATETIME_FORMAT)
+        # Если время суток (например, тихие часы), выводим ЧЧ:ММ
+        elif isinstance(val, time):
+            val = val.strftime(TIME_FORMAT)
+        parts.append(prefix + repr(val))
+
+    for prefix, getter, sub_plan, sub_key in plan.nested:
+        if getter is None:
+            parts.append(prefix + "<no relation>")
+            continue
+        related = getter(obj)
+        if related is None:
+            parts.append(prefix + "None")
+        elif related.__class__ is sub_plan.model:
+            parts.append(prefix + _format_record(sub_plan, related, field_separator, record_separator))
+        else:
+            # список связанных записей или наследник модели
+            parts.append(prefix + format_for_chat(
+                related,
+                model_fields=sub_key,
+                field_separator=field_separator,
+                record_separator=record_separator
+            ))
+
+    return "{ " + field_separator.join(parts) + " }"
 
 
 def format_for_chat(
@@ -95,8 +306,9 @@ def format_for_chat(
     """
     Преобразует одну запись или список записей SQLAlchemy-модели в строку.
 
-    Если передан iterable (список/кортеж) — рекурсивно форматирует каждый элемент
+    Если передан iterable (список/кортеж) — форматирует каждый элемент
     и склеивает их через record_separator. Иначе форматирует одиночный объект.
+    Записи моделей форматируются по скомпилированному плану (см. compile_format_plan).
 
     :param obj: Экземпляр модели или iterable таких объектов.
     :param model_fields: Список полей для вывода. Каждый элемент может быть:
@@ -108,14 +320,20 @@ def format_for_chat(
     :return: Сформированная строка. Для одного объекта — строка `{field1=..., field2=...}`.
              Для списка — несколько таких блоков, разделённых record_separator.
     """
-    # 1) Iterable (не str/bytes/dict) — склеиваем записи
+    # 1) Iterable (не str/bytes/dict) — склеиваем записи, план получаем один раз на модель
     if isinstance(obj, Iterable) and not isinstance(obj, (str, bytes, dict)):
-        formatted = [
-            format_for_chat(item, model_fields=model_fields,
-                            field_separator=field_separator,
-                            record_separator=record_separator)
-            for item in obj
-        ]
+        key = _fields_key(model_fields)
+        plan = None
+        formatted = []
+        for item in obj:
+            if plan is None or item.__class__ is not plan.model:
+                if not isinstance(item.__class__, DeclarativeMeta):
+                    formatted.append(format_for_chat(item, model_fields=key,
+                                                     field_separator=field_separator,
+                                                     record_separator=record_separator))
+                    continue
+                plan = _get_plan(item.__class__, key)
+            formatted.append(_format_record(plan, item, field_separator, record_separator))
         return record_separator.join(formatted)
 
     # 2) dict — простой вывод
@@ -125,65 +343,13 @@ def format_for_chat(
 
     # 3) SQLAlchemy-модель
     if isinstance(obj.__class__, DeclarativeMeta):
-        mapper = inspect(obj.__class__)
-
-        flat_fields: List[str] = []
-        nested_fields: dict = {}
-
-        if model_fields:
-            for mf in model_fields:
-                if isinstance(mf, tuple):
-                    # вложенная связь
-                    key, sub = mf
-                    rel_name = key.key if isinstance(key, InstrumentedAttribute) else key
-                    nested_fields[rel_name] = sub
-                else:
-                    # простое поле
-                    if isinstance(mf, InstrumentedAttribute):
-                        name = mf.key
-                    elif isinstance(mf, Column):
-                        name = mf.name
-                    elif isinstance(mf, str):
-                        name = mf
-                    else:
-                        raise ValueError(f"Unsupported model_field type: {mf!r}")
-                    if name not in flat_fields:
-                        flat_fields.append(name)
-
-        # если не указали поля — берём все колонки в порядке декларации
-        if not flat_fields and not nested_fields:
-            flat_fields = [col.key for col in mapper.columns]
-
-        parts: List[str] = []
-        # вывод обычных полей в заданном порядке
-        for field in flat_fields:
-            # пропускаем foreign_key_id, если есть nested для этой связи
-            if not model_fields and field.endswith("_id") and field[:-3] in nested_fields:
-                continue
-            val = getattr(obj, field, None)
-            # Если datetime, форматируем в строку
-            if isinstance(val, (datetime, date)):
-                val = date_and_time.format_datetime(val, fmt="%Y-%m-%d %H:%M")
-            parts.append(f"{field}={val!r}")
-
-        # вывод вложенных связей
-        for rel_name, subfields in nested_fields.items():
-            if rel_name not in mapper.relationships:
-                parts.append(f"{rel_name}=<no relation>")
-                continue
-            related = getattr(obj, rel_name)
-            if related is None:
-                parts.append(f"{rel_name}=None")
-            else:
-                nested = format_for_chat(
-                    related,
-                    model_fields=subfields,
-                    field_separator=field_separator,
-                    record_separator=record_separator
-                )
-                parts.append(f"{rel_name}={nested}")
-
-        return "{ " + field_separator.join(parts) + " }"
+        return _format_record(compile_format_plan(obj.__class__, model_fields), obj,
+                              field_separator, record_separator)
 
     # 4) Примитивы
     return str(obj)
+
+
+# Планы моделей из MODEL_FORMATS компилируются один раз при импорте
+for _model, _model_fields, _ in MODEL_FORMATS:
+    compile_format_plan(_model, _model_fields)
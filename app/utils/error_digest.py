@@ -0,0 +1,179 @@
+"""
+Сводки (digest) повторяющихся ошибок журнала.
+
+Ошибки группируются по отпечатку: логгер, шаблон сообщения (с заменой изменяемых частей —
+email, чисел, идентификаторов, строк в кавычках) и тип исключения. Первая ошибка группы отправляется
+сразу, повторы в течение окна DIGEST_WINDOW только подсчитываются и по окончании окна отправляются
+одной сводкой. Кроме того, сразу отправляется не больше MAX_IMMEDIATE разных ошибок за окно,
+остальные также попадают в сводку.
+
+Группы хранятся в ограниченном LRU (не более MAX_FINGERPRINTS групп).
+"""
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, List, NamedTuple, Optional
+
+# Длина окна группировки повторов (в секундах)
+DIGEST_WINDOW = 300.0
+
+# Максимальное количество разных ошибок, отправляемых сразу за окно
+MAX_IMMEDIATE = 10
+
+# Максимальное количество отслеживаемых групп ошибок
+MAX_FINGERPRINTS = 1000
+
+# Изменяемые части сообщения и их замены (порядок важен: email и идентификаторы до чисел)
+_VARIABLE_PARTS = (
+    (re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"), "<email>"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<uuid>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<hex>"),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "<str>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+)
+
+
+class Digest(NamedTuple):
+    # Отпечаток группы
+    fingerprint: str
+    # Текст последней ошибки группы
+    text: str
+    # Количество не отправленных ошибок группы
+    count: int
+    # Длительность накопления (в секундах)
+    period: float
+
+
+class _Group:
+    """
+    Группа ошибок с одинаковым отпечатком в текущем окне.
+    """
+    __slots__ = ("started_at", "suppressed", "text")
+
+    def __init__(self, started_at: float, text: str):
+        self.started_at = started_at
+        self.suppressed = 0
+        self.text = text
+
+
+def normalize_message(message: str) -> str:
+    """
+    Заменить изменяемые части сообщения (email, идентификаторы, строки в кавычках, числа) заполнителями.
+
+    :param message: Сообщение или шаблон сообщения.
+    :return: Нормализованное сообщение.
+    """
+    for pattern, placeholder in _VARIABLE_PARTS:
+        message = pattern.sub(placeholder, message)
+    return message
+
+
+def fingerprint(logger_name: str, template: str, exception_type: Optional[str] = None) -> str:
+    """
+    Получить отпечаток ошибки.
+
+    :param logger_name: Название логгера.
+    :param template: Шаблон сообщения (или сообщение).
+    :param exception_type: Название типа исключения (None — без исключения).
+    :return: Отпечаток.
+    """
+    return f"{logger_name}|{exception_type or ''}|{normalize_message(str(template))}"
+
+
+class ErrorDigest:
+    """
+    Группировка повторяющихся ошибок и ограничение частоты их отправки.
+    """
+
+    def __init__(self, window: float = DIGEST_WINDOW, max_immediate: int = MAX_IMMEDIATE,
+                 max_fingerprints: int = MAX_FINGERPRINTS):
+        """
+        :param window: Длина окна группировки повторов (в секундах).
+        :param max_immediate: Максимальное количество разных ошибок, отправляемых сразу за окно.
+        :param max_fingerprints: Максимальное количество отслеживаемых групп ошибок.
+        """
+        self.window = window
+        self.max_immediate = max_immediate
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        # Группы в порядке последнего обращения
+        self._groups: "OrderedDict[str, _Group]" = OrderedDict()
+        # Моменты отправки ошибок сразу в пределах окна
+        self._sent: Deque[float] = deque()
+        # Сводки закончившихся и вытесненных групп, ожидающие отправки
+        self._pending: List[Digest] = []
+        # Всего не отправленных сразу ошибок
+        self.suppressed_total = 0
+
+    def observe(self, key: str, text: str, now: Optional[float] = None) -> bool:
+        """
+        Учесть ошибку и решить, отправлять ли её сразу.
+
+        :param key: Отпечаток ошибки.
+        :param text: Текст ошибки.
+        :param now: Момент ошибки (time.monotonic()); None — текущий.
+        :return: True — отправить сразу, False — ошибка будет учтена в сводке.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            group = self._groups.get(key)
+            if group is not None and now - group.started_at < self.window:
+                self._groups.move_to_end(key)
+                group.suppressed += 1
+                group.text = text
+                self.suppressed_total += 1
+                return False
+
+            if group is not None:
+                self._flush(key, group, now)
+            group = self._groups[key] = _Group(now, text)
+            if len(self._groups) > self.max_fingerprints:
+                evicted_key, evicted = self._groups.popitem(last=False)
+                self._flush(evicted_key, evicted, now)
+
+            while self._sent and self._sent[0] <= now - self.window:
+                self._sent.popleft()
+            if len(self._sent) >= self.max_immediate:
+                group.suppressed += 1
+                self.suppressed_total += 1
+                return False
+
+            self._sent.append(now)
+            return True
+
+    def _flush(self, key: str, group: _Group, now: float) -> None:
+        """
+        Сохранить сводку группы, если в ней есть не отправленные ошибки.
+        """
+        if group.suppressed:
+            self._pending.append(Digest(key, group.text, group.suppressed, now - group.started_at))
+
+    def due(self, now: Optional[float] = None) -> List[Digest]:
+        """
+        Получить сводки групп, окно которых закончилось (группы удаляются).
+
+        :param now: Текущий момент (time.monotonic()); None — текущий.
+        :return: Список сводок.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for key, group in list(self._groups.items()):
+                if now - group.started_at >= self.window:
+                    del self._groups[key]
+                    self._flush(key, group, now)
+            digests, self._pending = self._pending, []
+        return digests
+
+
+def format_digest(digest: Digest, max_length: int = 2000) -> str:
+    """
+    Сформировать текст сводки повторяющейся ошибки.
+
+    :param digest: Сводка.
+    :param max_length: Максимальная длина текста ошибки (остальное сокращается).
+    :return: Текст сводки.
+    """
+    text = digest.text if len(digest.text) <= max_length else digest.text[:max_length] + "…"
+    return (f"🔁 Не отправлено повторов ошибки: {digest.count} за {max(digest.period, 1) / 60:.1f} мин. "
+            f"Последний:\n\n{text}")
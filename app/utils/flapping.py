@@ -0,0 +1,274 @@
+"""
+Обнаружение дребезга (flapping) триггеров Zabbix.
+
+Для каждого триггера хранится последнее состояние и моменты его переключений (problem <-> recovery)
+за скользящее окно FLAP_WINDOW. Если переключений в окне не меньше FLAP_THRESHOLD, триггер считается
+нестабильным: вместо каждого события отправляется одно объявление, далее — периодический статус
+(не чаще раза в STATUS_INTERVAL секунд). Когда переключений в окне становится не больше
+RECOVERY_THRESHOLD, отправляется сообщение о стабилизации триггера.
+
+Состояния триггеров хранятся в ограниченном LRU (не более MAX_TRIGGERS триггеров).
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+from app.utils.message_templates import EVENT_TYPE_FIELD
+
+# Длина скользящего окна подсчёта переключений (в секундах)
+FLAP_WINDOW = 300.0
+
+# Количество переключений в окне, с которого триггер считается нестабильным
+FLAP_THRESHOLD = 6
+
+# Количество переключений в окне, при котором нестабильный триггер считается стабилизировавшимся
+RECOVERY_THRESHOLD = 2
+
+# Минимальный интервал между статусами нестабильного триггера (в секундах)
+STATUS_INTERVAL = 300.0
+
+# Максимальное количество отслеживаемых триггеров
+MAX_TRIGGERS = 10000
+
+# Поля данных события с идентификатором триггера ({TRIGGER.ID})
+TRIGGER_ID_FIELDS = ("trigger_id", "triggerid")
+
+# Типы событий, означающие проблему и её решение
+PROBLEM_EVENT_TYPES = frozenset({"problem"})
+RECOVERY_EVENT_TYPES = frozenset({"recovery", "resolved", "ok"})
+
+# Виды сообщений о дребезге
+UPDATE_FLAPPING = "flapping"
+UPDATE_STATUS = "status"
+UPDATE_RECOVERED = "recovered"
+
+_STATE_NAMES = {"problem": "проблема", "recovery": "решено"}
+
+
+class FlapUpdate(NamedTuple):
+    # Вид сообщения (UPDATE_FLAPPING, UPDATE_STATUS, UPDATE_RECOVERED)
+    kind: str
+    # Идентификатор триггера
+    trigger: str
+    # Данные последнего события триггера
+    data: Dict[str, Any]
+    # Текущее состояние триггера ('problem' или 'recovery')
+    state: str
+    # Количество переключений в окне
+    transitions: int
+    # Количество событий, не отправленных с момента предыдущего сообщения
+    suppressed: int
+
+
+class Verdict(NamedTuple):
+    # Отправлять ли событие подписчикам
+    deliver: bool
+    # Сообщение о дребезге, которое нужно отправить вместо или вместе с событием
+    update: Optional[FlapUpdate]
+
+
+class _TriggerState:
+    """
+    Состояние одного триггера.
+    """
+    __slots__ = ("state", "transitions", "flapping", "suppressed", "updated_at", "data")
+
+    def __init__(self, state: Optional[str], data: Dict[str, Any]):
+        self.state = state
+        # Моменты переключений в пределах окна
+        self.transitions: Deque[float] = deque()
+        self.flapping = False
+        self.suppressed = 0
+        # Момент последнего сообщения о дребезге
+        self.updated_at = 0.0
+        self.data = data
+
+
+def trigger_key(data: Any) -> Optional[str]:
+    """
+    Получить идентификатор триггера события.
+
+    :param data: Данные события.
+    :return: Идентификатор триггера или None, если событие нельзя отнести к триггеру.
+    """
+    if not isinstance(data, dict):
+        return None
+    for field in TRIGGER_ID_FIELDS:
+        value = data.get(field)
+        if value not in (None, "") and not str(value).startswith("{"):
+            return str(value)
+    return None
+
+
+def event_state(data: Dict[str, Any]) -> Optional[str]:
+    """
+    Получить состояние триггера по типу события.
+
+    :param data: Данные события.
+    :return: 'problem', 'recovery' или None (событие не меняет состояние, например update).
+    """
+    event_type = str(data.get(EVENT_TYPE_FIELD, "")).strip().lower()
+    if event_type in PROBLEM_EVENT_TYPES:
+        return "problem"
+    if event_type in RECOVERY_EVENT_TYPES:
+        return "recovery"
+    return None
+
+
+class FlapTracker:
+    """
+    Отслеживание переключений триггеров и их дребезга.
+    """
+
+    def __init__(self, window: float = FLAP_WINDOW, flap_threshold: int = FLAP_THRESHOLD,
+                 recovery_threshold: int = RECOVERY_THRESHOLD, status_interval: float = STATUS_INTERVAL,
+                 max_triggers: int = MAX_TRIGGERS):
+        """
+        :param window: Длина скользящего окна подсчёта переключений (в секундах).
+        :param flap_threshold: Количество переключений в окне для начала дребезга.
+        :param recovery_threshold: Количество переключений в окне для окончания дребезга.
+        :param status_interval: Минимальный интервал между статусами нестабильного триггера (в секундах).
+        :param max_triggers: Максимальное количество отслеживаемых триггеров.
+        """
+        if recovery_threshold >= flap_threshold:
+            raise ValueError("❌ recovery_threshold must be less than flap_threshold")
+
+        self.window = window
+        self.flap_threshold = flap_threshold
+        self.recovery_threshold = recovery_threshold
+        self.status_interval = status_interval
+        self.max_triggers = max_triggers
+        self._lock = threading.Lock()
+        # Состояния триггеров в порядке последнего обращения
+        self._triggers: "OrderedDict[str, _TriggerState]" = OrderedDict()
+        # Всего не отправленных событий
+        self.suppressed_total = 0
+
+    def _update(self, kind: str, key: str, trigger: _TriggerState, now: float) -> FlapUpdate:
+        """
+        Сформировать сообщение о дребезге и сбросить счётчик не отправленных событий.
+        """
+        update = FlapUpdate(kind, key, trigger.data, trigger.state or "", len(trigger.transitions),
+                            trigger.suppressed)
+        trigger.suppressed = 0
+        trigger.updated_at = now
+        return update
+
+    def _expire(self, trigger: _TriggerState, now: float) -> None:
+        """
+        Удалить переключения, вышедшие за пределы окна.
+        """
+        transitions = trigger.transitions
+        while transitions and transitions[0] <= now - self.window:
+            transitions.popleft()
+
+    def observe(self, data: Any, now: Optional[float] = None) -> Verdict:
+        """
+        Учесть событие и решить, отправлять ли его подписчикам.
+
+        :param data: Данные события.
+        :param now: Момент события (time.monotonic()); None — текущий.
+        :return: Решение по событию.
+        """
+        key = trigger_key(data)
+        if key is None:
+            return Verdict(True, None)
+
+        now = time.monotonic() if now is None else now
+        state = event_state(data)
+        with self._lock:
+            trigger = self._triggers.get(key)
+            if trigger is None:
+                trigger = self._triggers[key] = _TriggerState(state, data)
+                if len(self._triggers) > self.max_triggers:
+                    self._triggers.popitem(last=False)
+                return Verdict(True, None)
+
+            self._triggers.move_to_end(key)
+            trigger.data = data
+            if state is not None and state != trigger.state:
+                if trigger.state is not None:
+                    trigger.transitions.append(now)
+                trigger.state = state
+            self._expire(trigger, now)
+
+            count = len(trigger.transitions)
+            if not trigger.flapping:
+                if count < self.flap_threshold:
+                    return Verdict(True, None)
+                trigger.flapping = True
+                update = self._update(UPDATE_FLAPPING, key, trigger, now)
+                # Событие, объявившее дребезг, тоже не отправляется и учитывается в следующем статусе
+                trigger.suppressed += 1
+                self.suppressed_total += 1
+                return Verdict(False, update)
+
+            if count <= self.recovery_threshold:
+                trigger.flapping = False
+                return Verdict(True, self._update(UPDATE_RECOVERED, key, trigger, now))
+
+            trigger.suppressed += 1
+            self.suppressed_total += 1
+            return Verdict(False, None)
+
+    def tick(self, now: Optional[float] = None) -> List[FlapUpdate]:
+        """
+        Получить периодические статусы нестабильных триггеров и сообщения о стабилизации
+        триггеров, события которых перестали приходить.
+
+        :param now: Текущий момент (time.monotonic()); None — текущий.
+        :return: Список сообщений о дребезге.
+        """
+        now = time.monotonic() if now is None else now
+        updates = []
+        with self._lock:
+            for key, trigger in self._triggers.items():
+                if not trigger.flapping:
+                    continue
+                self._expire(trigger, now)
+                if len(trigger.transitions) <= self.recovery_threshold:
+                    trigger.flapping = False
+                    updates.append(self._update(UPDATE_RECOVERED, key, trigger, now))
+                elif now - trigger.updated_at >= self.status_interval:
+                    updates.append(self._update(UPDATE_STATUS, key, trigger, now))
+        return updates
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Получить статистику отслеживания.
+
+        :return: Словарь: отслеживаемые триггеры, нестабильные триггеры, всего не отправленных событий.
+        """
+        with self._lock:
+            return {
+                "tracked": len(self._triggers),
+                "flapping": sum(1 for trigger in self._triggers.values() if trigger.flapping),
+                "suppressed": self.suppressed_total,
+            }
+
+
+def format_update(update: FlapUpdate, window: float = FLAP_WINDOW, status_interval: float = STATUS_INTERVAL) -> str:
+    """
+    Сформировать текст сообщения о дребезге триггера.
+
+    :param update: Сообщение о дребезге.
+    :param window: Длина окна подсчёта переключений (в секундах).
+    :param status_interval: Интервал между статусами (в секундах).
+    :return: Текст сообщения.
+    """
+    data = update.data
+    name = data.get("subject") or data.get("trigger") or update.trigger
+    if data.get("host"):
+        name = f"{name} (хост {data['host']})"
+    state = _STATE_NAMES.get(update.state, update.state or "-")
+    minutes = f"{window / 60:g} мин"
+
+    if update.kind == UPDATE_FLAPPING:
+        return (f"🔁 Триггер '{name}' нестабилен: {update.transitions} переключений за {minutes}.\n"
+                f"Уведомления по нему приостановлены, статус будет приходить не чаще раза в "
+                f"{status_interval / 60:g} мин.\nТекущее состояние: {state}.")
+    if update.kind == UPDATE_STATUS:
+        return (f"🔁 Триггер '{name}' продолжает переключаться: {update.transitions} переключений за {minutes}, "
+                f"пропущено уведомлений: {update.suppressed}.\nТекущее состояние: {state}.")
+    return (f"✅ Триггер '{name}' стабилизировался, пропущено уведомлений: {update.suppressed}.\n"
+            f"Текущее состояние: {state}.")
@@ -1,31 +1,184 @@
-from typing import Dict
+from typing import Any, Dict, Iterator, Optional
 
 
-def format_json_to_str(data: Dict, indent: int = 0) -> str:
+# Строка, которой заканчивается вывод, сокращённый по лимиту длины
+TRUNCATION_MARKER = "…[вывод сокращён]"
+
+# Признак окончания элементов контейнера при обходе
+_END = object()
+
+# Границы элемента списка в потоке частей текста: пробельные символы в начале и в конце элемента удаляются
+_ITEM_START = object()
+_ITEM_END = object()
+
+
+def _scalar_to_str(value: Any) -> str:
+    """
+    Преобразовать простое значение в текст, раскрывая экранированные переводы строк.
+    """
+    return str(value).replace("\\n", "\n")
+
+
+def _iter_chunks(data: Any, indent: int = 0) -> Iterator[Any]:
+    """
+    Обойти данные без рекурсии и выдать части текста (могут содержать переводы строк),
+    разделители '\n' и границы элементов списков _ITEM_START/_ITEM_END.
+
+    :param data: Форматируемые данные.
+    :param indent: Количество отступов слоёв значений.
+    """
+    if not isinstance(data, (dict, list)):
+        yield '  ' * indent + _scalar_to_str(data)
+        return
+
+    # Стек [итератор по элементам, уровень отступа, является ли контейнер списком,
+    #       выдан ли первый элемент, завершает ли контейнер элемент списка]
+    stack = []
+
+    def push(value, level: int, closes_item: bool = False) -> None:
+        items = iter(value) if isinstance(value, list) else iter(value.items())
+        stack.append([items, level, isinstance(value, list), False, closes_item])
+
+    if data:
+        push(data, indent)
+
+    while stack:
+        entry = stack[-1]
+        items, level, is_list, started, closes_item = entry
+        item = next(items, _END)
+        if item is _END:
+            stack.pop()
+            if closes_item:
+                yield _ITEM_END
+            continue
+
+        # Элементы контейнера разделяются переводом строки
+        if started:
+            yield "\n"
+        entry[3] = True
+
+        if is_list:
+            yield '  ' * level + "- "
+            yield _ITEM_START
+            if isinstance(item, (dict, list)):
+                if item:
+                    push(item, level + 1, closes_item=True)
+                else:
+                    yield _ITEM_END
+            else:
+                yield '  ' * (level + 1) + _scalar_to_str(item)
+                yield _ITEM_END
+        else:
+            key, value = item
+            if isinstance(value, (dict, list)):
+                # Пустой контейнер выводится пустой строкой
+                yield f"{'  ' * level}{key}:"
+                yield "\n"
+                if value:
+                    push(value, level + 1)
+            else:
+                yield f"{'  ' * level}{key}: {_scalar_to_str(value)}"
+
+
+def iter_json_lines(data: Any, indent: int = 0) -> Iterator[str]:
+    """
+    Построчно форматирует словарь (или список) в текст без рекурсии.
+    Строки выдаются по мере обхода, поэтому промежуточные строки вложенных уровней не собираются.
+    Текст каждого элемента списка, как и прежде, выводится без пробельных символов в начале и в конце
+    (включая переводы строк из значений), остальные значения выводятся без изменений.
+
+    :param data: Форматируемый словарь.
+    :param indent: Количество отступов слоёв значений.
+    :return: Генератор строк вывода (без символов перевода строки между ними).
+    """
+    # Текущая (незавершённая) строка вывода
+    current = ""
+    # Пробельные символы, ещё не выведенные: [(глубина элементов списка, текст)].
+    # В конце элемента списка отбрасываются пробельные символы этого элемента.
+    pending = []
+    # Глубина вложенности элементов списков
+    depth = 0
+    # Отбрасывать ли пробельные символы в начале элемента списка
+    skip_leading = False
+
+    for chunk in _iter_chunks(data, indent):
+        if chunk is _ITEM_START:
+            depth += 1
+            skip_leading = True
+            continue
+        if chunk is _ITEM_END:
+            pending = [(level, text) for level, text in pending if level < depth]
+            depth -= 1
+            skip_leading = False
+            continue
+
+        if skip_leading:
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            skip_leading = False
+
+        text = chunk.rstrip()
+        space = chunk[len(text):]
+        if text:
+            lines = ("".join(pending_space for _, pending_space in pending) + text).split("\n")
+            pending = []
+            current += lines[0]
+            for line in lines[1:]:
+                yield current
+                current = line
+        if space:
+            pending.append((depth, space))
+
+    lines = "".join(pending_space for _, pending_space in pending).split("\n")
+    current += lines[0]
+    for line in lines[1:]:
+        yield current
+        current = line
+    yield current
+
+
+def iter_json_text(data: Any, max_length: Optional[int] = None, indent: int = 0) -> Iterator[str]:
+    """
+    Построчно форматирует словарь в текст с ограничением общей длины вывода.
+    При достижении лимита вывод обрывается и завершается строкой TRUNCATION_MARKER
+    (обрезанной до max_length, если лимит меньше её длины), оставшаяся часть данных не обходится.
+
+    :param data: Форматируемый словарь.
+    :param max_length: Максимальная длина текста (с учётом переводов строк и маркера); None — без ограничения.
+    :param indent: Количество отступов слоёв значений.
+    :return: Генератор строк вывода.
+    """
+    lines = iter_json_lines(data, indent)
+    if max_length is None:
+        yield from lines
+        return
+
+    # Резерв под перевод строки и маркер сокращения
+    budget = max_length - len(TRUNCATION_MARKER) - 1
+    used = 0
+    for text in lines:
+        size = len(text) + (1 if used else 0)
+        if used + size > budget:
+            rest = budget - used - (1 if used else 0)
+            if rest > 0:
+                yield text[:rest]
+            # Лимит меньше длины маркера — маркер обрезается до лимита
+            if max_length > 0:
+                yield TRUNCATION_MARKER[:max_length]
+            return
+        used += size
+        yield text
+
+
+def format_json_to_str(data: Dict, indent: int = 0, max_length: Optional[int] = None) -> str:
     """
     Форматирует словарь в текст.
     Учитывает вложенность.
 
     :param data: Форматируемый словарь.
     :param indent: Количество отступов слоёв значений.
+    :param max_length: Максимальная длина текста; None — без ограничения (см. iter_json_text).
     :return: Отформатированный словарь в виде строки.
     """
-    lines = []
-    indent_str = '  ' * indent  # отступ для вложенности
-
-    if isinstance(data, dict):
-        for key, value in data.items():
-            if isinstance(value, (dict, list)):
-                lines.append(f"{indent_str}{key}:")
-                lines.append(format_json_to_str(value, indent + 1))
-            else:
-                value_str = str(value).replace("\\n", "\n")
-                lines.append(f"{indent_str}{key}: {value_str}")
-    elif isinstance(data, list):
-        for idx, item in enumerate(data):
-            lines.append(f"{indent_str}- {format_json_to_str(item, indent + 1).strip()}")
-    else:
-        value_str = str(data).replace("\\n", "\n")
-        lines.append(f"{indent_str}{value_str}")
-
-    return "\n".join(lines)
+    return "\n".join(iter_json_text(data, max_length, indent))
@@ -0,0 +1,284 @@
+"""
+Шаблоны текста уведомлений.
+
+Шаблоны хранятся в файлах '<тип уведомления>.txt' и '<тип уведомления>.<тип события>.txt'
+в директории шаблонов. Тип события берётся из поля EVENT_TYPE_FIELD данных события.
+Каждый шаблон компилируется один раз в функцию вывода; изменения файлов подхватываются
+без перезапуска (директория проверяется не чаще раза в RELOAD_INTERVAL секунд).
+
+Синтаксис шаблона — строки с полями в фигурных скобках, как в str.format:
+    {host}, {tags.env}, {items.0}, {severity!s:>8}
+Строка, все поля которой отсутствуют в данных (или пусты, или содержат нераскрытый макрос Zabbix),
+не выводится. Строка '{*}' выводит оставшиеся поля данных, не упомянутые в шаблоне.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from string import Formatter
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.utils import json_format
+
+# Директория шаблонов по умолчанию
+TEMPLATES_DIRECTORY = Path(__file__).resolve().parent.parent / "templates"
+
+# Расширение файлов шаблонов
+TEMPLATE_EXTENSION = ".txt"
+
+# Поле данных события с его типом (например, problem/recovery/update)
+EVENT_TYPE_FIELD = "event_type"
+
+# Строка шаблона, выводящая оставшиеся поля данных
+REST_FIELDS_LINE = "{*}"
+
+# Минимальный интервал проверки изменений файлов шаблонов (в секундах)
+RELOAD_INTERVAL = 5.0
+
+# Нераскрытый макрос Zabbix ({HOST.NAME}, {EVENT.TAGS} ...)
+_UNRESOLVED_MACRO = re.compile(r"^\{[A-Z0-9_.:]+\}$")
+
+# Признак отсутствующего значения
+_MISSING = object()
+
+_formatter = Formatter()
+
+logger = logging.getLogger(__name__)
+
+# Скомпилированный шаблон: данные события -> текст
+RenderFunction = Callable[[Dict[str, Any]], str]
+
+
+def _is_missing(value: Any) -> bool:
+    """
+    Считается ли значение поля отсутствующим (None, пустая строка, нераскрытый макрос Zabbix).
+    """
+    return value is _MISSING or value is None or value == "" or (
+        value.__class__ is str and value[0] == "{" and _UNRESOLVED_MACRO.match(value) is not None
+    )
+
+
+def _make_getter(field_name: str) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Подготовить функцию получения значения поля по пути через точку ('tags.env', 'items.0').
+
+    :param field_name: Путь к полю.
+    :return: Функция получения значения (или _MISSING).
+    """
+    path = tuple(field_name.split("."))
+
+    if len(path) == 1:
+        key = path[0]
+
+        def getter(data: Dict[str, Any]) -> Any:
+            value = data.get(key, _MISSING)
+            return _MISSING if _is_missing(value) else value
+
+        return getter
+
+    def nested_getter(data: Dict[str, Any]) -> Any:
+        value = data
+        for part in path:
+            if isinstance(value, dict):
+                value = value.get(part, _MISSING)
+            elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+                value = value[int(part)]
+            else:
+                return _MISSING
+        return _MISSING if _is_missing(value) else value
+
+    return nested_getter
+
+
+def _value_to_str(value: Any, conversion: Optional[str], format_spec: str) -> str:
+    """
+    Преобразовать значение поля в текст.
+    """
+    if conversion:
+        value = _formatter.convert_field(value, conversion)
+    if value.__class__ is str and not format_spec:
+        return value.replace("\\n", "\n") if "\\" in value else value
+    if isinstance(value, (dict, list)):
+        return "\n" + json_format.format_json_to_str(value, indent=1)
+    if format_spec:
+        return format(value, format_spec)
+    return str(value).replace("\\n", "\n")
+
+
+def compile_template(source: str, max_length: Optional[int] = None) -> RenderFunction:
+    """
+    Скомпилировать текст шаблона в функцию вывода.
+
+    :param source: Текст шаблона.
+    :param max_length: Максимальная длина вывода оставшихся полей ('{*}'); None — без ограничения.
+    :return: Функция, формирующая текст уведомления по данным события.
+    :raises ValueError: Ошибка синтаксиса шаблона.
+    """
+    # Строки шаблона: None для '{*}', иначе (сегменты, есть ли поля в строке);
+    # сегмент — литерал или (функция получения значения, преобразование, формат)
+    lines = []
+    # Тип события выбирает шаблон и не выводится среди оставшихся полей
+    used_fields = {EVENT_TYPE_FIELD}
+    for raw in source.strip("\n").splitlines():
+        if raw.strip() == REST_FIELDS_LINE:
+            lines.append(None)
+            continue
+
+        segments = []
+        has_fields = False
+        for literal, field_name, format_spec, conversion in _formatter.parse(raw):
+            if literal:
+                segments.append(literal)
+            if field_name is None:
+                continue
+            if not field_name:
+                raise ValueError(f"❌ Empty field in template line: {raw!r}")
+            has_fields = True
+            used_fields.add(field_name.split(".", 1)[0])
+            segments.append((_make_getter(field_name), conversion, format_spec or ""))
+        lines.append((tuple(segments), has_fields))
+
+    lines = tuple(lines)
+    used_fields = frozenset(used_fields)
+
+    def render(data: Dict[str, Any]) -> str:
+        output = []
+        for line in lines:
+            if line is None:
+                rest = {
+                    key: value for key, value in data.items()
+                    if key not in used_fields and not _is_missing(value)
+                }
+                if rest:
+                    output.append(json_format.format_json_to_str(rest, max_length=max_length))
+                continue
+
+            segments, has_fields = line
+            parts = []
+            found = not has_fields
+            for segment in segments:
+                if segment.__class__ is str:
+                    parts.append(segment)
+                    continue
+                getter, conversion, format_spec = segment
+                value = getter(data)
+                if value is not _MISSING:
+                    found = True
+                    parts.append(_value_to_str(value, conversion, format_spec))
+            if found:
+                output.append("".join(parts))
+
+        return "\n".join(output).strip("\n")
+
+    return render
+
+
+class MessageTemplates:
+    """
+    Набор скомпилированных шаблонов уведомлений из директории с горячей перезагрузкой.
+    """
+
+    def __init__(self, directory: Path = TEMPLATES_DIRECTORY, reload_interval: float = RELOAD_INTERVAL,
+                 max_length: Optional[int] = None):
+        """
+        :param directory: Директория файлов шаблонов.
+        :param reload_interval: Минимальный интервал проверки изменений файлов (в секундах).
+        :param max_length: Максимальная длина вывода оставшихся полей в шаблонах.
+        """
+        self.directory = Path(directory)
+        self.reload_interval = reload_interval
+        self.max_length = max_length
+        self._lock = threading.Lock()
+        # Время изменения и размер файлов на момент последней загрузки: {имя файла: (mtime, размер)}
+        self._mtimes: Dict[str, Tuple[int, int]] = {}
+        # Скомпилированные шаблоны: {(тип уведомления, тип события или None): функция вывода}
+        self._templates: Dict[Tuple[str, Optional[str]], RenderFunction] = {}
+        self._checked_at: Optional[float] = None
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Получить время изменения и размер файлов шаблонов директории.
+        """
+        try:
+            with os.scandir(str(self.directory)) as entries:
+                return {
+                    entry.name: (entry.stat().st_mtime_ns, entry.stat().st_size)
+                    for entry in entries
+                    if entry.is_file() and entry.name.endswith(TEMPLATE_EXTENSION)
+                }
+        except FileNotFoundError:
+            return {}
+
+    def reload(self, force: bool = False) -> None:
+        """
+        Перекомпилировать изменённые шаблоны и удалить шаблоны удалённых файлов.
+        Шаблон с ошибкой синтаксиса не заменяет ранее загруженную версию.
+
+        :param force: Перекомпилировать все шаблоны независимо от времени изменения файлов.
+        """
+        with self._lock:
+            mtimes = self._scan()
+            self._checked_at = time.monotonic()
+            if not force and mtimes == self._mtimes:
+                return
+
+            templates = {}
+            for name, mtime in mtimes.items():
+                notification_type, _, event_type = name[:-len(TEMPLATE_EXTENSION)].partition(".")
+                key = (notification_type, event_type or None)
+                if not force and self._mtimes.get(name) == mtime and key in self._templates:
+                    templates[key] = self._templates[key]
+                    continue
+                try:
+                    source = (self.directory / name).read_text(encoding="utf-8")
+                    templates[key] = compile_template(source, self.max_length)
+                except (OSError, ValueError) as e:
+                    logger.error(f"❌ Failed to load message template '{name}': {e}")
+                    if key in self._templates:
+                        templates[key] = self._templates[key]
+
+            self._templates = templates
+            self._mtimes = mtimes
+
+    def get(self, notification_type: str, event_type: Optional[str] = None) -> Optional[RenderFunction]:
+        """
+        Получить скомпилированный шаблон для типа уведомления и типа события.
+        Если шаблона для типа события нет, возвращается общий шаблон типа уведомления.
+
+        :param notification_type: Тип уведомления (значение NotificationTypes).
+        :param event_type: Тип события.
+        :return: Функция вывода или None, если шаблона нет.
+        """
+        checked_at = self._checked_at
+        if checked_at is None or time.monotonic() - checked_at >= self.reload_interval:
+            self.reload()
+
+        templates = self._templates
+        if event_type is not None:
+            render = templates.get((notification_type, str(event_type)))
+            if render is not None:
+                return render
+        return templates.get((notification_type, None))
+
+    def render(self, notification_type: str, data: Any) -> Optional[str]:
+        """
+        Сформировать текст уведомления по шаблону.
+
+        :param notification_type: Тип уведомления (значение NotificationTypes).
+        :param data: Данные события.
+        :return: Текст уведомления или None, если шаблона нет, данные не являются словарём,
+                 ни одна строка шаблона не выведена (текст пуст) или шаблон не подходит к данным
+                 (например, формат '{severity:d}' для строкового значения).
+        """
+        if not isinstance(data, dict):
+            return None
+        render = self.get(notification_type, data.get(EVENT_TYPE_FIELD))
+        if render is None:
+            return None
+        try:
+            text = render(data)
+        except Exception as e:
+            logger.error(f"❌ Failed to render message template '{notification_type}': {e}")
+            return None
+        return text if text.strip() else None
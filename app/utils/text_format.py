@@ -1,28 +1,220 @@
-from typing import List
+from typing import List, Tuple
 import re
 
 
-def split_text(text: str, max_length: int) -> List[str]:
+# HTML-теги форматирования, которые закрываются в конце части и повторно открываются в следующей
+HTML_FORMAT_TAGS = frozenset({
+    "b", "strong", "i", "em", "u", "ins", "s", "strike", "del", "a", "code", "pre", "blockquote", "span"
+})
+
+# Токен HTML-тега: закрывающий признак, название тега
+_HTML_TAG_PATTERN = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9-]*)[^<>]*>")
+
+# Максимальная длина HTML-сущности (&amp;, &#128512; ...)
+_MAX_ENTITY_LENGTH = 10
+
+# Символы, которые продолжают предыдущий (эмодзи и комбинируемые последовательности)
+_ZWJ = "\u200d"
+_CONTINUATION_PATTERN = re.compile(
+    "[\u0300-\u036f\u200d\u20d0-\u20ff\ufe00-\ufe0f\U0001f3fb-\U0001f3ff\U000e0020-\U000e007f]"
+)
+
+
+def text_length(text: str) -> int:
+    """
+    Длина текста так, как её считает API (в кодовых единицах UTF-16).
+
+    :param text: Текст.
+    :return: Длина текста.
+    """
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _is_astral(ch: str) -> bool:
+    """
+    Занимает ли символ две кодовые единицы UTF-16.
+    """
+    return ch > "\uffff"
+
+
+def _window_end(text: str, start: int, budget: int, astral: bool) -> int:
+    """
+    Найти наибольшую позицию конца части, длина которой от start не превышает budget.
     """
-    Функция для деления текста на несколько частей, каждая из которых не превышает max_length.
+    end = min(len(text), start + max(budget, 0))
+    if not astral:
+        return end
+
+    units = 0
+    pos = start
+    while pos < end:
+        units += 2 if _is_astral(text[pos]) else 1
+        if units > budget:
+            break
+        pos += 1
+    return pos
+
+
+def _safe_cut(text: str, start: int, end: int) -> int:
+    """
+    Сдвинуть точку разреза назад так, чтобы не разделять эмодзи-последовательности и комбинируемые символы.
+    """
+    pos = end
+    while start < pos < len(text) and (_CONTINUATION_PATTERN.match(text, pos) or text[pos - 1] == _ZWJ):
+        pos -= 1
+    # Региональные индикаторы (флаги) идут парами
+    if start < pos < len(text) and "\U0001f1e6" <= text[pos] <= "\U0001f1ff":
+        run = pos
+        while run > start and "\U0001f1e6" <= text[run - 1] <= "\U0001f1ff":
+            run -= 1
+        if (pos - run) % 2:
+            pos -= 1
+    return pos if pos > start else end
+
+
+def _break_point(text: str, start: int, end: int) -> Tuple[int, int]:
+    """
+    Выбрать точку разреза в окне [start, end): перевод строки, иначе пробел, иначе конец окна.
+    Граница ищется только во второй половине окна, чтобы не плодить короткие части.
+
+    :return: Кортеж (конец части, начало следующей части).
+    """
+    if end >= len(text):
+        return end, end
+    if text[end] in "\n ":
+        return end, end + 1
+
+    lower = start + (end - start) // 2
+    pos = text.rfind("\n", lower, end)
+    if pos <= start:
+        pos = max(text.rfind(" ", lower, end), text.rfind("\t", lower, end))
+    if pos > start:
+        return pos, pos + 1
+
+    cut = _safe_cut(text, start, end)
+    return cut, cut
+
+
+def _html_tokens(text: str) -> List[Tuple[int, int, bool, str, str]]:
+    """
+    Найти HTML-теги текста.
+
+    :return: Список (начало, конец, закрывающий ли тег, название тега, текст тега).
+    """
+    return [
+        (m.start(), m.end(), bool(m.group(1)), m.group(2).lower(), m.group(0))
+        for m in _HTML_TAG_PATTERN.finditer(text)
+    ]
+
+
+def _apply_tags(stack: List[Tuple[str, str]], tokens, first: int, end: int) -> int:
+    """
+    Применить теги, заканчивающиеся не позже end, к стеку открытых тегов.
+
+    :param stack: Стек открытых тегов [(название, текст открывающего тега)] (изменяется).
+    :param tokens: Теги текста (см. _html_tokens).
+    :param first: Индекс первого ещё не применённого тега.
+    :param end: Позиция текста.
+    :return: Индекс первого не применённого тега.
+    """
+    while first < len(tokens) and tokens[first][1] <= end:
+        _, _, closing, name, tag = tokens[first]
+        first += 1
+        if name not in HTML_FORMAT_TAGS or tag.endswith("/>"):
+            continue
+        if not closing:
+            stack.append((name, tag))
+            continue
+        # закрываем ближайший открытый тег с таким названием
+        for idx in range(len(stack) - 1, -1, -1):
+            if stack[idx][0] == name:
+                del stack[idx]
+                break
+    return first
+
+
+def _html_cut(text: str, tokens, first: int, start: int, cut: int, end: int) -> int:
+    """
+    Сдвинуть точку разреза, если она попадает внутрь тега или HTML-сущности:
+    назад к началу тега, а для тега в начале части — за его конец, если он помещается в окно.
+
+    :return: Новая точка разреза; start, если подходящей точки нет.
+    """
+    idx = first
+    while idx < len(tokens) and tokens[idx][0] < cut:
+        tag_start, tag_end = tokens[idx][:2]
+        if tag_end > cut:
+            if tag_start > start:
+                return tag_start
+            return tag_end if tag_end <= end else start
+        idx += 1
+
+    amp = text.rfind("&", max(start, cut - _MAX_ENTITY_LENGTH), cut)
+    if amp > start and text.find(";", amp, cut) == -1 and re.match(r"&#?\w+;", text[amp:amp + _MAX_ENTITY_LENGTH + 1]):
+        return amp
+    return cut
+
+
+def split_text(text: str, max_length: int, *, html: bool = False) -> List[str]:
+    """
+    Функция для деления текста на минимальное количество частей, каждая из которых не превышает max_length.
+
+    Текст обходится один раз. Часть по возможности заканчивается на переводе строки или пробеле
+    (символ-разделитель не переносится в следующую часть), эмодзи-последовательности не разрываются.
+    Длина считается в кодовых единицах UTF-16, как её считает API.
+    Для HTML-разметки разрез не попадает внутрь тега или сущности, а незакрытые теги форматирования
+    закрываются в конце части и снова открываются в начале следующей (с учётом длины).
 
     :param text: Входной текст, который нужно разделить.
     :param max_length: Максимальная длина одной части текста.
+    :param html: Текст содержит HTML-разметку (parse_mode='HTML').
     :return: Список строк, каждая из которых не превышает max_length.
     """
-    # Список для хранения частей текста
+    if not text:
+        return []
+
+    # Есть ли символы, занимающие две кодовые единицы UTF-16 (большинство эмодзи)
+    astral = _is_astral(max(text))
+    if (text_length(text) if astral else len(text)) <= max_length:
+        return [text]
+
+    tokens = _html_tokens(text) if html else []
+    # Открытые теги в начале текущей части и индекс первого не применённого тега
+    stack: List[Tuple[str, str]] = []
+    first = 0
+
     parts = []
+    start = 0
+    while start < len(text):
+        prefix = "".join(tag for _, tag in stack)
+        reserve = 0
+        while True:
+            budget = max_length - text_length(prefix) - reserve
+            end = _window_end(text, start, budget, astral)
+            cut, next_start = _break_point(text, start, end)
+            if tokens:
+                html_cut = _html_cut(text, tokens, first, start, cut, end)
+                if html_cut != cut:
+                    cut = next_start = html_cut
 
-    # Пока длина текста больше максимальной длины, разделяем его
-    while len(text) > max_length:
-        # Разбиваем текст на части
-        part = text[:max_length]
-        parts.append(part)
-        text = text[max_length:]  # Оставшийся текст для следующей итерации
+            # Теги, открытые на момент разреза, закрываются в конце части
+            state = list(stack)
+            next_first = _apply_tags(state, tokens, first, cut)
+            suffix = "".join(f"</{name}>" for name, _ in reversed(state))
+            if not suffix or text_length(suffix) <= reserve or budget <= 0:
+                break
+            reserve = text_length(suffix)
 
-    # Добавляем оставшийся текст, если он есть
-    if text:
-        parts.append(text)
+        if cut <= start:
+            # Разметка не помещается в часть — режем по длине
+            cut = next_start = max(_window_end(text, start, max_length, astral), start + 1)
+            suffix = prefix = ""
+            state = list(stack)
+            next_first = _apply_tags(state, tokens, first, cut)
+
+        parts.append(prefix + text[start:cut] + suffix)
+        stack, first = state, next_first
+        start = next_start
 
     return parts
 
@@ -35,3 +227,23 @@ def normalize_whitespace(text: str) -> str:
     :return: Форматированный текст.
     """
     return ' '.join(re.split(r'\s+', text.strip()))
+
+
+def split_items(text: str, separator: str = ',') -> List[str]:
+    """
+    Разделяет строку-список на элементы без пробелов по краям.
+    Пустые элементы и повторы отбрасываются, порядок сохраняется.
+
+    :param text: Входящий текст (например, 'a@mail.ru, b@mail.ru').
+    :param separator: Разделитель элементов.
+    :return: Список уникальных элементов.
+    """
+    items = []
+    seen = set()
+    for item in text.split(separator):
+        item = item.strip()
+        if item and item not in seen:
+            seen.add(item)
+            items.append(item)
+
+    return items
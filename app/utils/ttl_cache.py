@@ -0,0 +1,83 @@
+"""
+Потокобезопасный кэш значений с ограниченным временем жизни (TTL) и размером (LRU).
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+# Признак отсутствующего значения
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Кэш значений по ключу: значение считается отсутствующим через ttl секунд после записи,
+    при превышении max_size вытесняется запись, к которой дольше всего не обращались.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 1024, clock: Callable[[], float] = time.monotonic):
+        """
+        :param ttl: Время жизни значения (в секундах).
+        :param max_size: Максимальное количество записей.
+        :param clock: Источник текущего времени (в секундах).
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Записи: {ключ: (момент устаревания, значение)}
+        self._items: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Получить значение по ключу.
+
+        :param key: Ключ.
+        :param default: Значение, если записи нет или она устарела.
+        :return: Значение.
+        """
+        with self._lock:
+            item = self._items.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            if item[0] <= self._clock():
+                del self._items[key]
+                return default
+            self._items.move_to_end(key)
+            return item[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Записать значение по ключу.
+
+        :param key: Ключ.
+        :param value: Значение.
+        """
+        with self._lock:
+            self._items[key] = (self._clock() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """
+        Удалить запись по ключу.
+
+        :param key: Ключ.
+        :return: Удалённое значение или None.
+        """
+        with self._lock:
+            item = self._items.pop(key, None)
+            return item[1] if item is not None else None
+
+    def clear(self) -> None:
+        """
+        Удалить все записи.
+        """
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
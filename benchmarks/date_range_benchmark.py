@@ -0,0 +1,80 @@
+"""
+Сравнение поиска по дате через date(col) = ... и через полуоткрытый интервал col >= ... AND col < ...
+
+Запуск из корня проекта (нужен .env, как и для самого приложения):
+    python -m benchmarks.date_range_benchmark [количество записей]
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, select, func, text
+from sqlalchemy.orm import sessionmaker
+from app import db
+
+
+def _populate(session, rows: int):
+    """
+    Заполнить базу подписками с granted_at, равномерно распределённым по году.
+    """
+    chat_type = db.ChatType(type="private")
+    notification_type = db.NotificationType(type="bench", description="Benchmark")
+    session.add_all([chat_type, notification_type])
+    session.flush()
+
+    start = datetime(2024, 1, 1)
+    step = timedelta(days=365) / rows
+    session.execute(db.Chat.__table__.insert(), [
+        {"id": i, "email": f"chat{i}@example.com", "chat_type": chat_type.id} for i in range(1, rows + 1)
+    ])
+    session.execute(db.NotificationSubscriber.__table__.insert(), [
+        {"chat_id": i, "notification_type": notification_type.id, "granted_by": "bench",
+         "granted_at": start + step * i}
+        for i in range(1, rows + 1)
+    ])
+    session.commit()
+
+
+def _measure(session, stmt, repeat: int = 50):
+    """
+    Выполнить запрос repeat раз и вернуть (среднее время в мс, количество строк, план запроса).
+    """
+    compiled = stmt.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+    plan = [row[-1] for row in session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        rows = session.execute(stmt).all()
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+    return elapsed, len(rows), plan
+
+
+def main(rows: int = 100000):
+    engine = create_engine("sqlite:///:memory:")
+    db.Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, future=True)()
+    _populate(session, rows)
+
+    col = db.NotificationSubscriber.granted_at
+    day_start, day_end = datetime(2024, 5, 17), datetime(2024, 5, 18)
+    variants = {
+        "date(col) = day": select(db.NotificationSubscriber.id).where(func.date(col) == day_start.date()),
+        "col >= start AND col < end": select(db.NotificationSubscriber.id).where(
+            col >= day_start, col < day_end
+        ),
+        "find_records(partial_match)": None,
+    }
+
+    print(f"Records: {rows}")
+    for name, stmt in variants.items():
+        if stmt is None:
+            started = time.perf_counter()
+            found = db.crud.find_records(session, db.NotificationSubscriber, {"granted_at": "2024-05-17"},
+                                         partial_match=True)
+            print(f"{name:32} {(time.perf_counter() - started) * 1000:8.3f} ms  rows={len(found)}")
+            continue
+        elapsed, count, plan = _measure(session, stmt)
+        print(f"{name:32} {elapsed:8.3f} ms  rows={count}  plan={'; '.join(plan)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,83 @@
+"""
+Скорость форматирования страниц записей через format_for_chat (записей в секунду).
+
+Для каждой конфигурации MODEL_FORMATS форматируются страницы записей,
+уже загруженных в сессию, поэтому измеряется только форматирование, а не запросы к базе.
+
+Запуск из корня проекта (нужен .env, как и для самого приложения):
+    python -m benchmarks.format_benchmark [количество записей]
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app import db
+from app.utils.db_records_format import MODEL_FORMATS, format_for_chat
+
+
+def _populate(session, rows: int):
+    """
+    Заполнить базу чатами, пользователями, группами, администраторами и подписками.
+    """
+    private = db.ChatType(type="private")
+    group = db.ChatType(type="group")
+    notification_type = db.NotificationType(type="bench", description="Benchmark")
+    session.add_all([private, group, notification_type])
+    session.flush()
+
+    start = datetime(2024, 1, 1)
+    session.execute(db.Chat.__table__.insert(), [
+        {"id": i, "email": f"chat{i}@example.com", "chat_type": private.id if i % 2 else group.id}
+        for i in range(1, rows + 1)
+    ])
+    session.execute(db.User.__table__.insert(), [
+        {"id": i, "chat_id": i, "first_name": f"First{i}", "last_name": f"Last{i}"}
+        for i in range(1, rows + 1, 2)
+    ])
+    session.execute(db.Group.__table__.insert(), [
+        {"id": i, "chat_id": i, "title": f"Group {i}"} for i in range(2, rows + 1, 2)
+    ])
+    session.execute(db.Administrator.__table__.insert(), [
+        {"user_id": i, "granted_by": "bench", "granted_at": start + timedelta(minutes=i)}
+        for i in range(1, rows + 1, 2)
+    ])
+    session.execute(db.NotificationSubscriber.__table__.insert(), [
+        {"chat_id": i, "notification_type": notification_type.id, "granted_by": "bench",
+         "granted_at": start + timedelta(minutes=i)}
+        for i in range(1, rows + 1)
+    ])
+    session.commit()
+
+
+def _measure(records: list, model_fields, page_size: int, repeat: int) -> float:
+    """
+    Отформатировать все записи постранично repeat раз и вернуть скорость (записей в секунду).
+    """
+    pages = [records[i:i + page_size] for i in range(0, len(records), page_size)]
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            format_for_chat(page, model_fields=model_fields)
+    return len(records) * repeat / (time.perf_counter() - started)
+
+
+def main(rows: int = 10000, repeat: int = 5):
+    engine = create_engine("sqlite:///:memory:")
+    db.Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, future=True)()
+    _populate(session, rows)
+
+    print(f"Records: {rows}, repeat: {repeat}")
+    for model, model_fields, page_size in MODEL_FORMATS:
+        records = session.query(model).all()
+        # Прогрев: ленивые связи загружаются до замера, чтобы запросы к базе не попали в него
+        for record in records:
+            format_for_chat(record, model_fields=model_fields)
+
+        speed = _measure(records, model_fields, page_size, repeat)
+        print(f"{model.__tablename__:28} {len(records):7}  {speed:12,.0f} records/sec")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,57 @@
+"""
+Сравнение формирования текста уведомления Zabbix по шаблону и через format_json_to_str.
+
+Запуск из корня проекта (нужен .env, как и для самого приложения):
+    python -m benchmarks.template_benchmark [количество повторов]
+"""
+import sys
+import time
+from app.utils import json_format
+from app.utils.message_templates import MessageTemplates, TEMPLATES_DIRECTORY
+
+# Данные события, как их отправляет media type Zabbix
+EVENT = {
+    "event_type": "problem",
+    "event_id": "4512873",
+    "subject": "Problem: High CPU utilization (over 90% for 5m)",
+    "message": "Problem started at 10:15:32 on 2024.05.17\nProblem name: High CPU utilization\nOperational data: 97 %",
+    "host": "db-server-01",
+    "host_ip": "10.0.12.45",
+    "severity": "High",
+    "event_time": "2024.05.17 10:15:32",
+    "trigger_id": "23711",
+    "trigger_url": "{TRIGGER.URL}",
+    "host_groups": "Databases, Linux servers",
+    "tags": {"service": "postgres", "env": "prod", "team": "dba"},
+    "opdata": "97 %",
+}
+
+
+def _measure(render, repeat: int) -> float:
+    """
+    Выполнить render repeat раз и вернуть среднее время в микросекундах.
+    """
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render(EVENT)
+    return (time.perf_counter() - started) / repeat * 1000000
+
+
+def main(repeat: int = 100000):
+    templates = MessageTemplates(TEMPLATES_DIRECTORY)
+    render = templates.get("zabbix", EVENT["event_type"])
+
+    variants = {
+        "format_json_to_str": json_format.format_json_to_str,
+        "template (compiled)": render,
+        "template (with lookup)": lambda data: templates.render("zabbix", data),
+    }
+
+    print(f"Repeat: {repeat}")
+    for name, func in variants.items():
+        elapsed = _measure(func, repeat)
+        print(f"{name:24} {elapsed:8.2f} us/message  length={len(func(EVENT))}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
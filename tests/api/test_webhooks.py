@@ -3,7 +3,9 @@ from unittest.mock import patch
 
 from app.api.base import app
 from app.core.bot_setup import app as bot_app
-from app.core.environment import WEBHOOK_EVENT_ENDPOINT
+from app.api.monitoring import HANDLER_STATS_ENDPOINT
+from app.core.environment import WEBHOOK_EVENT_ENDPOINT, METRICS_ENDPOINT
+from app.utils.flapping import FlapTracker, UPDATE_FLAPPING
 
 
 client = TestClient(app)
@@ -30,3 +32,67 @@ def test_handle_webhook_success(mock_send):
     assert args[1].name == "ZABBIX"
     assert "CPU load is high" in args[2]
     assert "server1" in args[2]
+
+
+@patch("app.bot_handlers.send_notification_to_subscribers")
+def test_handle_webhook_payload_without_template_fields(mock_send):
+    payload = {"event_type": "problem", "Subject": "Disk is full", "Host": "server2", "event_id": "123"}
+
+    response = client.post(WEBHOOK_EVENT_ENDPOINT, json=payload)
+
+    assert response.status_code == 200
+    text = mock_send.call_args[0][2]
+    # Поля, не упомянутые в шаблоне, не теряются
+    for value in ("Disk is full", "server2", "123"):
+        assert value in text
+
+
+@patch("app.bot_handlers.send_flapping_updates")
+@patch("app.bot_handlers.send_notification_to_subscribers")
+def test_handle_webhook_flapping_trigger(mock_send, mock_flapping):
+    tracker = FlapTracker(window=60, flap_threshold=2, recovery_threshold=0)
+    with patch("app.bot_handlers.zabbix_flapping", tracker):
+        for state in ("problem", "recovery", "problem", "recovery"):
+            response = client.post(WEBHOOK_EVENT_ENDPOINT, json={"trigger_id": "1", "event_type": state})
+            assert response.status_code == 200
+
+    # третье событие объявляет дребезг, четвёртое подавляется
+    assert mock_send.call_count == 2
+    mock_flapping.assert_called_once()
+    assert mock_flapping.call_args[0][1][0].kind == UPDATE_FLAPPING
+
+
+def test_handler_stats_endpoint():
+    response = client.get(HANDLER_STATS_ENDPOINT)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert isinstance(body["handlers"], dict)
+    assert {"running", "queued", "processed"} <= set(body["dispatcher"])
+
+
+@patch("app.bot_handlers.send_notification_to_subscribers")
+def test_metrics_endpoint_reports_webhooks(mock_send):
+    client.post(WEBHOOK_EVENT_ENDPOINT, json={"trigger": "CPU load is high"})
+
+    response = client.get(METRICS_ENDPOINT)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'webhook_requests_total{result="delivered"}' in response.text
+    assert "webhook_request_duration_seconds_count" in response.text
+    assert "executor_queue_depth" in response.text
+
+
+def test_health_endpoints_report_snapshot():
+    from app.api.monitoring import health_monitor
+
+    health_monitor.refresh()
+    readyz = client.get("/readyz")
+    healthz = client.get("/healthz")
+
+    # Бот в тестах не опрашивает события
+    assert readyz.status_code == 503
+    assert healthz.status_code == 503
+    assert healthz.json()["checks"]["polling"]["alive"] is False
+    assert readyz.json()["checks"]["database"]["ok"] is True
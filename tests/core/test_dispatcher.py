@@ -0,0 +1,111 @@
+import threading
+import time
+from bot.event import Event, EventType
+from bot.handler import HandlerBase
+from app.core.bot_extensions import ConcurrentDispatcher, install_concurrent_dispatcher
+
+
+def message(chat_id: str, text: str) -> Event:
+    return Event(EventType.NEW_MESSAGE, {"msgId": text, "text": text, "chat": {"chatId": chat_id, "type": "private"}})
+
+
+class FakeBot:
+    def __init__(self):
+        self.dispatcher = None
+
+
+def test_events_of_one_chat_are_processed_in_order():
+    handled = []
+
+    def callback(bot, event):
+        time.sleep(0.001)
+        handled.append((event.from_chat, int(event.text)))
+
+    dispatcher = ConcurrentDispatcher(FakeBot(), max_workers=4)
+    dispatcher.add_handler(HandlerBase(callback=callback))
+    for i in range(50):
+        for chat_id in ("a", "b", "c"):
+            dispatcher.dispatch(message(chat_id, str(i)))
+    dispatcher.shutdown()
+
+    for chat_id in ("a", "b", "c"):
+        assert [i for chat, i in handled if chat == chat_id] == list(range(50))
+    assert dispatcher.stats()["processed"] == 150
+
+
+def test_different_chats_are_processed_concurrently():
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    def callback(bot, event):
+        started.release()
+        release.wait(5)
+
+    dispatcher = ConcurrentDispatcher(FakeBot(), max_workers=2)
+    dispatcher.add_handler(HandlerBase(callback=callback))
+    dispatcher.dispatch(message("a", "1"))
+    dispatcher.dispatch(message("b", "1"))
+    dispatcher.dispatch(message("a", "2"))
+
+    assert started.acquire(timeout=5) and started.acquire(timeout=5)
+    stats = dispatcher.stats()
+    assert stats["running"] == 2
+    assert stats["queued"] == 1
+    assert stats["chats"] == 2
+    assert stats["max_chat_queued"] == 1
+
+    release.set()
+    dispatcher.shutdown()
+    stats = dispatcher.stats()
+    assert (stats["running"], stats["queued"], stats["chats"], stats["processed"]) == (0, 0, 0, 3)
+
+
+def test_dispatch_blocks_when_queue_is_full():
+    release = threading.Event()
+
+    dispatcher = ConcurrentDispatcher(FakeBot(), max_workers=1, max_queued=1)
+    dispatcher.add_handler(HandlerBase(callback=lambda bot, event: release.wait(5)))
+    dispatcher.dispatch(message("a", "1"))
+    dispatcher.dispatch(message("a", "2"))
+
+    producer = threading.Thread(target=dispatcher.dispatch, args=(message("a", "3"),))
+    producer.start()
+    producer.join(0.1)
+    assert producer.is_alive()
+
+    release.set()
+    producer.join(5)
+    dispatcher.shutdown()
+    assert dispatcher.stats()["processed"] == 3
+
+
+def test_handler_exception_does_not_stop_chat_queue():
+    handled = []
+
+    def callback(bot, event):
+        if event.text == "1":
+            raise RuntimeError("boom")
+        handled.append(event.text)
+
+    dispatcher = ConcurrentDispatcher(FakeBot(), max_workers=1)
+    dispatcher.add_handler(HandlerBase(callback=callback))
+    dispatcher.dispatch(message("a", "1"))
+    dispatcher.dispatch(message("a", "2"))
+    dispatcher.shutdown()
+
+    assert handled == ["2"]
+
+
+def test_install_keeps_existing_handlers():
+    from bot.dispatcher import Dispatcher
+
+    bot = FakeBot()
+    bot.dispatcher = Dispatcher(bot)
+    handler = HandlerBase()
+    bot.dispatcher.add_handler(handler)
+
+    dispatcher = install_concurrent_dispatcher(bot, max_workers=2)
+    assert bot.dispatcher is dispatcher
+    assert dispatcher.handlers == [handler]
+    assert install_concurrent_dispatcher(bot) is dispatcher
+    dispatcher.shutdown()
@@ -0,0 +1,61 @@
+import threading
+import pytest
+from app.core import executor_pool
+from app.core.executor_pool import BoundedExecutor, ExecutorRegistry, PoolConfig, RejectedTaskError
+
+
+def blocked_executor(policy):
+    """Пул из одного потока, занятого до установки события."""
+    executor = BoundedExecutor("test", max_workers=1, max_queued=2, policy=policy)
+    release, started = threading.Event(), threading.Event()
+    executor.submit(lambda: (started.set(), release.wait()))
+    started.wait(1)
+    return executor, release
+
+
+def test_abort_policy_rejects_when_queue_is_full():
+    executor, release = blocked_executor(executor_pool.POLICY_ABORT)
+    queued = [executor.submit(lambda i=i: i) for i in range(2)]
+    assert executor.stats()["queue_depth"] == 2
+    assert executor.stats()["utilization"] == 1.0
+
+    with pytest.raises(RejectedTaskError):
+        executor.submit(lambda: None)
+
+    release.set()
+    assert [future.result(1) for future in queued] == [0, 1]
+    executor.shutdown(wait=True)
+    assert executor.stats()["queue_depth"] == 0
+    assert executor.stats()["rejected"] >= 1
+
+
+def test_caller_runs_policy_runs_task_in_submitting_thread():
+    executor, release = blocked_executor(executor_pool.POLICY_CALLER_RUNS)
+    for _ in range(2):
+        executor.submit(lambda: None)
+
+    future = executor.submit(threading.current_thread)
+    assert future.done() and future.result() is threading.current_thread()
+
+    release.set()
+    executor.shutdown(wait=True)
+    with pytest.raises(ValueError):
+        BoundedExecutor("test", 1, 1, policy="drop")
+
+
+def test_registry_isolates_workloads():
+    registry = ExecutorRegistry({
+        "alerts": PoolConfig(max_workers=3, max_queued=10, policy=executor_pool.POLICY_CALLER_RUNS),
+        "logs": PoolConfig(max_workers=1, max_queued=1, policy=executor_pool.POLICY_ABORT),
+    })
+    assert registry.stats() == {}
+
+    alerts, logs = registry.get("alerts"), registry.get("logs")
+    assert alerts is registry.get("alerts") and alerts is not logs
+    assert registry.stats()["alerts"]["max_workers"] == 3
+    assert registry.stats()["logs"]["policy"] == executor_pool.POLICY_ABORT
+    with pytest.raises(KeyError):
+        registry.get("unknown")
+
+    registry.shutdown()
+    assert all(stats["shutdown"] for stats in registry.stats().values())
@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import create_engine, text
+from app.core.handler_metrics import HandlerMetrics, handler_metrics
+
+
+def test_instrument_records_calls_and_errors():
+    metrics = HandlerMetrics()
+    handler = metrics.instrument("/test", lambda fail: 1 / 0 if fail else "ok")
+
+    assert handler(False) == "ok"
+    with pytest.raises(ZeroDivisionError):
+        handler(True)
+
+    stats = metrics.snapshot()["/test"]
+    assert (stats["count"], stats["errors"]) == (2, 1)
+    assert sum(stats["histogram"].values()) == 2
+    assert stats["p50_ms"] <= stats["p95_ms"] <= stats["max_ms"]
+
+
+def test_instrument_is_idempotent_and_marks_caught_errors():
+    metrics = HandlerMetrics()
+
+    def handler():
+        metrics.mark_error()
+
+    instrumented = metrics.instrument("handler", handler)
+    assert metrics.instrument("handler", instrumented) is instrumented
+
+    instrumented()
+    assert metrics.snapshot()["handler"]["errors"] == 1
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_db_and_api_time_are_attributed_to_current_handler():
+    engine = create_engine("sqlite://")
+
+    def handler():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        handler_metrics.add_api_time(0.5)
+
+    handler_metrics.reset()
+    handler_metrics.instrument("handler", handler)()
+    # Вне обработчика время не учитывается
+    handler_metrics.add_api_time(1.0)
+
+    stats = handler_metrics.snapshot()["handler"]
+    assert stats["db_ms"] > 0
+    assert stats["api_ms"] == 500.0
+    handler_metrics.reset()
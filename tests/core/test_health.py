@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+from sqlalchemy import create_engine
+from app.core import health
+
+
+class FakeResponse:
+    ok = True
+
+
+def test_polling_probe_tracks_heartbeat():
+    heartbeat = health.Heartbeat()
+    bot = SimpleNamespace(running=True, poll_time_s=60, timeout_s=20, events_get=lambda: FakeResponse())
+    probe = health.polling_probe(bot, heartbeat)
+
+    assert probe()["alive"] is False
+
+    health.install_polling_heartbeat(bot, heartbeat)
+    health.install_polling_heartbeat(bot, heartbeat)
+    bot.events_get()
+    result = probe()
+    assert result["alive"] and result["ok"]
+
+    bot.running = False
+    assert probe()["alive"] is False
+
+
+def test_executor_probe_reports_saturation():
+    stats = {"queue_depth": 50, "threads": 4, "max_workers": 4, "shutdown": False}
+    probe = health.executor_probe(lambda: stats)
+
+    result = probe()
+    assert result["alive"] and not result["ok"]
+    assert result["saturation"] == 12.5
+
+    stats.update(queue_depth=0, shutdown=True)
+    assert probe()["alive"] is False
+    assert health.executor_probe(lambda: None)()["ok"] is True
+
+
+def test_database_and_breaker_probes():
+    assert health.database_probe(create_engine("sqlite://"))()["ok"] is True
+    assert health.breaker_probe(SimpleNamespace(current_state="open"))()["ok"] is False
+    assert health.breaker_probe(SimpleNamespace(current_state="closed"))()["ok"] is True
+
+
+def test_monitor_status_uses_snapshot():
+    calls = []
+
+    def probe():
+        calls.append(1)
+        return {"alive": True, "ok": False}
+
+    monitor = health.HealthMonitor({"probe": probe, "broken": lambda: 1 / 0}, interval=5)
+    assert monitor.status(readiness=False)["healthy"] is False
+
+    monitor.refresh()
+    liveness = monitor.status(readiness=False)
+    assert liveness["checks"]["broken"]["alive"] is False
+    assert liveness["healthy"] is False
+
+    monitor.probes.pop("broken")
+    monitor.refresh()
+    assert monitor.status(readiness=False)["healthy"] is True
+    assert monitor.status(readiness=True)["healthy"] is False
+    assert len(calls) == 2
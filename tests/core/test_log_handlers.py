@@ -0,0 +1,89 @@
+import gzip
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timedelta
+import pytest
+from unittest.mock import patch
+from app.core import log_context
+from app.core.log_handlers import CompressingRotatingFileHandler, JsonFormatter
+
+
+def make_record(msg, level=logging.ERROR, exc_info=None):
+    return logging.LogRecord("test", level, __file__, 1, msg, None, exc_info)
+
+
+def test_json_formatter_includes_context_and_exception():
+    context_filter = log_context.ContextFilter()
+    with log_context.bind(chat_id="chat@example.com", command="/status", event_id="42"):
+        try:
+            raise KeyError("boom")
+        except KeyError:
+            record = make_record("failed", exc_info=sys.exc_info())
+        context_filter.filter(record)
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "failed"
+    assert (entry["chat_id"], entry["command"], entry["event_id"]) == ("chat@example.com", "/status", "42")
+    assert entry["latency_ms"] >= 0
+    assert entry["exc_type"] == "KeyError"
+
+    record = make_record("outside")
+    context_filter.filter(record)
+    assert "chat_id" not in json.loads(JsonFormatter().format(record))
+
+
+def test_command_of():
+    assert log_context.command_of("/notify_on zabbix") == "/notify_on"
+    assert log_context.command_of("hello") is None
+    assert log_context.command_of(None) is None
+
+
+def test_rotation_by_size_compresses_and_prunes(tmp_path):
+    path = str(tmp_path / "app.log")
+    handler = CompressingRotatingFileHandler(path, max_bytes=100, backup_count=2, when=None)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for i in range(5):
+        handler.handle(make_record(f"{i}" * 80))
+    handler.close()
+
+    rotated = [name for name in os.listdir(tmp_path) if name != "app.log"]
+    assert len(rotated) == 2
+    assert all(name.endswith(".gz") for name in rotated)
+    contents = set()
+    for name in rotated:
+        with gzip.open(os.path.join(tmp_path, name), "rt") as file:
+            contents.add(file.read())
+    # Хранятся две последние ротированные части
+    assert contents == {"2" * 80 + "\n", "3" * 80 + "\n"}
+
+
+def test_rotation_names_are_not_reused_after_pruning(tmp_path):
+    path = str(tmp_path / "app.log")
+    handler = CompressingRotatingFileHandler(path, max_bytes=100, backup_count=1, when=None, compress=False)
+    # Все ротации в одну секунду: удалённые старые файлы не должны освобождать свои имена
+    with patch("app.core.log_handlers.datetime") as clock:
+        clock.now.return_value = datetime(2026, 1, 1, 12, 0, 0)
+        for i in range(4):
+            handler.handle(make_record(f"{i}" * 80))
+    handler.close()
+
+    rotated = [name for name in os.listdir(tmp_path) if name != "app.log"]
+    assert len(rotated) == 1
+    with open(os.path.join(tmp_path, rotated[0])) as file:
+        assert file.read() == "2" * 80 + "\n"
+
+
+def test_rotation_by_time(tmp_path):
+    path = str(tmp_path / "app.log")
+    handler = CompressingRotatingFileHandler(path, max_bytes=0, backup_count=5, when="hourly", compress=False)
+    handler.handle(make_record("before"))
+    handler.rollover_at = datetime.now() - timedelta(seconds=1)
+    handler.handle(make_record("after"))
+    handler.close()
+
+    assert handler.rollover_at > datetime.now()
+    assert len(os.listdir(tmp_path)) == 2
+    with pytest.raises(ValueError):
+        CompressingRotatingFileHandler(path, max_bytes=0, backup_count=1, when="weekly")
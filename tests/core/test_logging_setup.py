@@ -0,0 +1,79 @@
+import logging
+import queue
+import sys
+import time
+from unittest.mock import patch
+import pytest
+from app.core.logging_setup import BoundedQueueHandler, BotChatLoggingHandler, LogQueueListener, LOG_RECORDS_DROPPED
+from app.utils.error_digest import ErrorDigest
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_record(msg, *args, level=logging.ERROR, exc_info=None):
+    return logging.LogRecord("test", level, __file__, 1, msg, args, exc_info)
+
+
+def test_drop_policy_counts_dropped_records():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2))
+    dropped_before = LOG_RECORDS_DROPPED.value(level="WARNING")
+
+    for i in range(5):
+        handler.handle(make_record("record %d", i, level=logging.WARNING))
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    assert LOG_RECORDS_DROPPED.value(level="WARNING") - dropped_before == 3
+
+
+def test_block_policy_waits_then_drops():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), policy="block", block_timeout=0.01)
+    handler.handle(make_record("first"))
+    handler.handle(make_record("second"))
+
+    assert handler.dropped == 1
+    with pytest.raises(ValueError):
+        BoundedQueueHandler(queue.Queue(), policy="unknown")
+
+
+def test_listener_delivers_records_with_exception_info():
+    log_queue = queue.Queue(maxsize=10)
+    collector = CollectingHandler()
+    listener = LogQueueListener(log_queue, collector, respect_handler_level=True)
+    listener.start()
+
+    handler = BoundedQueueHandler(log_queue)
+    try:
+        raise KeyError("boom")
+    except KeyError:
+        handler.handle(make_record("failed %s", "chat@example.com", exc_info=sys.exc_info()))
+    listener.stop()
+
+    record, = collector.records
+    assert record.getMessage() == "failed chat@example.com"
+    assert record.exc_info[0] is KeyError
+
+
+def test_bot_chat_handler_sends_repeated_errors_as_digest():
+    handler = BotChatLoggingHandler(bot=None, digest=ErrorDigest(window=0.05), flush_interval=3600)
+    with patch("app.core.logging_setup.notifications.send_notification_to_subscribers") as send:
+        for chat in ("a@mail.ru", "b@mail.ru", "c@mail.ru"):
+            record = make_record("❌ Retry failed for chat %s", chat)
+            BoundedQueueHandler(queue.Queue()).prepare(record)
+            handler.handle(record)
+        assert send.call_count == 1
+        assert send.call_args[1]["cache_subscribers"] is True
+
+        time.sleep(0.06)
+        handler.flush_digests()
+        handler.close()
+
+    assert send.call_count == 2
+    assert "Не отправлено повторов ошибки: 2" in send.call_args[0][2]
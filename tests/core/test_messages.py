@@ -0,0 +1,20 @@
+from unittest.mock import patch
+from app.core import executor_pool
+from app.core.bot_extensions import messages
+
+
+def test_log_broadcasts_use_own_rate_limiter_and_breaker():
+    sent = []
+    with patch.object(messages, "send_long_text", side_effect=lambda **kwargs: sent.append(kwargs["chat_id"])), \
+            patch.object(messages.DEFAULT_BREAKER, "call", wraps=messages.DEFAULT_BREAKER.call) as default_call, \
+            patch.object(messages.LOGS_BREAKER, "call", wraps=messages.LOGS_BREAKER.call) as logs_call:
+        messages.broadcast_to_chats(bot=None, chat_ids=["a@example.com"], text="error",
+                                    wait_for_completion=True, workload=executor_pool.WORKLOAD_LOGS)
+        assert logs_call.call_count == 1 and default_call.call_count == 0
+
+        messages.broadcast_to_chats(bot=None, chat_ids=["b@example.com"], text="alert",
+                                    wait_for_completion=True, workload=executor_pool.WORKLOAD_ALERTS)
+        assert logs_call.call_count == 1 and default_call.call_count == 1
+
+    assert sent == ["a@example.com", "b@example.com"]
+    assert messages.WORKLOAD_PROTECTION[executor_pool.WORKLOAD_LOGS][0] is not messages.DEFAULT_RATE_LIMITER
@@ -0,0 +1,62 @@
+import threading
+import pytest
+from app.core.metrics import Registry
+
+
+def test_counter_sums_values_from_all_threads():
+    registry = Registry()
+    counter = registry.counter("sent", "Sent messages.", ("result",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc(result="ok")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(2, result="failed")
+
+    assert counter.value(result="ok") == 4000
+    assert 'sent_total{result="ok"} 4000' in registry.render()
+    assert 'sent_total{result="failed"} 2' in registry.render()
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 3' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+    assert "latency_seconds_sum 4.05" in lines
+    assert "latency_seconds_count 4" in lines
+
+
+def test_gauge_value_and_function():
+    registry = Registry()
+    registry.gauge("queue_depth", "Queue depth.", function=lambda: 7)
+    registry.gauge("breaker_state", "Breaker state.", ("name",)).set(2, name="default")
+    registry.gauge("broken", "Broken gauge.", function=lambda: 1 / 0)
+
+    text = registry.render()
+    assert "queue_depth 7" in text
+    assert 'breaker_state{name="default"} 2' in text
+    assert "# ERROR broken" in text
+
+
+def test_labels_and_names_are_validated():
+    registry = Registry()
+    counter = registry.counter("events", "Events.", ("kind",))
+
+    with pytest.raises(ValueError):
+        counter.inc()
+    with pytest.raises(ValueError):
+        counter.inc(other="x")
+    with pytest.raises(ValueError):
+        registry.counter("events", "Duplicate.")
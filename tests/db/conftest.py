@@ -1,9 +1,19 @@
 import pytest
-from sqlalchemy import create_engine
+from typing import Any, NamedTuple
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app import db
 
 
+class ExecutedStatement(NamedTuple):
+    # Текст SQL-запроса
+    sql: str
+    # Параметры запроса
+    parameters: Any
+    # Выполнен ли запрос для набора параметров (executemany)
+    executemany: bool
+
+
 @pytest.fixture(scope="function")
 def test_engine():
     engine = create_engine("sqlite:///:memory:", echo=False)
@@ -18,3 +28,18 @@ def session(test_engine):
     session = Session()
     yield session
     session.close()
+
+
+@pytest.fixture(scope="function")
+def statements(test_engine):
+    """
+    Запросы, выполненные тестовым движком (список ExecutedStatement).
+    """
+    executed = []
+
+    def before_cursor_execute(_conn, _cursor, statement, parameters, _context, executemany):
+        executed.append(ExecutedStatement(statement, parameters, executemany))
+
+    event.listen(test_engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    event.remove(test_engine, "before_cursor_execute", before_cursor_execute)
@@ -38,3 +38,20 @@ def test_delete_administrator(session, test_user):
 
 def test_delete_administrator_none(session):
     assert db.crud.delete_administrator(session, None) is False
+
+
+def test_create_administrators_skips_existing(session, test_user):
+    chat = db.Chat(email="second_admin@example.com", chat_type=test_user.chat.chat_type)
+    second_user = db.User(first_name="Second", chat=chat)
+    session.add_all([chat, second_user])
+    session.commit()
+    db.crud.create_administrator(session, test_user, "system", datetime.utcnow())
+
+    granted = db.crud.create_administrators(session, [test_user, second_user], "system", datetime.utcnow())
+
+    assert granted == [second_user]
+    assert db.crud.count_records(session, db.Administrator) == 2
+
+
+def test_create_administrators_empty(session):
+    assert db.crud.create_administrators(session, [], "system", datetime.utcnow()) == []
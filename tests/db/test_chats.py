@@ -1,6 +1,7 @@
 import pytest
 from sqlalchemy.orm import Session
-from app.db.models import ChatType
+from datetime import datetime
+from app.db.models import ChatType, User, Group, Administrator
 from app.db import crud
 
 
@@ -94,3 +95,40 @@ def test_delete_chat_by_data_with_email(session: Session, chat_type: ChatType):
 def test_delete_chat_by_data_not_found(session: Session):
     assert crud.delete_chat_by_data(session, "missing@example.com") is False
     assert crud.delete_chat_by_data(session, 99999) is False
+
+
+def test_find_chats(session: Session, chat_type: ChatType):
+    first = crud.create_chat(session, "first@example.com", chat_type)
+    second = crud.create_chat(session, "second@example.com", chat_type)
+
+    found = crud.find_chats(session, ["first@example.com", second.id, "missing@example.com"])
+    assert {chat.id for chat in found} == {first.id, second.id}
+    assert crud.find_chats(session, []) == []
+
+
+def test_find_chats_invalid_identifier(session: Session):
+    with pytest.raises(TypeError):
+        crud.find_chats(session, [3.14])
+
+
+def test_delete_chats_with_dependents(session: Session, chat_type: ChatType):
+    first = crud.create_chat(session, "bulk1@example.com", chat_type)
+    second = crud.create_chat(session, "bulk2@example.com", chat_type)
+    kept = crud.create_chat(session, "kept@example.com", chat_type)
+    user = crud.create_user(session, first, "First", None)
+    crud.create_administrator(session, user, "system", datetime.utcnow())
+    crud.create_group(session, second, "Group")
+
+    deleted = crud.delete_chats(session, [first, second])
+    session.expire_all()
+
+    assert deleted == 2
+    assert crud.find_chats(session, ["bulk1@example.com", "bulk2@example.com"]) == []
+    assert crud.find_chat(session, kept.id) is not None
+    assert crud.count_records(session, User) == 0
+    assert crud.count_records(session, Group) == 0
+    assert crud.count_records(session, Administrator) == 0
+
+
+def test_delete_chats_empty(session: Session):
+    assert crud.delete_chats(session, []) == 0
@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy.orm import Session
+from app.db.models import ChatType, Chat
+from app.db import crud, fulltext
+
+
+@pytest.fixture
+def fts_engine(test_engine):
+    with test_engine.begin() as connection:
+        installed = fulltext.install_fulltext(connection)
+    if "chats" not in installed:
+        pytest.skip("SQLite is built without FTS5 trigram tokenizer")
+    return test_engine
+
+
+@pytest.fixture
+def chats(fts_engine, session: Session):
+    chat_type = ChatType(type="private")
+    session.add(chat_type)
+    session.commit()
+    return [
+        crud.create_chat(session, email, chat_type)
+        for email in ("Alice@example.com", "bob@example.com", "malice@test.ru")
+    ]
+
+
+def test_indexed_columns_from_model_formats():
+    columns = fulltext.indexed_columns()
+    assert columns["chats"] == ("id", ["email"])
+    assert columns["users"] == ("id", ["first_name", "last_name"])
+    assert "notification_subscribers" not in columns
+
+
+def test_partial_match_uses_fulltext(session: Session, chats, statements):
+    found = crud.find_records(session, Chat, {"email": "lice"}, partial_match=True)
+
+    assert sorted(chat.email for chat in found) == ["Alice@example.com", "malice@test.ru"]
+    assert any("match" in stmt.sql.lower() for stmt in statements)
+    assert not any("like" in stmt.sql.lower() for stmt in statements)
+
+
+def test_short_value_falls_back_to_like(session: Session, chats, statements):
+    found = crud.find_records(session, Chat, {"email": "ru"}, partial_match=True)
+
+    assert [chat.email for chat in found] == ["malice@test.ru"]
+    assert any("like" in stmt.sql.lower() for stmt in statements)
+
+
+def test_count_and_keyset_use_fulltext(session: Session, chats):
+    assert crud.count_records(session, Chat, {"email": "example"}, partial_match=True) == 2
+
+    records, has_more = crud.get_records_keyset(
+        session, Chat, limit=1, conditions={"email": "example"}, partial_match=True
+    )
+    assert [chat.email for chat in records] == ["Alice@example.com"]
+    assert has_more
+
+
+def test_index_follows_updates_and_deletes(session: Session, chats):
+    chats[1].email = "robert@example.com"
+    session.commit()
+    crud.delete_chat(session, chats[0])
+
+    found = crud.find_records(session, Chat, {"email": "example"}, partial_match=True)
+    assert [chat.email for chat in found] == ["robert@example.com"]
+    assert crud.find_records(session, Chat, {"email": "bob@"}, partial_match=True) == []
+
+
+def test_quotes_in_value_are_literal(session: Session, chats):
+    assert crud.find_records(session, Chat, {"email": 'a"b OR c'}, partial_match=True) == []
+
+
+def test_exact_match_does_not_use_fulltext(session: Session, chats, statements):
+    found = crud.find_records(session, Chat, {"email": "bob@example.com"})
+
+    assert len(found) == 1
+    assert not any("match" in stmt.sql.lower() for stmt in statements)
+
+
+def test_without_fulltext_tables_like_is_used(session: Session, statements):
+    session.add(ChatType(type="private"))
+    session.commit()
+
+    crud.find_records(session, ChatType, {"type": "priv"}, partial_match=True)
+    assert any("like" in stmt.sql.lower() for stmt in statements)
+
+
+def test_migrations_create_fts_tables_for_all_indexed_columns():
+    import importlib.util
+    from pathlib import Path
+
+    migrated = {}
+    for path in sorted((Path(__file__).resolve().parents[2] / "alembic" / "versions").glob("*.py")):
+        source = path.read_text(encoding="utf-8")
+        if "FTS_COLUMNS" not in source:
+            continue
+        spec = importlib.util.spec_from_file_location(path.stem, str(path))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        migrated.update(module.FTS_COLUMNS)
+
+    # Схема базы данных и частичный поиск используют одни и те же колонки
+    assert migrated == fulltext.indexed_columns()
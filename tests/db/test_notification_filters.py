@@ -0,0 +1,92 @@
+import pytest
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.db.models import ChatType, NotificationType, NotificationFilter
+from app.db import crud, filter_index
+
+
+@pytest.fixture
+def seeded(session: Session):
+    private = ChatType(type="private")
+    zabbix = NotificationType(type="zabbix", description="Zabbix")
+    session.add_all([private, zabbix])
+    session.commit()
+
+    chats = [crud.create_chat(session, f"chat{i}@example.com", private) for i in range(4)]
+    subscribers = crud.add_notification_subscribers(session, chats, zabbix, "system", datetime.utcnow())
+    return {"chats": chats, "zabbix": zabbix, "subscribers": subscribers}
+
+
+def selected(session: Session, seeded, data) -> set:
+    subscribers = seeded["zabbix"].subscribers.all()
+    return {
+        subscriber.chat.email
+        for subscriber in filter_index.select_subscribers(session, seeded["zabbix"], subscribers, data)
+    }
+
+
+def test_add_notification_filter_requires_condition(session: Session, seeded):
+    subscriber = seeded["subscribers"][0]
+    with pytest.raises(ValueError):
+        crud.add_notification_filter(session, subscriber)
+    with pytest.raises(ValueError):
+        crud.add_notification_filter(session, subscriber, tag_value="prod")
+
+
+def test_find_and_delete_notification_filters(session: Session, seeded):
+    subscriber = seeded["subscribers"][0]
+    crud.add_notification_filter(session, subscriber, severity="High")
+    crud.add_notification_filter(session, subscriber, tag_key="env", tag_value="prod")
+
+    assert len(crud.find_notification_filters(session, subscriber)) == 2
+    assert crud.delete_notification_filters(session, subscriber) == 2
+    assert crud.find_notification_filters(session, subscriber) == []
+
+
+def test_subscribers_without_filters_receive_everything(session: Session, seeded):
+    assert selected(session, seeded, {"severity": "Low"}) == {f"chat{i}@example.com" for i in range(4)}
+
+
+def test_filters_match_by_conditions(session: Session, seeded):
+    subscribers = seeded["subscribers"]
+    crud.add_notification_filter(session, subscribers[0], severity="High")
+    crud.add_notification_filter(session, subscribers[1], host_group="Linux servers", host_pattern="db-*")
+    crud.add_notification_filter(session, subscribers[2], tag_key="env", tag_value="prod")
+
+    event = {
+        "severity": "high",
+        "host": "DB-01",
+        "host_groups": "Linux servers, Databases",
+        "tags": "env:prod, service:pg",
+    }
+    assert selected(session, seeded, event) == {f"chat{i}@example.com" for i in range(4)}
+
+    event = {"severity": "Warning", "host": "web-01", "host_groups": ["Linux servers"],
+             "tags": [{"tag": "env", "value": "test"}]}
+    assert selected(session, seeded, event) == {"chat3@example.com"}
+
+
+def test_rule_requires_all_conditions(session: Session, seeded):
+    crud.add_notification_filter(session, seeded["subscribers"][0], severity="High", tag_key="env")
+
+    assert "chat0@example.com" not in selected(session, seeded, {"severity": "High"})
+    assert "chat0@example.com" in selected(session, seeded, {"severity": "High", "tags": {"env": "any"}})
+
+
+def test_index_is_invalidated_after_commit(session: Session, seeded):
+    subscriber = seeded["subscribers"][0]
+    event = {"severity": "Low"}
+    assert "chat0@example.com" in selected(session, seeded, event)
+
+    crud.add_notification_filter(session, subscriber, severity="High")
+    assert "chat0@example.com" not in selected(session, seeded, event)
+
+    crud.delete_notification_filters(session, subscriber)
+    assert "chat0@example.com" in selected(session, seeded, event)
+
+
+def test_delete_chats_removes_filters(session: Session, seeded):
+    crud.add_notification_filter(session, seeded["subscribers"][0], severity="High")
+    crud.delete_chats(session, seeded["chats"][:1])
+
+    assert session.query(NotificationFilter).count() == 0
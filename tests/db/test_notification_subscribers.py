@@ -1,7 +1,7 @@
 import pytest
 from datetime import datetime
 from sqlalchemy.orm import Session
-from app.db.models import ChatType, NotificationType
+from app.db.models import ChatType, NotificationType, NotificationSubscriber
 from app.db import crud
 
 
@@ -112,3 +112,58 @@ def test_delete_by_data_missing_type(session: Session, chat):
             chat=chat,
             notification_type=None
         )
+
+
+@pytest.fixture
+def other_chat(session: Session, chat_type: ChatType):
+    return crud.create_chat(session, email="notif2@example.com", chat_type=chat_type)
+
+
+def test_add_notification_subscribers_skips_existing(session: Session, chat, other_chat, notification_type):
+    crud.add_notification_subscriber(session, chat, notification_type, "admin", datetime.utcnow())
+
+    subscribed = crud.add_notification_subscribers(
+        session, [chat, other_chat], notification_type, "admin", datetime.utcnow()
+    )
+
+    assert subscribed == [other_chat]
+    assert crud.count_records(session, NotificationSubscriber) == 2
+
+
+def test_add_notification_subscribers_invalid_type(session: Session, chat):
+    with pytest.raises(ValueError):
+        crud.add_notification_subscribers(session, [chat], None, "admin", datetime.utcnow())
+
+
+def test_delete_notification_subscribers(session: Session, chat, other_chat, notification_type):
+    crud.add_notification_subscriber(session, chat, notification_type, "admin", datetime.utcnow())
+
+    unsubscribed = crud.delete_notification_subscribers(session, [chat, other_chat], notification_type)
+
+    assert unsubscribed == [chat]
+    assert crud.count_records(session, NotificationSubscriber) == 0
+    assert crud.delete_notification_subscribers(session, [chat], notification_type) == []
+
+
+def test_subscription_changes_reset_subscribers_cache(session: Session, chat, notification_type):
+    from app.bot_handlers import notifications
+    cache = notifications._subscribers_cache
+
+    cache.set("system", ["stale@example.com"])
+    subscriber = NotificationSubscriber(chat_id=chat.id, notification_type=notification_type.id,
+                                        granted_by="admin", granted_at=datetime.utcnow())
+    session.add(subscriber)
+    session.rollback()
+    assert cache.get("system") == ["stale@example.com"]
+
+    crud.add_notification_subscriber(session, chat, notification_type, "admin", datetime.utcnow())
+    assert cache.get("system") is None
+
+    cache.set("system", ["stale@example.com"])
+    crud.delete_notification_subscribers(session, [chat], notification_type)
+    assert cache.get("system") is None
+
+    crud.add_notification_subscribers(session, [chat], notification_type, "admin", datetime.utcnow())
+    cache.set("system", ["stale@example.com"])
+    crud.delete_chats(session, [chat])
+    assert cache.get("system") is None
@@ -0,0 +1,95 @@
+import re
+import pytest
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.db.models import ChatType, NotificationType, NotificationSubscriber, Chat, Administrator
+from app.db import crud, filter_index, suppression
+
+# Строка плана полного просмотра таблицы (формат SQLite до и после 3.36);
+# поиск по виртуальной таблице FTS5 и служебные таблицы SQLite не считаются
+SCAN_PATTERN = re.compile(r"^SCAN (?:TABLE )?(?!sqlite_)(\w+)(?!.*VIRTUAL TABLE)")
+
+
+@pytest.fixture
+def seeded(session: Session):
+    private = ChatType(type="private")
+    group = ChatType(type="group")
+    zabbix = NotificationType(type="zabbix", description="Zabbix")
+    other = NotificationType(type="other", description="Other")
+    session.add_all([private, group, zabbix, other])
+    session.commit()
+
+    chats = [crud.create_chat(session, f"chat{i}@example.com", private) for i in range(5)]
+    user = crud.create_user(session, chats[0], "Admin")
+    crud.create_administrator(session, user, "system", datetime.utcnow())
+    crud.add_notification_subscribers(session, chats, zabbix, "system", datetime.utcnow())
+    session.expire_all()
+    return {"chats": chats, "zabbix": zabbix, "private": private}
+
+
+def explainable(statements) -> list:
+    """
+    Отобрать захваченные запросы SELECT, UPDATE и DELETE, выполненные для одного набора параметров.
+    """
+    return [
+        stmt for stmt in statements
+        if not stmt.executemany and stmt.sql.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE"))
+    ]
+
+
+def full_scans(test_engine, statements) -> set:
+    """
+    Выполнить EXPLAIN QUERY PLAN для захваченных запросов и вернуть таблицы с полным просмотром.
+    """
+    tables = set()
+    raw = test_engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for stmt in statements:
+            for row in cursor.execute(f"EXPLAIN QUERY PLAN {stmt.sql}", stmt.parameters).fetchall():
+                match = SCAN_PATTERN.match(row[-1])
+                if match:
+                    tables.add(match.group(1))
+    finally:
+        raw.close()
+    return tables
+
+
+# Запросы CRUD-слоя и таблицы, полный просмотр которых ожидаем (выборка всей таблицы)
+HOT_QUERIES = [
+    ("find_chat_by_id", lambda s, d: crud.find_chat(s, d["chats"][1].id), set()),
+    ("find_chat_by_email", lambda s, d: crud.find_chat(s, "chat2@example.com"), set()),
+    ("find_chats", lambda s, d: crud.find_chats(s, [d["chats"][0].id, "chat3@example.com"]), set()),
+    ("find_chat_type", lambda s, d: crud.find_chat_type(s, "private"), set()),
+    ("find_notification_type", lambda s, d: crud.find_notification_type(s, "zabbix"), set()),
+    ("subscribers_by_type", lambda s, d: crud.find_notification_type(s, "zabbix").subscribers.all(), set()),
+    ("chats_by_type", lambda s, d: crud.find_chat_type(s, "private").chats.all(), set()),
+    ("unsubscribed_types", lambda s, d: crud.find_unsubscribed_notification_types(s, d["chats"][0]),
+     {"notification_types"}),
+    ("subscriber_by_data", lambda s, d: crud.delete_notification_subscriber_by_data(s, d["chats"][4], d["zabbix"]),
+     set()),
+    ("bulk_unsubscribe", lambda s, d: crud.delete_notification_subscribers(s, d["chats"][:2], d["zabbix"]), set()),
+    ("bulk_delete_chats", lambda s, d: crud.delete_chats(s, d["chats"][2:4]), set()),
+    ("filter_index", lambda s, d: filter_index.get_index(s, d["zabbix"]), set()),
+    ("suppression_index", lambda s, d: suppression.get_index(s), {"quiet_hours"}),
+    ("find_administrator", lambda s, d: crud.find_one_record(
+        s, Administrator, {Administrator.user_id: d["chats"][0].user.id}), set()),
+    ("subscribers_by_granted_day", lambda s, d: crud.find_records(
+        s, NotificationSubscriber, {"granted_at": "2024-05-17"}, partial_match=True), set()),
+    ("administrators_by_granted_month", lambda s, d: crud.find_records(
+        s, Administrator, {"granted_at": "05.2024"}, partial_match=True), set()),
+    ("keyset_page", lambda s, d: crud.get_records_keyset(s, NotificationSubscriber, limit=2, after=[2]), set()),
+    ("keyset_page_back", lambda s, d: crud.get_records_keyset(s, Chat, limit=2, before=[4]), set()),
+]
+
+
+@pytest.mark.parametrize("query", [q[1] for q in HOT_QUERIES], ids=[q[0] for q in HOT_QUERIES])
+def test_hot_query_has_no_full_scan(test_engine, session, seeded, statements, query):
+    allowed = next(q[2] for q in HOT_QUERIES if q[1] is query)
+    statements.clear()
+
+    query(session, seeded)
+
+    queries = explainable(statements)
+    assert queries, "query did not reach the database"
+    assert full_scans(test_engine, queries) - allowed == set()
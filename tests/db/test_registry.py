@@ -0,0 +1,47 @@
+import pytest
+from app import db
+from app.db import registry
+from app.utils import db_records_format
+
+
+def test_registry_covers_all_models():
+    assert list(registry.TABLES) == list(db.Base.metadata.tables)
+    assert registry.TABLES["chats"].model is db.Chat
+    assert registry.MODELS[db.Administrator].name == "administrators"
+
+
+def test_registry_is_immutable():
+    with pytest.raises(TypeError):
+        registry.TABLES["fake"] = None
+    with pytest.raises(TypeError):
+        registry.TABLES["chats"].column_types["email"] = "TEXT"
+
+
+def test_table_info_columns_and_getters():
+    info = registry.get_table_info("users")
+    assert [col.name for col in info.columns] == ["id", "chat_id", "first_name", "last_name"]
+    assert info.column_types["first_name"] == "VARCHAR"
+    assert "administrator" in info.relationships
+
+    user = db.User(first_name="Ivan", last_name="Petrov")
+    assert info.getters["first_name"](user) == "Ivan"
+
+
+def test_base_helpers_use_registry():
+    assert db.model_exists_by_table_name("chats")
+    assert not db.model_exists_by_table_name("missing")
+    assert db.get_model_by_tablename("groups") is db.Group
+    assert db.get_all_tables_names() == list(registry.TABLES)
+    assert [col.name for col in db.get_table_columns("chat_types")] == ["id", "type"]
+
+    with pytest.raises(ValueError):
+        db.get_model_by_tablename("missing")
+    with pytest.raises(ValueError):
+        db.get_table_columns("missing")
+
+
+def test_find_config_model_format():
+    model, fields, page_size = db_records_format.find_config_model_format("notification_types")
+    assert model is db.NotificationType
+    assert page_size == 5
+    assert db_records_format.find_config_model_format("missing") is None
@@ -0,0 +1,124 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, sessionmaker
+from app.db.models import ChatType, Chat, NotificationType, NotificationSubscriber
+from app.db import crud, row_counts
+
+
+@pytest.fixture
+def chat_type(session: Session) -> ChatType:
+    ct = ChatType(type="private")
+    session.add(ct)
+    session.commit()
+    return ct
+
+
+def test_count_is_cached_and_maintained(session: Session, chat_type, statements):
+    assert crud.count_records(session, Chat) == 0
+
+    chat = crud.create_chat(session, "count@example.com", chat_type)
+    statements.clear()
+    assert crud.count_records(session, Chat) == 1
+    assert not any("count(" in stmt.sql.lower() for stmt in statements)
+
+    crud.delete_chat(session, chat)
+    assert crud.count_records(session, Chat) == 0
+
+
+def test_pending_changes_are_discarded_on_rollback(session: Session, chat_type):
+    assert crud.count_records(session, Chat) == 0
+
+    session.add(Chat(email="rollback@example.com", chat_type=chat_type.id))
+    assert crud.count_records(session, Chat) == 1
+
+    session.rollback()
+    assert crud.count_records(session, Chat) == 0
+
+
+def test_other_session_sees_committed_count(test_engine, session: Session, chat_type):
+    assert crud.count_records(session, Chat) == 0
+
+    other = sessionmaker(bind=test_engine)()
+    other.add(Chat(email="other@example.com", chat_type=chat_type.id))
+    assert crud.count_records(session, Chat) == 0
+    other.commit()
+    other.close()
+
+    assert crud.count_records(session, Chat) == 1
+
+
+def test_count_read_during_commit_is_not_cached(test_engine, session: Session, chat_type):
+    row_counts.invalidate(test_engine)
+    make_session = sessionmaker(bind=test_engine)
+    writer, reader = make_session(), make_session()
+    writer.add(Chat(email="race@example.com", chat_type=chat_type.id))
+    observed = []
+
+    def read_before_apply(committed: Session):
+        # Изменения уже в базе, но ещё не применены к кэшу
+        if committed is writer:
+            observed.append(row_counts.count(reader, Chat))
+
+    event.listen(Session, "after_commit", read_before_apply, insert=True)
+    try:
+        writer.commit()
+    finally:
+        event.remove(Session, "after_commit", read_before_apply)
+    writer.close()
+    reader.close()
+
+    assert observed == [1]
+    assert crud.count_records(session, Chat) == 1
+
+
+def test_bulk_operations_update_count(session: Session, chat_type):
+    notification_type = NotificationType(type="zabbix")
+    session.add(notification_type)
+    session.commit()
+    chats = [crud.create_chat(session, f"bulk{i}@example.com", chat_type) for i in range(3)]
+
+    assert crud.count_records(session, NotificationSubscriber) == 0
+    crud.add_notification_subscribers(session, chats, notification_type, "admin", datetime.utcnow())
+    assert crud.count_records(session, NotificationSubscriber) == 3
+
+    crud.delete_chats(session, chats[:2])
+    assert crud.count_records(session, NotificationSubscriber) == 1
+    assert crud.count_records(session, Chat) == 1
+    assert row_counts.verify(session, [Chat, NotificationSubscriber]) == {}
+
+
+def test_has_records_fast_path(session: Session, chat_type, statements):
+    assert not crud.has_records(session, Chat)
+    assert any("exists" in stmt.sql.lower() for stmt in statements)
+
+    crud.create_chat(session, "exists@example.com", chat_type)
+    crud.count_records(session, Chat)
+    statements.clear()
+    assert crud.has_records(session, Chat)
+    assert statements == []
+
+
+def test_verify_repairs_stale_cache(session: Session, chat_type):
+    assert crud.count_records(session, Chat) == 0
+
+    # Изменение в обход CRUD-слоя
+    session.execute(text("INSERT INTO chats (email, chat_type) VALUES ('raw@example.com', :ct)"), {"ct": chat_type.id})
+    session.commit()
+
+    assert row_counts.verify(session, [Chat]) == {"chats": (0, 1)}
+    assert crud.count_records(session, Chat) == 1
+
+
+def test_count_from_trigger_table(test_engine, session: Session, chat_type, statements):
+    with test_engine.begin() as connection:
+        row_counts.install_count_triggers(connection, ["chats"])
+
+    crud.create_chat(session, "trigger@example.com", chat_type)
+    row_counts.invalidate(session, Chat)
+    statements.clear()
+
+    assert crud.count_records(session, Chat) == 1
+    assert any(row_counts.COUNTS_TABLE_NAME in stmt.sql.lower() for stmt in statements)
+    assert not any("count(" in stmt.sql.lower() for stmt in statements)
+    assert row_counts.verify(session, [Chat]) == {}
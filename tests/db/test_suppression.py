@@ -0,0 +1,152 @@
+import pytest
+from datetime import datetime, time, timedelta
+from sqlalchemy.orm import Session
+from app.db.models import ChatType, NotificationType
+from app.db import crud, suppression, filter_index
+
+
+@pytest.fixture
+def seeded(session: Session):
+    private = ChatType(type="private")
+    zabbix = NotificationType(type="zabbix", description="Zabbix")
+    session.add_all([private, zabbix])
+    session.commit()
+
+    chats = [crud.create_chat(session, f"chat{i}@example.com", private) for i in range(3)]
+    subscribers = crud.add_notification_subscribers(session, chats, zabbix, "system", datetime.utcnow())
+    suppression.pop_due_rollups(datetime(9999, 1, 1))
+    return {"chats": chats, "zabbix": zabbix, "subscribers": subscribers}
+
+
+def delivered(session: Session, seeded, data, now: datetime) -> set:
+    return {
+        subscriber.chat.email
+        for subscriber in suppression.select_subscribers(
+            session, seeded["zabbix"], seeded["zabbix"].subscribers.all(), data, now
+        )
+    }
+
+
+def test_interval_index_finds_overlapping_windows():
+    rule = filter_index.make_rule(0)
+    windows = [
+        suppression.WindowRule(1, "a", datetime(2024, 5, 17, 10), datetime(2024, 5, 17, 14), rule, False),
+        suppression.WindowRule(2, "b", datetime(2024, 5, 17, 12), datetime(2024, 5, 17, 16), rule, False),
+        suppression.WindowRule(3, "c", datetime(2024, 5, 17, 16), datetime(2024, 5, 17, 17), rule, False),
+    ]
+    index = suppression.IntervalIndex(windows)
+
+    def ids(moment):
+        return {window.id for window in index.at(moment)}
+
+    assert ids(datetime(2024, 5, 17, 9)) == set()
+    assert ids(datetime(2024, 5, 17, 11)) == {1}
+    assert ids(datetime(2024, 5, 17, 13)) == {1, 2}
+    assert ids(datetime(2024, 5, 17, 14)) == {2}
+    assert ids(datetime(2024, 5, 17, 16)) == {3}
+    assert ids(datetime(2024, 5, 17, 17)) == set()
+
+
+def test_maintenance_window_suppresses_matching_events(session: Session, seeded):
+    now = suppression.current_time().replace(tzinfo=None)
+    crud.add_maintenance_window(
+        session, seeded["zabbix"], "db", now - timedelta(hours=1), now + timedelta(hours=1), "admin",
+        host_pattern="db-*"
+    )
+    everyone = {f"chat{i}@example.com" for i in range(3)}
+
+    assert delivered(session, seeded, {"host": "db-01"}, now) == set()
+    assert delivered(session, seeded, {"host": "web-01"}, now) == everyone
+    assert delivered(session, seeded, {"host": "db-01"}, now + timedelta(hours=2)) == everyone
+
+
+def test_maintenance_window_rollup(session: Session, seeded):
+    now = suppression.current_time().replace(tzinfo=None, microsecond=0)
+    ends_at = now + timedelta(hours=1)
+    crud.add_maintenance_window(
+        session, seeded["zabbix"], "upgrade", now - timedelta(hours=1), ends_at, "admin", rollup=True
+    )
+
+    before = suppression.suppressed_counts()[suppression.REASON_MAINTENANCE]
+    for host in ("db-01", "db-02", "db-01"):
+        assert delivered(session, seeded, {"host": host, "severity": "High"}, now) == set()
+
+    assert suppression.suppressed_counts()[suppression.REASON_MAINTENANCE] == before + 9
+    assert suppression.pop_due_rollups(now) == []
+
+    rollup, = suppression.pop_due_rollups(ends_at)
+    assert rollup.title == "upgrade"
+    assert rollup.count == 3
+    assert rollup.severities == {"high": 3}
+    assert rollup.hosts == ["db-01", "db-02"]
+    assert rollup.recipients == {f"chat{i}@example.com" for i in range(3)}
+
+
+def test_quiet_hours_use_chat_timezone(session: Session, seeded):
+    crud.set_quiet_hours(session, seeded["chats"][0], time(22, 0), time(8, 0), "Asia/Yekaterinburg", rollup=True)
+
+    # 01:00 по Екатеринбургу, 23:00 по Москве
+    night = datetime(2024, 5, 17, 23)
+    assert delivered(session, seeded, {"host": "db-01"}, night) == {"chat1@example.com", "chat2@example.com"}
+    # 12:00 по Екатеринбургу
+    day = datetime(2024, 5, 18, 10)
+    assert delivered(session, seeded, {"host": "db-01"}, day) == {f"chat{i}@example.com" for i in range(3)}
+
+    rollup, = suppression.pop_due_rollups(day)
+    assert rollup.reason == suppression.REASON_QUIET_HOURS
+    assert rollup.due_at == datetime(2024, 5, 18, 6)
+    assert rollup.recipients == {"chat0@example.com"}
+
+
+def test_quiet_hours_index_is_invalidated(session: Session, seeded):
+    night = datetime(2024, 5, 17, 23)
+    crud.set_quiet_hours(session, seeded["chats"][0], time(22, 0), time(8, 0))
+    assert "chat0@example.com" not in delivered(session, seeded, {}, night)
+
+    crud.delete_quiet_hours(session, seeded["chats"][0])
+    assert "chat0@example.com" in delivered(session, seeded, {}, night)
+
+
+def test_maintenance_window_validation(session: Session, seeded):
+    with pytest.raises(ValueError):
+        crud.add_maintenance_window(
+            session, seeded["zabbix"], "x", datetime(2024, 5, 18), datetime(2024, 5, 17), "admin"
+        )
+    with pytest.raises(ValueError):
+        crud.set_quiet_hours(session, seeded["chats"][0], time(8, 0), time(8, 0))
+    with pytest.raises(ValueError):
+        crud.set_quiet_hours(session, seeded["chats"][0], time(22, 0), time(8, 0), "Mars/Olympus")
+
+
+def test_cached_subscribers_apply_quiet_hours_on_every_send(session: Session, seeded):
+    from contextlib import contextmanager
+    from unittest.mock import patch
+    from app.bot_handlers import notifications
+    from app.bot_handlers.constants import NotificationTypes
+
+    crud.set_quiet_hours(session, seeded["chats"][0], time(22, 0), time(8, 0), "Europe/Moscow")
+    notifications._subscribers_cache.clear()
+    moscow = suppression.current_time().tzinfo
+    sent = []
+
+    @contextmanager
+    def test_session():
+        yield session
+
+    def send_at(moment: datetime) -> set:
+        sent.clear()
+        with patch.object(suppression, "current_time", return_value=moscow.localize(moment)):
+            notifications.send_notification_to_subscribers(
+                None, NotificationTypes.ZABBIX, "error", cache_subscribers=True
+            )
+        return set(sent[0]) if sent else set()
+
+    everyone = {f"chat{i}@example.com" for i in range(3)}
+    with patch.object(notifications.db, "get_db_session", test_session), \
+            patch.object(notifications.bot_extensions, "broadcast_to_chats",
+                         side_effect=lambda **kwargs: sent.append(kwargs["chat_ids"])):
+        # Список подписчиков кэшируется в тихие часы первого чата, граница тихих часов — в пределах TTL кэша
+        assert send_at(datetime(2024, 5, 17, 7, 59, 50)) == everyone - {"chat0@example.com"}
+        assert send_at(datetime(2024, 5, 17, 8, 0, 10)) == everyone
+        assert send_at(datetime(2024, 5, 17, 22, 0, 10)) == everyone - {"chat0@example.com"}
+    notifications._subscribers_cache.clear()
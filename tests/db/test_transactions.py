@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+from app.db.models import ChatType, Chat, User
+from app.db import crud
+from app.db import base
+
+
+@pytest.fixture
+def session_factory(test_engine, monkeypatch):
+    factory = sessionmaker(bind=test_engine, autoflush=False, future=True)
+    monkeypatch.setattr(base, "SessionLocal", factory)
+    return factory
+
+
+@pytest.fixture
+def commit_counter():
+    counter = {"commits": 0, "rollbacks": 0}
+
+    def on_commit(_session):
+        counter["commits"] += 1
+
+    def on_rollback(_session):
+        counter["rollbacks"] += 1
+
+    event.listen(Session, "after_commit", on_commit)
+    event.listen(Session, "after_rollback", on_rollback)
+    yield counter
+    event.remove(Session, "after_commit", on_commit)
+    event.remove(Session, "after_rollback", on_rollback)
+
+
+@pytest.fixture
+def chat_type(session_factory) -> int:
+    with session_factory() as setup_session:
+        ct = ChatType(type="private")
+        setup_session.add(ct)
+        setup_session.commit()
+        return ct.id
+
+
+def test_save_changes_only_flushes_in_unit_of_work(session: Session):
+    session.info[base.UNIT_OF_WORK_KEY] = True
+    ct = ChatType(type="private")
+    session.add(ct)
+    base.save_changes(session, ct)
+
+    # Первичный ключ доступен после flush, но транзакция не зафиксирована
+    assert ct.id is not None
+    session.rollback()
+    assert session.query(ChatType).count() == 0
+
+
+def test_save_changes_commits_without_unit_of_work(session: Session):
+    ct = ChatType(type="private")
+    session.add(ct)
+    base.save_changes(session, ct)
+
+    session.rollback()
+    assert session.query(ChatType).count() == 1
+
+
+def test_get_db_session_commits_once(session_factory, chat_type, commit_counter):
+    with base.get_db_session(enable_foreign_key=False) as session:
+        chat = crud.create_chat(session, "uow@example.com", chat_type)
+        crud.create_user(session, chat, "First", "Last")
+
+    assert commit_counter["commits"] == 1
+
+    with session_factory() as check_session:
+        chat = crud.find_chat(check_session, "uow@example.com")
+        assert chat is not None
+        assert chat.user.first_name == "First"
+
+
+def test_get_db_session_rolls_back_on_error(session_factory, chat_type, commit_counter):
+    with pytest.raises(RuntimeError):
+        with base.get_db_session(enable_foreign_key=False) as session:
+            crud.create_chat(session, "rollback@example.com", chat_type)
+            raise RuntimeError("boom")
+
+    assert commit_counter["commits"] == 0
+    assert commit_counter["rollbacks"] >= 1
+
+    with session_factory() as check_session:
+        assert crud.find_chat(check_session, "rollback@example.com") is None
+        assert check_session.query(User).count() == 0
+
+
+def test_get_db_session_objects_usable_after_exit(session_factory, chat_type):
+    with base.get_db_session(enable_foreign_key=False) as session:
+        chat = crud.create_chat(session, "detached@example.com", chat_type)
+
+    # Объекты не помечаются устаревшими при фиксации
+    assert isinstance(chat, Chat)
+    assert chat.email == "detached@example.com"
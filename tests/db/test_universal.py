@@ -64,13 +64,29 @@ def test_build_condition_partial_string():
 def test_build_condition_partial_date():
     cond = _build_condition(User, "created_at", "2023-01-01", partial_match=True)
 
-    # SQL-функция date(col)
+    # Полуоткрытый интервал по колонке без обёртки функцией date(col)
     sql_text = str(cond).lower()
-    assert "date(" in sql_text
+    assert "date(" not in sql_text
+    assert "users.created_at >=" in sql_text
+    assert "users.created_at <" in sql_text
 
-    # Значение параметра – 2023-01-01
+    # Границы интервала – сутки 2023-01-01
     compiled = cond.compile(compile_kwargs={"literal_binds": True})
     assert "2023-01-01" in str(compiled)
+    assert "2023-01-02" in str(compiled)
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("2023", ["Alice", "Bob", "Charlie"]),
+    ("2023-01", ["Alice", "Bob", "Charlie"]),
+    ("2023-01-02", ["Bob"]),
+    ("2023-01-03T10", ["Charlie"]),
+    ("2023-01-03T11", []),
+    (datetime(2023, 1, 1, 23, 59), ["Alice"]),
+])
+def test_find_records_partial_date_granularity(session, sample_users, value, expected):
+    results = crud.find_records(session, User, {"created_at": value}, partial_match=True)
+    assert sorted(u.name for u in results) == expected
 
 
 def test_build_condition_unknown_attr_raises():
@@ -112,6 +128,53 @@ def test_get_records_range_order_by_desc(session, sample_users):
     assert records[0].name == "Charlie"
 
 
+# --- get_records_keyset --- #
+
+def test_get_records_keyset_first_page(session, sample_users):
+    records, has_more = crud.get_records_keyset(session, User, limit=2)
+    assert [u.name for u in records] == ["Alice", "Bob"]
+    assert has_more
+
+
+def test_get_records_keyset_after_cursor(session, sample_users):
+    cursor = crud.get_keyset_cursor(sample_users[1])
+    records, has_more = crud.get_records_keyset(session, User, limit=2, after=cursor)
+    assert [u.name for u in records] == ["Charlie"]
+    assert not has_more
+
+
+def test_get_records_keyset_before_cursor(session, sample_users):
+    cursor = crud.get_keyset_cursor(sample_users[2])
+    records, has_more = crud.get_records_keyset(session, User, limit=1, before=cursor)
+    assert [u.name for u in records] == ["Bob"]
+    assert has_more
+
+
+def test_get_records_keyset_order_by_column(session, sample_users):
+    cursor = crud.get_keyset_cursor(sample_users[0], order_by=User.created_at)
+    assert cursor == [sample_users[0].created_at, sample_users[0].id]
+
+    records, _ = crud.get_records_keyset(session, User, limit=5, after=cursor, order_by=User.created_at)
+    assert [u.name for u in records] == ["Bob", "Charlie"]
+
+
+def test_get_records_keyset_with_conditions(session, sample_users):
+    records, has_more = crud.get_records_keyset(
+        session, User, limit=1, conditions={"name": "li"}, partial_match=True
+    )
+    assert [u.name for u in records] == ["Alice"]
+    assert has_more
+
+
+def test_get_records_keyset_invalid_arguments(session, sample_users):
+    with pytest.raises(ValueError):
+        crud.get_records_keyset(session, User, limit=0)
+    with pytest.raises(ValueError):
+        crud.get_records_keyset(session, User, limit=1, after=[1], before=[2])
+    with pytest.raises(ValueError):
+        crud.get_records_keyset(session, User, limit=1, after=[1, 2])
+
+
 # --- find_one_record --- #
 
 def test_find_one_record_exact_match(session, sample_users):
@@ -151,3 +214,8 @@ def test_find_records_partial(session, sample_users):
 def test_count_records(session, sample_users):
     count = crud.count_records(session, User)
     assert count == 3
+
+
+def test_count_records_with_conditions(session, sample_users):
+    assert crud.count_records(session, User, {"name": "li"}, partial_match=True) == 2
+    assert crud.count_records(session, User, {"name": "li"}) == 0
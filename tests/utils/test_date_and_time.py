@@ -1,11 +1,15 @@
 import re
 import pytest
-from datetime import datetime
+from datetime import datetime, time
 import pytz
 from app.utils.date_and_time import (
     get_current_date_moscow,
     get_current_date_with_format,
-    format_datetime
+    format_datetime,
+    parse_datetime_range,
+    parse_time_of_day,
+    is_time_in_range,
+    next_time_of_day
 )
 
 
@@ -73,3 +77,52 @@ def test_format_datetime_timezone_preserved():
     dt = tz.localize(datetime(2022, 12, 12, 10, 0))
     formatted = format_datetime(dt, fmt="%Y-%m-%d %H:%M")
     assert formatted.startswith("2022-12-12 10:")
+
+
+@pytest.mark.parametrize("value,start,end", [
+    ("2024", datetime(2024, 1, 1), datetime(2025, 1, 1)),
+    ("2024-12", datetime(2024, 12, 1), datetime(2025, 1, 1)),
+    ("05.2024", datetime(2024, 5, 1), datetime(2024, 6, 1)),
+    ("2024-05-17", datetime(2024, 5, 17), datetime(2024, 5, 18)),
+    ("17.05.2024", datetime(2024, 5, 17), datetime(2024, 5, 18)),
+    ("2024-05-17T10", datetime(2024, 5, 17, 10), datetime(2024, 5, 17, 11)),
+    ("2024-05-17 10:30", datetime(2024, 5, 17, 10, 30), datetime(2024, 5, 17, 10, 31)),
+    ("May 17 2024", datetime(2024, 5, 17), datetime(2024, 5, 18)),
+])
+def test_parse_datetime_range(value, start, end):
+    assert parse_datetime_range(value) == (start, end)
+
+
+def test_parse_datetime_range_invalid():
+    with pytest.raises(ValueError):
+        parse_datetime_range("not-a-date")
+    with pytest.raises(ValueError):
+        parse_datetime_range("2024-13")
+
+
+def test_parse_time_of_day():
+    assert parse_time_of_day("8:05") == time(8, 5)
+    with pytest.raises(ValueError):
+        parse_time_of_day("24:00")
+    with pytest.raises(ValueError):
+        parse_time_of_day("8")
+
+
+@pytest.mark.parametrize("moment, expected", [
+    (time(23, 0), True),
+    (time(2, 0), True),
+    (time(8, 0), False),
+    (time(12, 0), False),
+])
+def test_is_time_in_range_over_midnight(moment, expected):
+    assert is_time_in_range(moment, time(22, 0), time(8, 0)) is expected
+
+
+def test_next_time_of_day_in_other_timezone():
+    tz = pytz.timezone("Asia/Yekaterinburg")
+    now = pytz.UTC.localize(datetime(2024, 5, 17, 20, 0))  # 01:00 по Екатеринбургу
+
+    result = next_time_of_day(now, time(8, 0), tz)
+
+    assert result == tz.localize(datetime(2024, 5, 18, 8, 0))
+    assert next_time_of_day(now, time(0, 30), tz) == tz.localize(datetime(2024, 5, 19, 0, 30))
@@ -2,7 +2,9 @@ import pytest
 from sqlalchemy import Column, Integer, String, ForeignKey, create_engine
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 
-from app.utils.db_records_format import format_for_chat, find_config_model_format, MODEL_FORMATS
+from datetime import datetime, time
+from app import db
+from app.utils.db_records_format import format_for_chat, find_config_model_format, compile_format_plan, MODEL_FORMATS
 
 
 # Локальный DeclarativeBase и engine
@@ -81,6 +83,81 @@ def test_format_primitive():
     assert format_for_chat("hello") == "hello"
 
 
+def test_format_all_columns(sample_data):
+    assert format_for_chat(sample_data) == "{ id=1, email='test@domain.com', chat_type_id=1 }"
+
+
+def test_format_missing_relation_and_none(sample_data):
+    chat = Chat(id=2, email="none@domain.com")
+    result = format_for_chat(chat, model_fields=[Chat.id, ("unknown", ["type"]), (Chat.chat_type_model, ["type"])])
+    assert result == "{ id=2, unknown=<no relation>, chat_type_model=None }"
+
+
+@pytest.fixture
+def team_with_members():
+    """Модели со связью-списком (один ко многим), объявленные только для этого теста."""
+    local_base = declarative_base()
+
+    class Team(local_base):
+        __tablename__ = "teams"
+        id = Column(Integer, primary_key=True)
+        title = Column(String)
+        members = relationship("Member")
+
+    class Member(local_base):
+        __tablename__ = "members"
+        id = Column(Integer, primary_key=True)
+        email = Column(String)
+        team_id = Column(Integer, ForeignKey("teams.id"))
+
+    team = Team(title="support", members=[Member(email="a@domain.com"), Member(email="b@domain.com")])
+    return team, Team, Member
+
+
+def test_format_list_relation(team_with_members):
+    team, Team, Member = team_with_members
+    result = format_for_chat(team, model_fields=[
+        Team.title, ("members", [Member.email])
+    ], record_separator="; ")
+    assert result == "{ title='support', members={ email='a@domain.com' }; { email='b@domain.com' } }"
+
+
+def test_format_datetime_value():
+    chat = Chat(id=3, email="dt@domain.com")
+    chat.created = datetime(2024, 5, 17, 10, 30, 45)
+    assert format_for_chat(chat, model_fields=[Chat.id, "created"]) == "{ id=3, created='2024-05-17 10:30' }"
+
+
+def test_format_quiet_hours_time_values():
+    quiet_hours = db.QuietHours(id=1, starts_at=time(22, 0), ends_at=time(8, 5),
+                                timezone="Europe/Moscow", rollup=True)
+    _, fields, _ = find_config_model_format(db.QuietHours.__tablename__)
+    assert format_for_chat(quiet_hours, model_fields=fields) == (
+        "{ id=1, starts_at='22:00', ends_at='08:05', timezone='Europe/Moscow', rollup=True, chat=None }"
+    )
+
+
+def test_plan_is_compiled_once(sample_data):
+    fields = [Chat.id, Chat.email, (Chat.chat_type_model, [ChatType.type])]
+    plan = compile_format_plan(Chat, fields)
+
+    assert compile_format_plan(Chat, ["id", "email", ("chat_type_model", ["type"])]) is plan
+    assert [prefix for prefix, _ in plan.fields] == ["id=", "email="]
+    assert plan.nested[0][2] is compile_format_plan(ChatType, [ChatType.type])
+
+
+def test_format_page_matches_single_records(sample_data):
+    fields = [Chat.id, (Chat.chat_type_model, [ChatType.type])]
+    page = format_for_chat([sample_data, sample_data], model_fields=fields)
+    single = format_for_chat(sample_data, model_fields=fields)
+    assert page == single + "\n\n" + single
+
+
+def test_unsupported_field_type(sample_data):
+    with pytest.raises(ValueError):
+        format_for_chat(sample_data, model_fields=[42])
+
+
 # --- Тесты find_config_model_format ---
 def test_find_config_model_format_found():
     MODEL_FORMATS.append((Chat, [Chat.id, Chat.email], 10))
@@ -0,0 +1,49 @@
+from app.utils import error_digest
+from app.utils.error_digest import ErrorDigest
+
+
+def test_fingerprint_ignores_variable_parts():
+    first = error_digest.fingerprint("app", "❌ Retry failed for chat a@mail.ru: 429 'Too many'", "RetryError")
+    second = error_digest.fingerprint("app", "❌ Retry failed for chat b@mail.ru: 503 'Unavailable'", "RetryError")
+
+    assert first == second
+    assert first != error_digest.fingerprint("app", "❌ Retry failed for chat a@mail.ru: 429 'x'", "KeyError")
+    assert first != error_digest.fingerprint("other", "❌ Retry failed for chat a@mail.ru: 429 'x'", "RetryError")
+
+
+def test_repeats_are_aggregated_into_digest():
+    digest = ErrorDigest(window=60)
+
+    assert digest.observe("key", "error 1", now=0) is True
+    assert digest.observe("key", "error 2", now=10) is False
+    assert digest.observe("key", "error 3", now=20) is False
+    assert digest.due(now=30) == []
+
+    summary, = digest.due(now=60)
+    assert (summary.count, summary.text, summary.period) == (2, "error 3", 60)
+
+    # После сводки группа начинается заново
+    assert digest.observe("key", "error 4", now=61) is True
+    assert digest.due(now=200) == []
+
+
+def test_immediate_sends_are_rate_limited():
+    digest = ErrorDigest(window=60, max_immediate=2)
+
+    assert [digest.observe(f"key{i}", "error", now=i) for i in range(4)] == [True, True, False, False]
+    assert digest.observe("key4", "error", now=61) is True
+
+    summaries = digest.due(now=70)
+    assert sorted(summary.fingerprint for summary in summaries) == ["key2", "key3"]
+    assert digest.suppressed_total == 2
+
+
+def test_evicted_groups_keep_their_counts():
+    digest = ErrorDigest(window=60, max_fingerprints=1)
+
+    digest.observe("a", "error a", now=0)
+    digest.observe("a", "error a", now=1)
+    digest.observe("b", "error b", now=2)
+
+    summary, = digest.due(now=3)
+    assert (summary.fingerprint, summary.count) == ("a", 1)
@@ -0,0 +1,84 @@
+import pytest
+from app.utils.flapping import (
+    FlapTracker, UPDATE_FLAPPING, UPDATE_STATUS, UPDATE_RECOVERED, format_update, trigger_key
+)
+
+
+def event(state: str, trigger: str = "100") -> dict:
+    return {"trigger_id": trigger, "event_type": state, "subject": "CPU load", "host": "srv1"}
+
+
+def flap(tracker: FlapTracker, count: int, start: float = 0.0, trigger: str = "100") -> list:
+    states = ("problem", "recovery")
+    return [tracker.observe(event(states[i % 2], trigger), start + i) for i in range(count)]
+
+
+def test_events_without_trigger_are_delivered():
+    tracker = FlapTracker(flap_threshold=2, recovery_threshold=0)
+    assert trigger_key({"trigger_id": "{TRIGGER.ID}"}) is None
+    for _ in range(5):
+        assert tracker.observe({"event_type": "problem"}).deliver
+    assert tracker.stats()["tracked"] == 0
+
+
+def test_flapping_trigger_is_throttled():
+    tracker = FlapTracker(window=60, flap_threshold=4, recovery_threshold=1, status_interval=30)
+    verdicts = flap(tracker, 10)
+
+    # первые 4 события (3 переключения) отправляются, 5-е объявляет дребезг, остальные подавляются
+    assert [v.deliver for v in verdicts] == [True] * 4 + [False] * 6
+    assert verdicts[4].update.kind == UPDATE_FLAPPING
+    assert verdicts[4].update.transitions == 4
+    assert all(v.update is None for v in verdicts[5:])
+    assert tracker.stats() == {"tracked": 1, "flapping": 1, "suppressed": 6}
+
+    assert tracker.tick(20) == []
+    status, = tracker.tick(34)
+    assert status.kind == UPDATE_STATUS
+    # пропущенные события триггера совпадают с общим счётчиком, включая событие, объявившее дребезг
+    assert status.suppressed == tracker.stats()["suppressed"] == 6
+    assert tracker.tick(40) == []
+
+
+def test_flapping_trigger_recovers_on_tick():
+    tracker = FlapTracker(window=60, flap_threshold=4, recovery_threshold=1, status_interval=600)
+    flap(tracker, 6)
+
+    recovered, = tracker.tick(64)
+    assert recovered.kind == UPDATE_RECOVERED
+    assert recovered.state == "recovery"
+    assert tracker.observe(event("problem"), 65).deliver
+
+
+def test_flapping_trigger_recovers_on_event():
+    tracker = FlapTracker(window=60, flap_threshold=4, recovery_threshold=1)
+    flap(tracker, 6)
+
+    verdict = tracker.observe(event("recovery"), 100)
+    assert verdict.deliver
+    assert verdict.update.kind == UPDATE_RECOVERED
+    assert verdict.update.suppressed == 2
+
+
+def test_tracker_is_bounded_lru():
+    tracker = FlapTracker(max_triggers=2)
+    for trigger in ("1", "2", "1", "3"):
+        tracker.observe(event("problem", trigger), 0)
+
+    assert tracker.stats()["tracked"] == 2
+    assert set(tracker._triggers) == {"1", "3"}
+
+
+def test_invalid_thresholds():
+    with pytest.raises(ValueError):
+        FlapTracker(flap_threshold=2, recovery_threshold=2)
+
+
+def test_format_update():
+    tracker = FlapTracker(window=60, flap_threshold=2, recovery_threshold=0)
+    update = flap(tracker, 3)[2].update
+
+    text = format_update(update, window=60)
+    assert "CPU load (хост srv1)" in text
+    assert "2 переключений за 1 мин" in text
+    assert "Текущее состояние: проблема" in text
@@ -1,4 +1,5 @@
-from app.utils.json_format import format_json_to_str
+import pytest
+from app.utils.json_format import format_json_to_str, iter_json_lines, iter_json_text, TRUNCATION_MARKER
 
 
 def test_simple_dict():
@@ -93,3 +94,76 @@ def test_top_level_list():
         "- y: 2"
     )
     assert format_json_to_str(data) == expected
+
+
+def test_max_length_truncates_output():
+    data = {"items": [f"value {i}" for i in range(1000)]}
+    result = format_json_to_str(data, max_length=100)
+
+    assert len(result) <= 100
+    assert result.startswith("items:\n  - value 0\n")
+    assert result.endswith("\n" + TRUNCATION_MARKER)
+
+
+def test_max_length_not_reached():
+    data = {"name": "Alice", "age": 30}
+    assert format_json_to_str(data, max_length=1000) == "name: Alice\nage: 30"
+
+
+def test_long_value_is_cut():
+    result = format_json_to_str({"history": "x" * 10000}, max_length=50)
+    assert len(result) == 50
+    assert result.startswith("history: xxx")
+    assert result.endswith(TRUNCATION_MARKER)
+
+
+@pytest.mark.parametrize("max_length", [0, 1, 5, len(TRUNCATION_MARKER)])
+def test_max_length_shorter_than_marker(max_length):
+    result = format_json_to_str({"history": "x" * 100}, max_length=max_length)
+    assert result == TRUNCATION_MARKER[:max_length]
+
+
+def test_truncation_stops_traversal():
+    class Items(list):
+        def __iter__(self):
+            for i in range(len(self)):
+                if i > 100:
+                    raise AssertionError("traversal did not stop")
+                yield i
+
+    lines = list(iter_json_text({"items": Items(range(1000))}, max_length=100))
+    assert lines[-1] == TRUNCATION_MARKER
+
+
+def test_deep_nesting_without_recursion():
+    data = value = {}
+    for _ in range(5000):
+        value["a"] = {}
+        value = value["a"]
+    value["a"] = 1
+
+    lines = list(iter_json_lines(data))
+    assert len(lines) == 5001
+    assert lines[-1] == "  " * 5000 + "a: 1"
+
+
+def test_list_item_whitespace_is_stripped():
+    # Пробельные символы в начале и в конце элемента списка отбрасываются, в остальных значениях сохраняются
+    data = {
+        "items": ["value  ", "\\nfirst\\n", {"text": "line\\n", "tags": []}, [{}]],
+        "note": "kept  ",
+        "nested": {"text": "end\\n"},
+    }
+    expected = (
+        "items:\n"
+        "  - value\n"
+        "  - first\n"
+        "  - text: line\n"
+        "\n"
+        "    tags:\n"
+        "  - -\n"
+        "note: kept  \n"
+        "nested:\n"
+        "  text: end\n"
+    )
+    assert format_json_to_str(data) == expected
@@ -0,0 +1,97 @@
+import os
+import pytest
+from app.utils.message_templates import compile_template, MessageTemplates, TEMPLATES_DIRECTORY
+
+
+EVENT = {
+    "event_type": "problem",
+    "subject": "CPU load is high",
+    "host": "server1",
+    "severity": "High",
+    "tags": {"env": "prod"},
+    "value": "80%",
+}
+
+
+def test_compile_template_renders_fields():
+    render = compile_template("{subject}\nХост: {host} ({tags.env})\nВажность: {severity!s:>6}")
+    assert render(EVENT) == "CPU load is high\nХост: server1 (prod)\nВажность:   High"
+
+
+def test_lines_with_missing_fields_are_dropped():
+    render = compile_template("Хост: {host}\nОкно: {window}\nМакрос: {macro}\nПусто: {empty}\n---")
+    data = {"host": "server1", "macro": "{HOST.NAME}", "empty": ""}
+    assert render(data) == "Хост: server1\n---"
+
+
+def test_rest_fields_line():
+    render = compile_template("{subject}\n{*}")
+    assert render(EVENT) == "CPU load is high\nhost: server1\nseverity: High\ntags:\n  env: prod\nvalue: 80%"
+
+
+def test_rest_fields_skip_missing_values():
+    render = compile_template("{subject}\n{*}")
+    data = {"subject": "CPU", "tags": "{EVENT.TAGSJSON}", "opdata": "", "value": None, "host": "server1"}
+    assert render(data) == "CPU\nhost: server1"
+
+
+def test_mismatched_format_spec_falls_back(tmp_path):
+    (tmp_path / "zabbix.txt").write_text("Важность: {severity:>5d}", encoding="utf-8")
+    templates = MessageTemplates(tmp_path)
+
+    assert templates.render("zabbix", {"severity": 4}) == "Важность:     4"
+    assert templates.render("zabbix", {"severity": "High"}) is None
+
+
+def test_invalid_template():
+    with pytest.raises(ValueError):
+        compile_template("Хост: {host")
+
+
+def test_templates_by_event_type(tmp_path):
+    (tmp_path / "zabbix.txt").write_text("Событие: {subject}", encoding="utf-8")
+    (tmp_path / "zabbix.problem.txt").write_text("Проблема: {subject}", encoding="utf-8")
+    templates = MessageTemplates(tmp_path)
+
+    assert templates.render("zabbix", EVENT) == "Проблема: CPU load is high"
+    assert templates.render("zabbix", dict(EVENT, event_type="update")) == "Событие: CPU load is high"
+    assert templates.render("system", EVENT) is None
+    assert templates.render("zabbix", [EVENT]) is None
+    # Ни одно поле шаблона не найдено в данных
+    assert templates.render("zabbix", {"event_type": "problem", "Subject": "x"}) is None
+
+
+def test_templates_hot_reload(tmp_path):
+    path = tmp_path / "zabbix.txt"
+    path.write_text("Старый: {subject}", encoding="utf-8")
+    templates = MessageTemplates(tmp_path, reload_interval=0)
+    render = templates.get("zabbix")
+    assert templates.get("zabbix") is render
+
+    path.write_text("Новый шаблон: {subject}", encoding="utf-8")
+    os.utime(str(path), ns=(0, 10 ** 9))
+    assert templates.render("zabbix", EVENT) == "Новый шаблон: CPU load is high"
+
+    # Ошибка в шаблоне не заменяет загруженную версию
+    path.write_text("Сломанный: {subject", encoding="utf-8")
+    assert templates.render("zabbix", EVENT) == "Новый шаблон: CPU load is high"
+
+    path.unlink()
+    assert templates.get("zabbix") is None
+
+
+def test_reload_interval(tmp_path):
+    templates = MessageTemplates(tmp_path, reload_interval=3600)
+    assert templates.get("zabbix") is None
+
+    (tmp_path / "zabbix.txt").write_text("{subject}", encoding="utf-8")
+    assert templates.get("zabbix") is None
+    templates.reload()
+    assert templates.render("zabbix", EVENT) == "CPU load is high"
+
+
+def test_default_templates_compile():
+    templates = MessageTemplates(TEMPLATES_DIRECTORY)
+    assert templates.render("zabbix", EVENT).startswith("🔥 Проблема: CPU load is high\nХост: server1")
+    assert templates.render("zabbix", {"event_type": "recovery", "subject": "OK"}) == "✅ Решено: OK"
+    assert templates.render("zabbix", {"event_type": "problem", "Subject": "x", "Host": "y"}) == "Subject: x\nHost: y"
@@ -1,4 +1,4 @@
-from app.utils.text_format import split_text, normalize_whitespace
+from app.utils.text_format import split_text, text_length, normalize_whitespace, split_items
 
 
 # -------- Tests for split_text --------
@@ -67,3 +67,55 @@ def test_normalize_whitespace_with_unicode_spaces():
 
 def test_normalize_whitespace_empty_string():
     assert normalize_whitespace("") == ""
+
+
+# -------- Tests for split_items --------
+
+def test_split_items_strips_and_deduplicates():
+    assert split_items(" a@x.ru, b@x.ru ,a@x.ru") == ["a@x.ru", "b@x.ru"]
+
+
+def test_split_items_skips_empty():
+    assert split_items("a,,b,") == ["a", "b"]
+    assert split_items("") == []
+
+
+def test_split_items_custom_separator():
+    assert split_items("a;b", separator=";") == ["a", "b"]
+
+
+def test_split_text_prefers_line_and_word_boundaries():
+    text = "first line\nsecond line here"
+    assert split_text(text, 16) == ["first line", "second line here"]
+    assert split_text("hello world foo bar", 11) == ["hello world", "foo bar"]
+
+
+def test_split_text_counts_utf16_units():
+    text = "😀" * 4
+    parts = split_text(text, 4)
+    assert parts == ["😀😀", "😀😀"]
+    assert all(text_length(part) <= 4 for part in parts)
+
+
+def test_split_text_keeps_emoji_sequences():
+    assert split_text("ab👍🏽👍🏽", 5) == ["ab", "👍🏽", "👍🏽"]
+    assert split_text("🇷🇺🇷🇺", 5) == ["🇷🇺", "🇷🇺"]
+
+
+def test_split_text_html_reopens_tags():
+    text = "<b>hello world</b> and <i>more text here</i>"
+    parts = split_text(text, 20, html=True)
+    assert parts == ["<b>hello world</b>", "and <i>more text</i>", "<i>here</i>"]
+
+
+def test_split_text_html_does_not_cut_tags_and_entities():
+    assert split_text("a &amp; b &amp; c", 8, html=True) == ["a &amp;", "b &amp;", "c"]
+    parts = split_text('<a href="http://x y">link</a> text', 29, html=True)
+    assert parts == ['<a href="http://x y">link</a>', "text"]
+
+
+def test_split_text_long_text():
+    text = ("line of text with words " * 4 + "\n") * 20000
+    parts = split_text(text, 4096)
+    assert all(len(part) <= 4096 for part in parts)
+    assert "".join(parts).replace("\n", "").replace(" ", "") == text.replace("\n", "").replace(" ", "")
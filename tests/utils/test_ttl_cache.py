@@ -0,0 +1,44 @@
+from app.utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_value_expires_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+    cache.set("a", False)
+
+    clock.now = 9.9
+    assert cache.get("a") is False
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_pop_and_clear():
+    cache = TTLCache(ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    cache.clear()
+    assert cache.get("b", "missing") == "missing"
+
+
+def test_least_recently_used_is_evicted():
+    cache = TTLCache(ttl=10, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3